@@ -0,0 +1,255 @@
+"""
+API middleware - ASGI middleware wrapped around the FastAPI app
+"""
+
+import asyncio
+import cProfile
+import time
+from typing import Any, Callable, Dict, Iterable
+from app.core.config import Config
+from app.utils.metrics import HTTP_REQUESTS, HTTP_REQUEST_DURATION
+from app.utils.tracing import span, SPAN_KIND_SERVER
+from app.utils.server_timing import start_request_timings
+from app.utils.profiling import ProfilingController, TaskSampler
+from app.utils.loop_monitor import ensure_loop_monitor
+from app.utils.traffic_capture import TrafficRecorder
+
+# Path templates of route endpoints, filled in as routes are first hit
+_route_paths: Dict[Callable, str] = {}
+
+def route_template(scope: Dict[str, Any]) -> str:
+    """Path template of the route that handled a request, or "unmatched"
+
+    Labelling by template (e.g. "/questions/ask") rather than the raw path
+    keeps metric label cardinality bounded.
+    """
+    # The router stores the matched endpoint in the scope
+    endpoint = scope.get("endpoint")
+    if endpoint is None:
+        return "unmatched"
+    if endpoint not in _route_paths:
+        for route in scope["app"].routes:
+            if getattr(route, "endpoint", None) is endpoint:
+                _route_paths[endpoint] = route.path
+                break
+        else:
+            return "unmatched"
+    return _route_paths[endpoint]
+
+class MetricsMiddleware:
+    """Count requests and observe their latency per route template
+
+    Latency covers the whole response, including streamed bodies.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope: Dict[str, Any], receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = "500"
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = route_template(scope)
+            HTTP_REQUEST_DURATION.labels(scope["method"], route).observe(time.perf_counter() - started)
+            HTTP_REQUESTS.labels(scope["method"], route, status).inc()
+
+class TracingMiddleware:
+    """Trace each request as a server span, continuing the caller's trace
+
+    An incoming W3C traceparent header parents the request span, and the
+    trace is propagated from there to upstream calls.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope: Dict[str, Any], receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        traceparent = None
+        for name, value in scope["headers"]:
+            if name == b"traceparent":
+                traceparent = value.decode("latin-1")
+                break
+
+        with span(scope["method"], kind=SPAN_KIND_SERVER, traceparent=traceparent, **{"http.method": scope["method"]}) as request_span:
+            async def send_with_status(message):
+                if message["type"] == "http.response.start":
+                    request_span.set_attribute("http.status_code", message["status"])
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_status)
+            finally:
+                route = route_template(scope)
+                request_span.set_attribute("http.route", route)
+                request_span.update_name(f"{scope['method']} {route}")
+
+class ServerTimingMiddleware:
+    """Add a Server-Timing header with the stage durations and cache results of each request
+
+    Stages timed with time_stage() and caches recorded with record_cache()
+    while the request is handled are listed, followed by the total time to
+    the start of the response.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope: Dict[str, Any], receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = start_request_timings()
+        started = time.perf_counter()
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                header = timings.header_value(time.perf_counter() - started).encode("latin-1")
+                message = {**message, "headers": [*message.get("headers", []), (b"server-timing", header)]}
+            await send(message)
+
+        await self.app(scope, receive, send_with_timing)
+
+class ProfilingMiddleware:
+    """Run selected requests under a profiler and store the profile for download
+
+    The controller selects requests carrying a signed X-Profile header or
+    arriving while the admin toggle is on. Profiled responses carry the
+    profile's ID in X-Profile-Id; refused requests are served normally with
+    the reason in X-Profile-Status.
+    """
+
+    def __init__(self, app, controller: ProfilingController, sample_interval: float = 0.005):
+        self.app = app
+        self.controller = controller
+        self.sample_interval = sample_interval
+
+    async def __call__(self, scope: Dict[str, Any], receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        header = None
+        for name, value in scope["headers"]:
+            if name == b"x-profile":
+                header = value.decode("latin-1")
+                break
+        mode, status = self.controller.select(header)
+        if mode is None:
+            if status is None:
+                await self.app(scope, receive, send)
+                return
+            extra_headers = [(b"x-profile-status", status.encode())]
+        else:
+            profile_id = self.controller.new_profile_id(mode)
+            extra_headers = [(b"x-profile-id", profile_id.encode())]
+
+        async def send_with_profile_headers(message):
+            if message["type"] == "http.response.start":
+                message = {**message, "headers": [*message.get("headers", []), *extra_headers]}
+            await send(message)
+
+        if mode is None:
+            await self.app(scope, receive, send_with_profile_headers)
+        elif mode == "cprofile":
+            profiler = cProfile.Profile()
+            profiler.enable()
+            try:
+                await self.app(scope, receive, send_with_profile_headers)
+            finally:
+                profiler.disable()
+                await asyncio.to_thread(self.controller.save_cprofile, profile_id, profiler)
+        else:
+            sampler = TaskSampler(asyncio.current_task(), self.sample_interval)
+            sampler.start()
+            try:
+                await self.app(scope, receive, send_with_profile_headers)
+            finally:
+                sampler.stop()
+                await asyncio.to_thread(self.controller.save_sampled, profile_id, sampler, f"{scope['method']} {scope['path']}")
+
+class LoopMonitorMiddleware:
+    """Watch the event loop serving requests for calls that block it
+
+    The monitor is started on the first request a loop serves, with the
+    interval and threshold configured at that time.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope: Dict[str, Any], receive, send):
+        if scope["type"] == "http":
+            ensure_loop_monitor(Config.LOOP_MONITOR_INTERVAL_MS / 1000, Config.LOOP_BLOCK_THRESHOLD_MS / 1000)
+        await self.app(scope, receive, send)
+
+class TrafficCaptureMiddleware:
+    """Record sampled requests to selected routes for replay with scripts/replay_traffic.py
+
+    Each entry holds the arrival time, path, sanitized JSON body, response
+    status and the time to the end of the response. Requests with bodies
+    that are not JSON or larger than max_body_bytes are not captured.
+    """
+
+    def __init__(self, app, recorder: TrafficRecorder, routes: Iterable[str], max_body_bytes: int = 1024 * 1024):
+        self.app = app
+        self.recorder = recorder
+        self.routes = frozenset(routes)
+        self.max_body_bytes = max_body_bytes
+
+    async def __call__(self, scope: Dict[str, Any], receive, send):
+        if scope["type"] != "http" or scope["path"] not in self.routes or not self.recorder.sampled():
+            await self.app(scope, receive, send)
+            return
+
+        chunks = []
+        size = 0
+        status = None
+
+        async def receive_and_capture():
+            nonlocal size
+            message = await receive()
+            if message["type"] == "http.request" and size <= self.max_body_bytes:
+                chunks.append(message.get("body", b""))
+                size += len(chunks[-1])
+            return message
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        arrived = time.time()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive_and_capture, send_with_status)
+        finally:
+            duration = time.perf_counter() - started
+            if size <= self.max_body_bytes:
+                # The body is parsed and sanitized on the writer thread
+                self.recorder.record({
+                    "timestamp": round(arrived, 6),
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "body": b"".join(chunks),
+                    "status": status or 500,
+                    "duration_ms": round(duration * 1000, 3)
+                })
@@ -0,0 +1,50 @@
+import hmac
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.responses import FileResponse
+from app.core.config import Config
+from app.domain.models import ProfilingToggleRequest
+from app.utils.profiling import ProfilingController
+
+profiling_controller = ProfilingController(
+    output_dir=Config.PROFILING_OUTPUT_DIR,
+    rate_limit=Config.PROFILING_RATE_LIMIT,
+    max_stored=Config.PROFILING_MAX_STORED,
+    secret=Config.PROFILING_SECRET
+)
+
+def require_admin_key(x_admin_key: Optional[str] = Header(None)):
+    """Allow admin routes only with the configured ADMIN_API_KEY"""
+    if not Config.ADMIN_API_KEY:
+        raise HTTPException(status_code=404, detail="Admin API is disabled")
+    if not x_admin_key or not hmac.compare_digest(x_admin_key, Config.ADMIN_API_KEY):
+        raise HTTPException(status_code=401, detail="Invalid admin key")
+
+router = APIRouter(dependencies=[Depends(require_admin_key)])
+
+@router.get("/profiling")
+async def get_profiling():
+    """Get the state of the profiling toggle"""
+    return profiling_controller.status()
+
+@router.put("/profiling")
+async def set_profiling(request: ProfilingToggleRequest):
+    """Switch profiling of the next requests on or off"""
+    if request.enabled:
+        profiling_controller.enable(request.mode, request.requests)
+    else:
+        profiling_controller.disable()
+    return profiling_controller.status()
+
+@router.get("/profiles")
+async def list_profiles():
+    """List stored profiles, newest first"""
+    return {"profiles": profiling_controller.list_profiles()}
+
+@router.get("/profiles/{profile_id}")
+async def download_profile(profile_id: str):
+    """Download a stored profile (speedscope JSON or pstats)"""
+    path = profiling_controller.path(profile_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, filename=profile_id, media_type="application/octet-stream")
@@ -1,7 +1,11 @@
 from typing import Dict, Any
 from fastapi import APIRouter, HTTPException
+from pydantic import ValidationError
+from app.domain.models import SearchFilters
 from app.domain.services.rag_service import RAGService
 from app.core.config import Config
+from app.utils.metrics import time_stage
+from app.utils.tracing import current_span
 from app.utils.message_utils import (
     extract_last_user_message,
     validate_multi_agent_messages,
@@ -35,17 +39,29 @@ async def rag_chat_completions_multi_agent(request: Dict[str, Any]):
         if not last_user_message:
             raise HTTPException(status_code=400, detail="No user message found")
         
+        # Optional metadata filters for the RAG search (not forwarded to OpenAI)
+        filters = None
+        if request.get("rag_filters"):
+            try:
+                filters = SearchFilters(**request["rag_filters"]).model_dump(exclude_none=True)
+            except (TypeError, ValidationError) as e:
+                raise HTTPException(status_code=400, detail=f"Invalid rag_filters: {str(e)}")
+        
         # Get RAG context with configurable top_k
-        relevant_docs = await rag_service.vector_store.search(last_user_message, top_k=Config.DEFAULT_TOP_K)
+        relevant_docs = await rag_service.vector_store.search(last_user_message, top_k=Config.DEFAULT_TOP_K, filters=filters)
         
         # Enhance messages while preserving agent persona
-        enhanced_messages = enhance_messages_with_rag(messages, relevant_docs)
+        current_span().set_attribute("messages", len(messages))
+        with time_stage("context", chunks=len(relevant_docs)):
+            enhanced_messages = enhance_messages_with_rag(messages, relevant_docs)
         
         # Forward to OpenAI
         modified_request = request.copy()
+        modified_request.pop("rag_filters", None)
         modified_request["messages"] = enhanced_messages
         
-        response = await rag_service.api_service.call_openai_completions(modified_request)
+        with time_stage("llm"):
+            response = await rag_service.api_service.call_openai_completions(modified_request)
         
         # Add metadata for debugging
         response["rag_metadata"] = {
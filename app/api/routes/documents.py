@@ -1,41 +1,163 @@
 import os
 import tempfile
-from fastapi import APIRouter, File, UploadFile, HTTPException
-from app.domain.models import DocumentResponse, TextInputRequest
+from typing import Any, Dict, List, Optional, Tuple
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from multipart.multipart import MultipartParser, parse_options_header
+from app.domain.models import DocumentResponse, IngestionJobResponse, TextInputRequest
 from app.domain.services.rag_service import RAGService
+from app.domain.services.ingestion_queue import IngestionQueue, IngestionQueueFullError
 from app.core.config import Config
 
 router = APIRouter()
 rag_service = RAGService()
+ingestion_queue = IngestionQueue(rag_service)
 
-@router.post("/upload", response_model=DocumentResponse)
-async def upload_document(file: UploadFile = File(...)):
-    """Upload and process a document"""
+# Multipart framing (boundary lines and part headers) allowed on top of MAX_FILE_SIZE
+_MULTIPART_OVERHEAD = 16 * 1024
+
+# The upload routes read the request body themselves; document the form field for /docs
+_UPLOAD_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {"multipart/form-data": {"schema": {
+            "type": "object",
+            "required": ["file"],
+            "properties": {"file": {"type": "string", "format": "binary"}}
+        }}}
+    }
+}
+
+def _file_too_large() -> HTTPException:
+    return HTTPException(
+        status_code=400,
+        detail=f"File too large. Maximum size is {Config.MAX_FILE_SIZE} bytes"
+    )
+
+def _validate_extension(filename: str) -> str:
+    """Validate an uploaded file's format and return its extension"""
+    file_extension = os.path.splitext(filename)[1].lower()
+    if file_extension not in Config.SUPPORTED_FORMATS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported file format. Supported formats: {Config.SUPPORTED_FORMATS}"
+        )
+    return file_extension
+
+class _UploadWriter:
+    """python-multipart callbacks writing the "file" part of a form to a temporary file"""
+
+    def __init__(self):
+        self.filename: Optional[str] = None
+        self.temp_file = None
+        self.size = 0
+        self._writing = False
+        self._headers: Dict[bytes, bytes] = {}
+        self._header_field = b""
+        self._header_value = b""
+        self._pending: List[bytes] = []
+        self._pending_size = 0
+
+    def callbacks(self) -> Dict[str, Any]:
+        return {
+            "on_part_begin": self._on_part_begin,
+            "on_header_field": self._on_header_field,
+            "on_header_value": self._on_header_value,
+            "on_header_end": self._on_header_end,
+            "on_headers_finished": self._on_headers_finished,
+            "on_part_data": self._on_part_data,
+            "on_part_end": self._on_part_end
+        }
+
+    def _on_part_begin(self):
+        self._headers = {}
+
+    def _on_header_field(self, data: bytes, start: int, end: int):
+        self._header_field += data[start:end]
+
+    def _on_header_value(self, data: bytes, start: int, end: int):
+        self._header_value += data[start:end]
+
+    def _on_header_end(self):
+        self._headers[self._header_field.lower()] = self._header_value
+        self._header_field = self._header_value = b""
+
+    def _on_headers_finished(self):
+        _, options = parse_options_header(self._headers.get(b"content-disposition", b""))
+        if options.get(b"name") != b"file" or b"filename" not in options or self.temp_file is not None:
+            return
+        self.filename = options[b"filename"].decode("utf-8")
+        # Rejected before any of the file is received
+        file_extension = _validate_extension(self.filename)
+        self.temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=file_extension)
+        self._writing = True
+
+    def _on_part_data(self, data: bytes, start: int, end: int):
+        if not self._writing:
+            return
+        self.size += end - start
+        if self.size > Config.MAX_FILE_SIZE:
+            raise _file_too_large()
+        self._pending.append(data[start:end])
+        self._pending_size += end - start
+
+    def _on_part_end(self):
+        self._writing = False
+
+    async def flush(self, force: bool = False):
+        """Write buffered file data once UPLOAD_CHUNK_SIZE bytes are waiting (or on force)"""
+        if self._pending and (force or self._pending_size >= Config.UPLOAD_CHUNK_SIZE):
+            data = b"".join(self._pending)
+            self._pending, self._pending_size = [], 0
+            await run_in_threadpool(self.temp_file.write, data)
+
+    def discard(self):
+        if self.temp_file is not None:
+            self.temp_file.close()
+            os.unlink(self.temp_file.name)
+            self.temp_file = None
+
+async def _receive_upload(request: Request) -> Tuple[str, str]:
+    """Stream the "file" field of a multipart upload straight to a temporary file
+
+    The body is parsed as it arrives, so the upload is written to disk once,
+    an unsupported format is rejected from the part headers, and an oversized
+    upload is rejected from its Content-Length or as soon as it exceeds
+    MAX_FILE_SIZE. Returns the uploaded file name and the temporary path.
+    """
+    content_type, params = parse_options_header(request.headers.get("content-type", ""))
+    if content_type != b"multipart/form-data" or b"boundary" not in params:
+        raise HTTPException(status_code=422, detail="Expected a multipart/form-data upload with a 'file' field")
+    content_length = request.headers.get("content-length", "")
+    if content_length.isdigit() and int(content_length) > Config.MAX_FILE_SIZE + _MULTIPART_OVERHEAD:
+        raise _file_too_large()
+
+    upload = _UploadWriter()
+    parser = MultipartParser(params[b"boundary"], upload.callbacks())
+    try:
+        async for chunk in request.stream():
+            parser.write(chunk)
+            await upload.flush()
+        parser.finalize()
+        if upload.temp_file is None:
+            raise HTTPException(status_code=422, detail="Missing 'file' field in the upload")
+        await upload.flush(force=True)
+        upload.temp_file.close()
+        return upload.filename, upload.temp_file.name
+    except BaseException:
+        upload.discard()
+        raise
+
+@router.post("/upload", response_model=DocumentResponse, openapi_extra=_UPLOAD_OPENAPI)
+async def upload_document(request: Request, flush: bool = False):
+    """Upload and process a document; flush=true returns once the document is searchable"""
     try:
-        # Validate file size
-        if file.size and file.size > Config.MAX_FILE_SIZE:
-            raise HTTPException(
-                status_code=400, 
-                detail=f"File too large. Maximum size is {Config.MAX_FILE_SIZE} bytes"
-            )
-        
-        # Validate file format
-        file_extension = os.path.splitext(file.filename)[1].lower()
-        if file_extension not in Config.SUPPORTED_FORMATS:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Unsupported file format. Supported formats: {Config.SUPPORTED_FORMATS}"
-            )
-        
         # Save uploaded file temporarily
-        with tempfile.NamedTemporaryFile(delete=False, suffix=file_extension) as temp_file:
-            content = await file.read()
-            temp_file.write(content)
-            temp_file_path = temp_file.name
+        filename, temp_file_path = await _receive_upload(request)
         
         try:
-            # Process the document using external APIs
-            result = await rag_service.add_document(temp_file_path)
+            # Process the document, replacing any previous version with the same name
+            result = await rag_service.upsert_document(temp_file_path, filename, flush=flush)
             return DocumentResponse(**result)
         finally:
             # Clean up temporary file
@@ -46,17 +168,52 @@ async def upload_document(file: UploadFile = File(...)):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/upload-async", response_model=IngestionJobResponse, status_code=202, openapi_extra=_UPLOAD_OPENAPI)
+async def upload_document_async(request: Request):
+    """Upload a document and process it in the background"""
+    try:
+        if ingestion_queue.full():
+            raise HTTPException(status_code=429, detail=f"Ingestion queue is full ({ingestion_queue.max_queue_size} jobs pending)")
+        
+        # The ingestion queue owns the temporary file once the job is accepted
+        filename, temp_file_path = await _receive_upload(request)
+        try:
+            job = ingestion_queue.submit(temp_file_path, filename)
+        except IngestionQueueFullError as e:
+            os.unlink(temp_file_path)
+            raise HTTPException(status_code=429, detail=str(e))
+        
+        return IngestionJobResponse(**job.to_dict())
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/jobs/{job_id}", response_model=IngestionJobResponse)
+async def get_ingestion_job(job_id: str):
+    """Get the status and progress of a background ingestion job"""
+    job = ingestion_queue.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job '{job_id}' not found")
+    return IngestionJobResponse(**job.to_dict())
+
+@router.on_event("shutdown")
+async def stop_ingestion_queue():
+    """Stop background ingestion workers"""
+    await ingestion_queue.stop()
+
 @router.post("/add-text", response_model=DocumentResponse)
-async def add_text(request: TextInputRequest):
-    """Add raw text to the knowledge base"""
+async def add_text(request: TextInputRequest, flush: bool = False):
+    """Add raw text to the knowledge base; flush=true returns once the text is searchable"""
     try:
-        result = await rag_service.add_text(request.text, request.source_name)
+        result = await rag_service.add_text(request.text, request.source_name, flush=flush, tags=request.tags)
         return DocumentResponse(**result)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.delete("/clear", response_model=DocumentResponse)
-async def clear_knowledge_base():
+def clear_knowledge_base():
     """Clear all documents from the knowledge base"""
     try:
         result = rag_service.clear_knowledge_base()
@@ -0,0 +1,12 @@
+from fastapi import APIRouter, HTTPException, Response
+from app.utils.metrics import render_metrics, CONTENT_TYPE
+
+router = APIRouter()
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metrics in the text exposition format"""
+    body = render_metrics()
+    if body is None:
+        raise HTTPException(status_code=503, detail="Metrics require the prometheus_client package")
+    return Response(content=body, media_type=CONTENT_TYPE)
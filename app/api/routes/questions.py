@@ -1,6 +1,9 @@
 from fastapi import APIRouter, HTTPException
-from app.domain.models import QuestionRequest, QuestionResponse, StatsResponse
+from fastapi.responses import StreamingResponse
+from app.domain.models import QuestionRequest, BatchQuestionRequest, QuestionResponse, StatsResponse
 from app.domain.services.rag_service import RAGService
+from app.core.config import Config
+from app.utils.json_utils import dumps
 
 router = APIRouter()
 rag_service = RAGService()
@@ -9,13 +12,42 @@ rag_service = RAGService()
 async def ask_question(request: QuestionRequest):
     """Ask a question and get an answer using RAG"""
     try:
-        result = await rag_service.ask_question(request.question, request.top_k)
+        filters = request.filters.model_dump(exclude_none=True) if request.filters else None
+        result = await rag_service.ask_question(request.question, request.top_k, filters=filters)
         return QuestionResponse(**result)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/ask-batch")
+async def ask_questions_batch(request: BatchQuestionRequest):
+    """Ask several questions, streaming answers as NDJSON in completion order
+    
+    Each line is a QuestionResponse with the question's "index" in the request
+    and the "question" itself.
+    """
+    if len(request.questions) > Config.MAX_BATCH_QUESTIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many questions. Maximum batch size is {Config.MAX_BATCH_QUESTIONS}"
+        )
+    
+    questions = [
+        {
+            "question": item.question,
+            "top_k": item.top_k,
+            "filters": item.filters.model_dump(exclude_none=True) if item.filters else None
+        }
+        for item in request.questions
+    ]
+    
+    async def stream_answers():
+        async for result in rag_service.ask_questions(questions):
+            yield dumps(result) + b"\n"
+    
+    return StreamingResponse(stream_answers(), media_type="application/x-ndjson")
+
 @router.get("/stats", response_model=StatsResponse)
-async def get_stats():
+def get_stats():
     """Get system statistics"""
     try:
         result = rag_service.get_stats()
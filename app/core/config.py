@@ -12,7 +12,13 @@ class Config:
     EMBEDDING_API_URL = os.getenv("EMBEDDING_API_URL", "https://api.openai.com/v1/embeddings")
     VECTOR_INSERT_API_URL = os.getenv("VECTOR_INSERT_API_URL", "https://your-cluster-id.us-east-1-0.aws.cloud.qdrant.io:6333/collections/documents/points")
     VECTOR_SEARCH_API_URL = os.getenv("VECTOR_SEARCH_API_URL", "https://your-cluster-id.us-east-1-0.aws.cloud.qdrant.io:6333/collections/documents/points/search")
+    VECTOR_SEARCH_BATCH_API_URL = os.getenv("VECTOR_SEARCH_BATCH_API_URL", "https://your-cluster-id.us-east-1-0.aws.cloud.qdrant.io:6333/collections/documents/points/search/batch")
     VECTOR_COLLECTION_URL = os.getenv("VECTOR_COLLECTION_URL", "https://your-cluster-id.us-east-1-0.aws.cloud.qdrant.io:6333/collections/documents")
+    VECTOR_RETRIEVE_API_URL = os.getenv("VECTOR_RETRIEVE_API_URL", "https://your-cluster-id.us-east-1-0.aws.cloud.qdrant.io:6333/collections/documents/points")
+    VECTOR_SCROLL_API_URL = os.getenv("VECTOR_SCROLL_API_URL", "https://your-cluster-id.us-east-1-0.aws.cloud.qdrant.io:6333/collections/documents/points/scroll")
+    VECTOR_SET_PAYLOAD_API_URL = os.getenv("VECTOR_SET_PAYLOAD_API_URL", "https://your-cluster-id.us-east-1-0.aws.cloud.qdrant.io:6333/collections/documents/points/payload")
+    VECTOR_DELETE_API_URL = os.getenv("VECTOR_DELETE_API_URL", "https://your-cluster-id.us-east-1-0.aws.cloud.qdrant.io:6333/collections/documents/points/delete")
+    VECTOR_INDEX_API_URL = os.getenv("VECTOR_INDEX_API_URL", "https://your-cluster-id.us-east-1-0.aws.cloud.qdrant.io:6333/collections/documents/index")
     LLM_API_URL = os.getenv("LLM_API_URL", "https://api.openai.com/v1/chat/completions")
     
     # API Authentication
@@ -26,16 +32,51 @@ class Config:
     
     # Vector Database Configuration
     QDRANT_COLLECTION_NAME = os.getenv("QDRANT_COLLECTION_NAME", "documents")
+    # Payload indexes created at collection bootstrap, as comma-separated field:schema pairs
+    PAYLOAD_INDEXES = os.getenv("PAYLOAD_INDEXES", "metadata.source:keyword,metadata.page:integer,metadata.tags:keyword").split(",")
+    
+    # Vector Transport Configuration ("rest" uses the VECTOR_* URLs, "grpc" uses qdrant-client)
+    VECTOR_TRANSPORT = os.getenv("VECTOR_TRANSPORT", "rest")
+    QDRANT_URL = os.getenv("QDRANT_URL", "https://your-cluster-id.us-east-1-0.aws.cloud.qdrant.io:6333")  # ":memory:" for local mode
+    QDRANT_GRPC_PORT = int(os.getenv("QDRANT_GRPC_PORT", "6334"))
+    
+    # Vector Upsert Configuration (VECTOR_UPSERT_WAIT=False returns once Qdrant acknowledges a write)
+    VECTOR_UPSERT_BATCH_SIZE = int(os.getenv("VECTOR_UPSERT_BATCH_SIZE", "256"))
+    VECTOR_UPSERT_CONCURRENCY = int(os.getenv("VECTOR_UPSERT_CONCURRENCY", "4"))
+    VECTOR_UPSERT_WAIT = os.getenv("VECTOR_UPSERT_WAIT", "True").lower() == "true"
     
     # Application Configuration
     DEBUG = os.getenv("DEBUG", "True").lower() == "true"
     HOST = os.getenv("HOST", "0.0.0.0")
     PORT = int(os.getenv("PORT", "8000"))
     
+    # Production server (scripts/run.py --production); SERVER_WORKERS=0 starts one worker per CPU.
+    # Keep-alive outlasts typical load balancer idle timeouts (60 s) so the balancer closes idle connections first
+    SERVER_WORKERS = int(os.getenv("SERVER_WORKERS", "0"))
+    SERVER_BACKLOG = int(os.getenv("SERVER_BACKLOG", "2048"))
+    SERVER_KEEP_ALIVE_SECONDS = int(os.getenv("SERVER_KEEP_ALIVE_SECONDS", "75"))
+    SERVER_GRACEFUL_SHUTDOWN_SECONDS = int(os.getenv("SERVER_GRACEFUL_SHUTDOWN_SECONDS", "30"))
+    # Start document processing workers and build SSL contexts before accepting traffic (on with --production)
+    WARMUP_ENABLED = os.getenv("WARMUP_ENABLED", "False").lower() == "true"
+    
     # Document Processing
     MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
+    UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", str(1024 * 1024)))  # 1MB of an upload buffered per disk write
     SUPPORTED_FORMATS = [".pdf", ".txt", ".docx"]
     
+    # Worker processes for document parsing and chunking (0 = use a thread instead)
+    DOCUMENT_PROCESS_WORKERS = int(os.getenv("DOCUMENT_PROCESS_WORKERS", str(min(4, os.cpu_count() or 1))))
+    
+    # Background Ingestion Configuration
+    INGESTION_WORKERS = int(os.getenv("INGESTION_WORKERS", "2"))
+    INGESTION_QUEUE_SIZE = int(os.getenv("INGESTION_QUEUE_SIZE", "100"))
+    INGESTION_JOB_HISTORY = int(os.getenv("INGESTION_JOB_HISTORY", "1000"))
+    
+    # Ingestion Pipeline Configuration
+    INGESTION_PAGES_PER_BATCH = int(os.getenv("INGESTION_PAGES_PER_BATCH", "10"))
+    INGESTION_BATCH_SIZE = int(os.getenv("INGESTION_BATCH_SIZE", "64"))
+    INGESTION_PIPELINE_QUEUE_SIZE = int(os.getenv("INGESTION_PIPELINE_QUEUE_SIZE", "4"))
+    
     # Document Processing Configuration
     CHUNK_ID_SEPARATOR = os.getenv("CHUNK_ID_SEPARATOR", "_")
     DEFAULT_SOURCE_NAME = os.getenv("DEFAULT_SOURCE_NAME", "text_input")
@@ -43,6 +84,8 @@ class Config:
     # RAG Configuration
     CHUNK_SIZE = 1000
     CHUNK_OVERLAP = 200
+    CHUNK_LENGTH_UNIT = os.getenv("CHUNK_LENGTH_UNIT", "characters")  # "characters" or "tokens"
+    CHUNK_TOKEN_ENCODING = os.getenv("CHUNK_TOKEN_ENCODING", "cl100k_base")
     TOP_K_RESULTS = 3
     
     # RAG Prompt Templates
@@ -61,8 +104,13 @@ class Config:
     CONTENT_PREVIEW_LENGTH = int(os.getenv("CONTENT_PREVIEW_LENGTH", "200"))
     DEFAULT_TOP_K = int(os.getenv("DEFAULT_TOP_K", "3"))
     
+    # Batch Question Configuration
+    MAX_BATCH_QUESTIONS = int(os.getenv("MAX_BATCH_QUESTIONS", "500"))
+    BATCH_LLM_CONCURRENCY = int(os.getenv("BATCH_LLM_CONCURRENCY", "8"))
+    
     # AI Model Configuration
     EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "text-embedding-ada-002")
+    EMBEDDING_ENCODING_FORMAT = os.getenv("EMBEDDING_ENCODING_FORMAT", "base64")  # "base64" or "float"
     LLM_MODEL = os.getenv("LLM_MODEL", "gpt-3.5-turbo")
     VECTOR_SIZE = int(os.getenv("VECTOR_SIZE", "1536"))
     VECTOR_DISTANCE_METRIC = os.getenv("VECTOR_DISTANCE_METRIC", "Cosine")
@@ -82,19 +130,58 @@ class Config:
     CORS_ALLOW_METHODS = os.getenv("CORS_ALLOW_METHODS", "*").split(",")
     CORS_ALLOW_HEADERS = os.getenv("CORS_ALLOW_HEADERS", "*").split(",")
     
+    # Observability Configuration (Prometheus metrics at /metrics)
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "True").lower() == "true"
+    # Tracing exports spans to TRACING_FILE_PATH ("file") or TRACING_OTLP_ENDPOINT ("otlp")
+    TRACING_ENABLED = os.getenv("TRACING_ENABLED", "False").lower() == "true"
+    TRACING_EXPORTER = os.getenv("TRACING_EXPORTER", "file")
+    TRACING_FILE_PATH = os.getenv("TRACING_FILE_PATH", "traces.jsonl")
+    TRACING_OTLP_ENDPOINT = os.getenv("TRACING_OTLP_ENDPOINT", "http://localhost:4318/v1/traces")
+    TRACING_SERVICE_NAME = os.getenv("TRACING_SERVICE_NAME", "rag-llm-api")
+    # Server-Timing response headers with per-stage durations (disable in production if not wanted)
+    SERVER_TIMING_ENABLED = os.getenv("SERVER_TIMING_ENABLED", "True").lower() == "true"
+    # Request profiling, triggered by an X-Profile header signed with PROFILING_SECRET or by the
+    # admin toggle (admin routes require ADMIN_API_KEY); at most PROFILING_RATE_LIMIT profiles per minute
+    PROFILING_SECRET = os.getenv("PROFILING_SECRET")
+    ADMIN_API_KEY = os.getenv("ADMIN_API_KEY")
+    PROFILING_RATE_LIMIT = int(os.getenv("PROFILING_RATE_LIMIT", "6"))
+    PROFILING_OUTPUT_DIR = os.getenv("PROFILING_OUTPUT_DIR", "profiles")
+    PROFILING_MAX_STORED = int(os.getenv("PROFILING_MAX_STORED", "50"))
+    PROFILING_SAMPLE_INTERVAL_MS = float(os.getenv("PROFILING_SAMPLE_INTERVAL_MS", "5"))
+    # Event loop lag monitor; logs the blocking stack when the loop stalls for over LOOP_BLOCK_THRESHOLD_MS
+    LOOP_MONITOR_ENABLED = os.getenv("LOOP_MONITOR_ENABLED", "True").lower() == "true"
+    LOOP_MONITOR_INTERVAL_MS = float(os.getenv("LOOP_MONITOR_INTERVAL_MS", "50"))
+    LOOP_BLOCK_THRESHOLD_MS = float(os.getenv("LOOP_BLOCK_THRESHOLD_MS", "100"))
+    # Memory profiling of ingestion stages with tracemalloc (slows allocations; for diagnosis only)
+    MEMORY_PROFILING_ENABLED = os.getenv("MEMORY_PROFILING_ENABLED", "False").lower() == "true"
+    MEMORY_PROFILING_FRAMES = int(os.getenv("MEMORY_PROFILING_FRAMES", "1"))
+    # Traffic capture: a sampled fraction of requests to TRAFFIC_CAPTURE_ROUTES is appended to
+    # TRAFFIC_CAPTURE_PATH (JSONL, sanitized bodies) for replay with scripts/replay_traffic.py
+    TRAFFIC_CAPTURE_ENABLED = os.getenv("TRAFFIC_CAPTURE_ENABLED", "False").lower() == "true"
+    TRAFFIC_CAPTURE_PATH = os.getenv("TRAFFIC_CAPTURE_PATH", "traffic/requests.jsonl")
+    TRAFFIC_CAPTURE_SAMPLE_RATE = float(os.getenv("TRAFFIC_CAPTURE_SAMPLE_RATE", "1.0"))
+    TRAFFIC_CAPTURE_ROUTES = os.getenv("TRAFFIC_CAPTURE_ROUTES", "/questions/ask,/chat/completions").split(",")
+    
     # HTTP Configuration
     REQUEST_TIMEOUT = int(os.getenv("REQUEST_TIMEOUT", "30"))
     MAX_RETRIES = int(os.getenv("MAX_RETRIES", "3"))
     
+    @classmethod
+    def get_payload_indexes(cls):
+        """Get the configured payload indexes as (field_name, field_schema) pairs"""
+        indexes = []
+        for entry in cls.PAYLOAD_INDEXES:
+            if entry.strip():
+                field_name, _, field_schema = entry.strip().rpartition(":")
+                indexes.append((field_name, field_schema))
+        return indexes
+    
     @classmethod
     def get_ssl_config(cls):
-        """Get SSL configuration using CertificateManager"""
-        ssl_config = CertificateManager.get_httpx_ssl_config(
-            cert_path=cls.CERT_FILE_PATH,
-            verify_ssl=cls.VERIFY_SSL
-        )
-        CertificateManager.log_ssl_config(
-            cert_path=cls.CERT_FILE_PATH,
-            verify_ssl=cls.VERIFY_SSL
-        )
-        return ssl_config 
\ No newline at end of file
+        """Get SSL configuration using CertificateManager, sharing one cached SSL context across clients"""
+        return {
+            "verify": CertificateManager.get_cached_ssl_context(
+                cert_path=cls.CERT_FILE_PATH,
+                verify_ssl=cls.VERIFY_SSL
+            )
+        } 
\ No newline at end of file
@@ -2,14 +2,18 @@
 Domain Models - Pydantic models for requests and responses
 """
 
-from .requests import QuestionRequest, TextInputRequest
-from .responses import QuestionResponse, DocumentResponse, StatsResponse, HealthResponse
+from .requests import QuestionRequest, BatchQuestionRequest, TextInputRequest, SearchFilters, ProfilingToggleRequest
+from .responses import QuestionResponse, DocumentResponse, IngestionJobResponse, StatsResponse, HealthResponse
 
 __all__ = [
     "QuestionRequest",
+    "BatchQuestionRequest",
     "TextInputRequest", 
+    "SearchFilters",
+    "ProfilingToggleRequest",
     "QuestionResponse",
     "DocumentResponse",
+    "IngestionJobResponse",
     "StatsResponse",
     "HealthResponse"
 ] 
\ No newline at end of file
@@ -1,12 +1,31 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Optional, List, Literal
+
+class SearchFilters(BaseModel):
+    """Metadata filters restricting which chunks a search considers"""
+    sources: Optional[List[str]] = Field(None, description="Only search chunks from these sources")
+    page_from: Optional[int] = Field(None, ge=0, description="Lowest page number to include")
+    page_to: Optional[int] = Field(None, ge=0, description="Highest page number to include")
+    tags: Optional[List[str]] = Field(None, description="Only search chunks with any of these tags")
 
 class QuestionRequest(BaseModel):
     """Request model for asking questions"""
     question: str = Field(..., description="The question to ask")
     top_k: Optional[int] = Field(3, description="Number of relevant documents to retrieve")
+    filters: Optional[SearchFilters] = Field(None, description="Metadata filters for the search")
+
+class BatchQuestionRequest(BaseModel):
+    """Request model for asking several questions at once"""
+    questions: List[QuestionRequest] = Field(..., min_length=1, description="Questions to answer")
 
 class TextInputRequest(BaseModel):
     """Request model for adding text to knowledge base"""
     text: str = Field(..., description="Text content to add")
-    source_name: Optional[str] = Field("text_input", description="Name for the text source") 
\ No newline at end of file
+    source_name: Optional[str] = Field("text_input", description="Name for the text source")
+    tags: Optional[List[str]] = Field(None, description="Tags stored with the text for filtered search")
+
+class ProfilingToggleRequest(BaseModel):
+    """Request model for switching request profiling on or off"""
+    enabled: bool = Field(..., description="Whether to profile upcoming requests")
+    mode: Literal["sample", "cprofile"] = Field("sample", description="Sampling (speedscope) or deterministic (pstats) profiler")
+    requests: int = Field(1, ge=1, le=100, description="Number of upcoming requests to profile") 
\ No newline at end of file
@@ -13,6 +13,23 @@ class DocumentResponse(BaseModel):
     success: bool
     message: str
     chunks_processed: Optional[int] = None
+    chunks_added: Optional[int] = None
+    chunks_removed: Optional[int] = None
+    stage_stats: Optional[Dict[str, Any]] = None
+
+class IngestionJobResponse(BaseModel):
+    """Response model for background ingestion jobs"""
+    job_id: str
+    status: str
+    source_name: str
+    message: Optional[str] = None
+    chunks_parsed: int = 0
+    chunks_embedded: int = 0
+    chunks_stored: int = 0
+    result: Optional[Dict[str, Any]] = None
+    created_at: str
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
 
 class StatsResponse(BaseModel):
     """Response model for system statistics"""
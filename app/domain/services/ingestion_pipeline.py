@@ -0,0 +1,178 @@
+import asyncio
+import time
+from typing import List, Dict, Any, Optional, Callable, Iterable, Set
+from app.core.config import Config
+from app.infrastructure.vector_store.vector_store import generate_point_id
+from app.utils.metrics import record_cache
+from app.utils.memory_profiling import MemoryProfile
+
+# Marks the end of a stage's output
+_DONE = object()
+
+
+class StageStats:
+    """Throughput counters for one pipeline stage"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.chunks = 0
+        self.batches = 0
+        self.busy_seconds = 0.0
+
+    def record(self, chunks: int, seconds: float):
+        self.chunks += chunks
+        self.batches += 1
+        self.busy_seconds += seconds
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "chunks": self.chunks,
+            "batches": self.batches,
+            "busy_seconds": round(self.busy_seconds, 4),
+            "chunks_per_second": round(self.chunks / self.busy_seconds, 2) if self.busy_seconds else None
+        }
+
+
+class IngestionPipeline:
+    """Streaming parse -> chunk -> embed -> upsert pipeline for one document
+
+    Stages run as concurrent tasks connected by bounded queues, so pages are
+    parsed while earlier batches are embedded and stored, and a slow stage
+    applies backpressure instead of letting chunks pile up in memory.
+    """
+
+    def __init__(self, document_loader, vector_store, batch_size: int = None, queue_size: int = None):
+        self.document_loader = document_loader
+        self.vector_store = vector_store
+        self.batch_size = batch_size or Config.INGESTION_BATCH_SIZE
+        self.queue_size = queue_size or Config.INGESTION_PIPELINE_QUEUE_SIZE
+
+    async def run(
+        self,
+        file_path: str,
+        source_name: str,
+        skip_ids: Iterable[str] = (),
+        progress: Optional[Callable[[str, int], None]] = None
+    ) -> Dict[str, Any]:
+        """Ingest a document, embedding only chunks whose IDs are not in skip_ids
+
+        Chunks are stored without a file hash; the caller stamps it once the
+        whole document is stored, so a partial ingestion is never taken for
+        a complete one.
+
+        Returns the IDs of all chunks in the document, the number of chunks
+        added and per-stage throughput statistics, with per-stage memory when
+        MEMORY_PROFILING_ENABLED is set.
+        """
+        skip_ids = set(skip_ids)
+        chunk_ids: Set[str] = set()
+        stats = {name: StageStats(name) for name in ("parse", "embed", "upsert")}
+        chunk_queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        embedded_queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+
+        memory = MemoryProfile(Config.MEMORY_PROFILING_ENABLED, Config.MEMORY_PROFILING_FRAMES).start()
+
+        started = time.perf_counter()
+        tasks = [
+            asyncio.create_task(self._parse(file_path, source_name, skip_ids, chunk_ids, chunk_queue, stats["parse"], progress, memory)),
+            asyncio.create_task(self._embed(chunk_queue, embedded_queue, stats["embed"], progress, memory)),
+            asyncio.create_task(self._upsert(embedded_queue, stats["upsert"], progress, memory))
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        finally:
+            # Timed before the memory report, which takes a full tracemalloc snapshot
+            total_seconds = time.perf_counter() - started
+            memory_stats = memory.finish()
+
+        stage_stats = {name: stage.to_dict() for name, stage in stats.items()}
+        stage_stats["total_seconds"] = round(total_seconds, 4)
+        stage_stats["bottleneck"] = max(stats.values(), key=lambda stage: stage.busy_seconds).name
+        if memory_stats is not None:
+            stage_stats["memory"] = memory_stats
+        print(f"Ingestion pipeline for '{source_name}': {stage_stats}")
+
+        return {
+            "chunk_ids": chunk_ids,
+            "chunks_added": stats["upsert"].chunks,
+            "stage_stats": stage_stats
+        }
+
+    async def _parse(self, file_path, source_name, skip_ids, chunk_ids, chunk_queue, stats, progress, memory):
+        """Parse and chunk pages, queueing batches of chunks that need embedding"""
+        batch: List[Dict[str, Any]] = []
+        chunk_index = 0
+
+        started = time.perf_counter()
+        window = memory.open("parse")
+        try:
+            async for page_chunks in self.document_loader.iter_document_chunks(file_path):
+                documents = self.document_loader.build_document_chunks(page_chunks, source_name, chunk_index)
+                stats.record(len(documents), time.perf_counter() - started)
+                memory.close(window)
+                window = None
+                chunk_index += len(documents)
+                if progress:
+                    progress("parsed", len(documents))
+
+                stored = queued = 0
+                for doc in documents:
+                    point_id = generate_point_id(source_name, doc["content"])
+                    if point_id in chunk_ids:
+                        continue
+                    chunk_ids.add(point_id)
+                    if point_id in skip_ids:
+                        stored += 1
+                    else:
+                        batch.append(doc)
+                        queued += 1
+                record_cache("chunks", hits=stored, misses=queued)
+
+                while len(batch) >= self.batch_size:
+                    await chunk_queue.put(batch[:self.batch_size])
+                    batch = batch[self.batch_size:]
+                started = time.perf_counter()
+                window = memory.open("parse")
+        finally:
+            memory.close(window)
+
+        if batch:
+            await chunk_queue.put(batch)
+        await chunk_queue.put(_DONE)
+
+    async def _embed(self, chunk_queue, embedded_queue, stats, progress, memory):
+        """Embed queued chunk batches"""
+        while True:
+            batch = await chunk_queue.get()
+            if batch is _DONE:
+                await embedded_queue.put(_DONE)
+                return
+
+            started = time.perf_counter()
+            with memory.stage("embed"):
+                embeddings = await self.vector_store.embed_documents(batch)
+            stats.record(len(batch), time.perf_counter() - started)
+            if progress:
+                progress("embedded", len(batch))
+
+            await embedded_queue.put((batch, embeddings))
+
+    async def _upsert(self, embedded_queue, stats, progress, memory):
+        """Store embedded batches"""
+        while True:
+            item = await embedded_queue.get()
+            if item is _DONE:
+                return
+
+            batch, embeddings = item
+            started = time.perf_counter()
+            with memory.stage("upsert"):
+                await self.vector_store.insert_documents(batch, embeddings)
+            stats.record(len(batch), time.perf_counter() - started)
+            if progress:
+                progress("stored", len(batch))
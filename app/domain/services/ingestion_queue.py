@@ -0,0 +1,170 @@
+import asyncio
+import os
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import List, Dict, Any, Optional
+from app.core.config import Config
+from app.utils.tracing import span, current_span, detach_span
+from app.utils.server_timing import detach_request_timings
+
+
+class IngestionQueueFullError(Exception):
+    """Raised when the ingestion queue cannot accept more jobs"""
+
+
+class IngestionJob:
+    """State and progress of a single background ingestion job"""
+
+    def __init__(self, file_path: str, source_name: str):
+        self.job_id = str(uuid.uuid4())
+        self.file_path = file_path
+        self.source_name = source_name
+        self.status = "queued"
+        self.message: Optional[str] = None
+        self.chunks_parsed = 0
+        self.chunks_embedded = 0
+        self.chunks_stored = 0
+        self.result: Optional[Dict[str, Any]] = None
+        self.created_at = datetime.now().isoformat()
+        self.started_at: Optional[str] = None
+        self.finished_at: Optional[str] = None
+        # Trace context of the request that submitted the job
+        self.traceparent: Optional[str] = None
+
+    def update_progress(self, stage: str, count: int):
+        """Record progress reported by the ingestion pipeline"""
+        if stage == "parsed":
+            self.chunks_parsed += count
+        elif stage == "embedded":
+            self.chunks_embedded += count
+        elif stage == "stored":
+            self.chunks_stored += count
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("completed", "failed")
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize job status for the API"""
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "source_name": self.source_name,
+            "message": self.message,
+            "chunks_parsed": self.chunks_parsed,
+            "chunks_embedded": self.chunks_embedded,
+            "chunks_stored": self.chunks_stored,
+            "result": self.result,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at
+        }
+
+
+class IngestionQueue:
+    """Bounded asyncio job queue that ingests uploaded documents in the background"""
+
+    def __init__(self, rag_service, max_workers: int = None, max_queue_size: int = None, max_job_history: int = None):
+        self.rag_service = rag_service
+        self.max_workers = max_workers or Config.INGESTION_WORKERS
+        self.max_queue_size = max_queue_size or Config.INGESTION_QUEUE_SIZE
+        self.max_job_history = max_job_history or Config.INGESTION_JOB_HISTORY
+        self.jobs: "OrderedDict[str, IngestionJob]" = OrderedDict()
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+
+    def _ensure_started(self):
+        """Start worker tasks on the running event loop on first use"""
+        if self._workers:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._workers = [
+            asyncio.create_task(self._worker())
+            for _ in range(self.max_workers)
+        ]
+
+    def submit(self, file_path: str, source_name: str) -> IngestionJob:
+        """Queue a file for ingestion; the queue takes ownership of the file and deletes it when done"""
+        self._ensure_started()
+
+        job = IngestionJob(file_path, source_name)
+        job.traceparent = current_span().traceparent
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise IngestionQueueFullError(
+                f"Ingestion queue is full ({self.max_queue_size} jobs pending)"
+            )
+
+        self.jobs[job.job_id] = job
+        self._prune_history()
+        return job
+
+    def full(self) -> bool:
+        """Whether a submitted job would be rejected because the queue is full"""
+        return self._queue is not None and self._queue.full()
+
+    def get_job(self, job_id: str) -> Optional[IngestionJob]:
+        """Look up a job by ID"""
+        return self.jobs.get(job_id)
+
+    def _prune_history(self):
+        """Forget the oldest finished jobs once the history limit is exceeded"""
+        excess = len(self.jobs) - self.max_job_history
+        if excess <= 0:
+            return
+        for job_id in [job_id for job_id, job in self.jobs.items() if job.finished][:excess]:
+            del self.jobs[job_id]
+
+    async def _worker(self):
+        """Process queued jobs until cancelled"""
+        # Workers outlive the request that started them; each job joins its own trace
+        detach_span()
+        detach_request_timings()
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._run_job(job)
+            finally:
+                self._queue.task_done()
+
+    async def _run_job(self, job: IngestionJob):
+        """Run one ingestion job and record its outcome"""
+        job.status = "processing"
+        job.started_at = datetime.now().isoformat()
+        try:
+            with span("ingestion_job", traceparent=job.traceparent, job_id=job.job_id):
+                result = await self.rag_service.upsert_document(
+                    job.file_path,
+                    job.source_name,
+                    progress=job.update_progress
+                )
+            job.result = result
+            job.message = result.get("message")
+            job.status = "completed" if result.get("success") else "failed"
+        except Exception as e:
+            job.message = f"Error processing document: {str(e)}"
+            job.status = "failed"
+        except asyncio.CancelledError:
+            job.message = "Ingestion stopped while processing the job"
+            job.status = "failed"
+            raise
+        finally:
+            job.finished_at = datetime.now().isoformat()
+            if os.path.exists(job.file_path):
+                os.unlink(job.file_path)
+
+    async def stop(self):
+        """Cancel worker tasks, failing queued jobs and deleting their files"""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        while self._queue is not None and not self._queue.empty():
+            job = self._queue.get_nowait()
+            job.status = "failed"
+            job.message = "Ingestion stopped before the job started"
+            job.finished_at = datetime.now().isoformat()
+            if os.path.exists(job.file_path):
+                os.unlink(job.file_path)
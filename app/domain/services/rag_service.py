@@ -1,8 +1,13 @@
-from typing import List, Dict, Any, Optional
+import asyncio
+from typing import List, Dict, Any, Optional, Callable, AsyncIterator
 from app.infrastructure.document_processing.loader import DocumentLoader
 from app.infrastructure.vector_store.vector_store import VectorStore
 from app.infrastructure.external.external_api_service import ExternalAPIService
+from app.domain.services.ingestion_pipeline import IngestionPipeline
 from app.core.config import Config
+from app.utils.file_utils import compute_file_hash
+from app.utils.metrics import time_stage, record_cache
+from app.utils.tracing import traced, current_span
 
 class RAGService:
     """Main RAG service that orchestrates document processing and Q&A using external APIs"""
@@ -12,11 +17,13 @@ class RAGService:
         self.vector_store = VectorStore()
         self.api_service = ExternalAPIService()
     
+    @traced("RAGService.add_document")
     async def add_document(self, file_path: str) -> Dict[str, Any]:
         """Add a document to the knowledge base"""
         try:
             # Load and process document
-            documents = self.document_loader.load_document(file_path)
+            documents = await self.document_loader.load_document_async(file_path)
+            current_span().set_attribute("chunks", len(documents))
             
             # Add to vector store using external APIs
             success = await self.vector_store.add_documents(documents)
@@ -34,13 +41,94 @@ class RAGService:
                 }
                 
         except Exception as e:
+            current_span().set_error(e)
             return {
                 "success": False,
                 "message": f"Error processing document: {str(e)}"
             }
     
-    async def add_text(self, text: str, source_name: str = "text_input") -> Dict[str, Any]:
-        """Add raw text to the knowledge base"""
+    @traced("RAGService.upsert_document")
+    async def upsert_document(
+        self,
+        file_path: str,
+        source_name: Optional[str] = None,
+        progress: Optional[Callable[[str, int], None]] = None,
+        flush: bool = False
+    ) -> Dict[str, Any]:
+        """Add or update a document, re-embedding only the chunks that changed
+        
+        progress, if given, is called with ("parsed" | "embedded" | "stored", chunk_count).
+        With flush=True the call returns only once all writes are applied, so the
+        document is searchable immediately.
+        """
+        try:
+            source = source_name or file_path
+            file_hash = compute_file_hash(file_path)
+            current_span().set_attribute("source", source)
+
+            # Fast path: identical upload is skipped without parsing
+            stored_points = await self.vector_store.get_source_points(source)
+            if stored_points and all(h == file_hash for h in stored_points.values()):
+                record_cache("documents", hits=1)
+                return {
+                    "success": True,
+                    "message": f"Document '{source}' is unchanged",
+                    "chunks_processed": len(stored_points),
+                    "chunks_added": 0,
+                    "chunks_removed": 0
+                }
+
+            record_cache("documents", misses=1)
+            
+            # Stream the document through the pipeline, embedding only chunks not stored yet
+            pipeline = IngestionPipeline(self.document_loader, self.vector_store)
+            pipeline_result = await pipeline.run(
+                file_path,
+                source,
+                skip_ids=stored_points.keys(),
+                progress=progress
+            )
+            
+            # Diff the new chunk set against the stored chunks of this source
+            new_ids = pipeline_result["chunk_ids"]
+            removed_ids = stored_points.keys() - new_ids
+            
+            # Stamp the new version on all its chunks only now that every chunk is stored,
+            # so a failed ingestion is retried rather than skipped as unchanged; then drop removed chunks
+            unstamped_ids = sorted(point_id for point_id in new_ids if stored_points.get(point_id) != file_hash)
+            await self.vector_store.set_file_hash(unstamped_ids, file_hash)
+            if removed_ids:
+                await self.vector_store.delete_source_points(source, list(new_ids))
+            if flush:
+                await self.vector_store.flush()
+            current_span().set_attribute("chunks", len(new_ids))
+            current_span().set_attribute("chunks_added", pipeline_result["chunks_added"])
+
+            return {
+                "success": True,
+                "message": f"Document '{source}' updated successfully",
+                "chunks_processed": len(new_ids),
+                "chunks_added": pipeline_result["chunks_added"],
+                "chunks_removed": len(removed_ids),
+                "stage_stats": pipeline_result["stage_stats"]
+            }
+
+        except Exception as e:
+            current_span().set_error(e)
+            return {
+                "success": False,
+                "message": f"Error processing document: {str(e)}"
+            }
+
+    @traced("RAGService.add_text")
+    async def add_text(
+        self,
+        text: str,
+        source_name: str = "text_input",
+        flush: bool = False,
+        tags: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """Add raw text to the knowledge base, waiting for the writes to be applied if flush is set"""
         try:
             # Validate text is not empty
             if not text or not text.strip():
@@ -50,10 +138,13 @@ class RAGService:
                 }
             
             # Load and process text
-            documents = self.document_loader.load_text(text, source_name)
+            documents = self.document_loader.load_text(text, source_name, tags=tags)
+            current_span().set_attribute("chunks", len(documents))
             
             # Add to vector store using external APIs
             success = await self.vector_store.add_documents(documents)
+            if success and flush:
+                await self.vector_store.flush()
             
             if success:
                 return {
@@ -68,28 +159,99 @@ class RAGService:
                 }
                 
         except Exception as e:
+            current_span().set_error(e)
             return {
                 "success": False,
                 "message": f"Error processing text: {str(e)}"
             }
     
-    async def ask_question(self, question: str, top_k: int = None) -> Dict[str, Any]:
-        """Ask a question and get an answer using RAG with external APIs"""
+    @traced("RAGService.ask_question")
+    async def ask_question(self, question: str, top_k: int = None, filters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Ask a question and get an answer using RAG with external APIs, optionally searching only chunks matching filters"""
         try:
             # Use default top_k from config if not provided
             if top_k is None:
                 top_k = Config.DEFAULT_TOP_K
+            current_span().set_attribute("top_k", top_k)
                 
             # Search for relevant documents using external APIs
-            relevant_docs = await self.vector_store.search(question, top_k)
+            relevant_docs = await self.vector_store.search(question, top_k, filters=filters)
             
-            if not relevant_docs:
-                return {
+            return await self._answer_from_documents(question, relevant_docs)
+            
+        except Exception as e:
+            current_span().set_error(e)
+            return {
+                "success": False,
+                "answer": f"Error generating answer: {str(e)}",
+                "sources": []
+            }
+    
+    async def ask_questions(self, questions: List[Dict[str, Any]], concurrency: int = None) -> AsyncIterator[Dict[str, Any]]:
+        """Answer several questions, yielding each result as soon as it is ready
+        
+        All questions are embedded in one request and searched with one batch
+        search; LLM calls then run concurrently, at most `concurrency` at a time.
+        Each question is a dict with "question" and optional "top_k" and
+        "filters"; each result carries the question's "index" in the input.
+        """
+        queries = [
+            {**question, "top_k": question.get("top_k") or Config.DEFAULT_TOP_K}
+            for question in questions
+        ]
+        try:
+            batch_docs = await self.vector_store.search_batch(queries)
+        except Exception as e:
+            for index, query in enumerate(queries):
+                yield {
+                    "index": index,
+                    "question": query["question"],
                     "success": False,
-                    "answer": "No relevant documents found to answer your question.",
+                    "answer": f"Error generating answer: {str(e)}",
                     "sources": []
                 }
-            
+            return
+        
+        semaphore = asyncio.Semaphore(concurrency or Config.BATCH_LLM_CONCURRENCY)
+        
+        async def answer(index: int, query: Dict[str, Any], relevant_docs: List[Dict[str, Any]]) -> Dict[str, Any]:
+            try:
+                if relevant_docs:
+                    # Only questions that need an LLM call count against the limit
+                    async with semaphore:
+                        result = await self._answer_from_documents(query["question"], relevant_docs)
+                else:
+                    result = await self._answer_from_documents(query["question"], relevant_docs)
+            except Exception as e:
+                result = {
+                    "success": False,
+                    "answer": f"Error generating answer: {str(e)}",
+                    "sources": []
+                }
+            return {"index": index, "question": query["question"], **result}
+        
+        tasks = [
+            asyncio.create_task(answer(index, query, relevant_docs))
+            for index, (query, relevant_docs) in enumerate(zip(queries, batch_docs))
+        ]
+        try:
+            for completed in asyncio.as_completed(tasks):
+                yield await completed
+        finally:
+            # Stop outstanding LLM calls if the consumer goes away
+            for task in tasks:
+                task.cancel()
+    
+    async def _answer_from_documents(self, question: str, relevant_docs: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Generate an answer to a question from retrieved documents"""
+        if not relevant_docs:
+            return {
+                "success": False,
+                "answer": "No relevant documents found to answer your question.",
+                "sources": []
+            }
+        
+        with time_stage("context", chunks=len(relevant_docs)):
             # Prepare context from relevant documents
             context = "\n\n".join([doc["content"] for doc in relevant_docs])
             
@@ -98,33 +260,27 @@ class RAGService:
                 {"role": "system", "content": Config.RAG_PROMPT_TEMPLATE.format(context=context, question=question)},
                 {"role": "user", "content": question}
             ]
-            
+        
+        with time_stage("llm"):
             answer = await self.api_service.call_llm(messages)
-            
-            # Prepare sources information with configurable preview length
-            sources = []
-            for doc in relevant_docs:
-                preview_length = Config.CONTENT_PREVIEW_LENGTH
-                content_preview = doc["content"][:preview_length] + "..." if len(doc["content"]) > preview_length else doc["content"]
-                sources.append({
-                    "content": content_preview,
-                    "metadata": doc["metadata"],
-                    "score": doc["score"]
-                })
-            
-            return {
-                "success": True,
-                "answer": answer,
-                "sources": sources,
-                "context_used": context
-            }
-            
-        except Exception as e:
-            return {
-                "success": False,
-                "answer": f"Error generating answer: {str(e)}",
-                "sources": []
-            }
+        
+        # Prepare sources information with configurable preview length
+        sources = []
+        for doc in relevant_docs:
+            preview_length = Config.CONTENT_PREVIEW_LENGTH
+            content_preview = doc["content"][:preview_length] + "..." if len(doc["content"]) > preview_length else doc["content"]
+            sources.append({
+                "content": content_preview,
+                "metadata": doc["metadata"],
+                "score": doc["score"]
+            })
+        
+        return {
+            "success": True,
+            "answer": answer,
+            "sources": sources,
+            "context_used": context
+        }
     
     def get_stats(self) -> Dict[str, Any]:
         """Get system statistics"""
@@ -1,60 +1,181 @@
+import asyncio
+import multiprocessing
 import os
-from typing import List, Dict, Any
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain_community.document_loaders import PyPDFLoader, TextLoader, Docx2txtLoader
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple, AsyncIterator
 from app.core.config import Config
+from app.infrastructure.document_processing.text_splitter import RecursiveTextSplitter
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+def get_process_pool() -> Optional[ProcessPoolExecutor]:
+    """Get the shared document process pool, or None to use the default thread pool"""
+    global _process_pool
+    if Config.DOCUMENT_PROCESS_WORKERS <= 0:
+        return None
+    if _process_pool is None:
+        _process_pool = ProcessPoolExecutor(
+            max_workers=Config.DOCUMENT_PROCESS_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_import_parsers
+        )
+    return _process_pool
+
+def shutdown_process_pool():
+    """Shut down the shared document process pool"""
+    global _process_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=False, cancel_futures=True)
+        _process_pool = None
+
+def _import_parsers():
+    """Import the document parsers, which take about a second, ahead of the first document"""
+    import pypdf
+    from langchain_community.document_loaders import pdf, text, word_document
+
+async def warm_document_parsers():
+    """Start every document process pool worker with its parsers imported
+
+    Without a pool nothing is imported, so processes that never parse a
+    document don't load the parsers.
+    """
+    pool = get_process_pool()
+    if pool is None:
+        return
+    loop = asyncio.get_running_loop()
+    # The pool starts a process per task submitted while none is idle, each running _import_parsers first
+    await asyncio.gather(*(
+        loop.run_in_executor(pool, _import_parsers)
+        for _ in range(Config.DOCUMENT_PROCESS_WORKERS)
+    ))
+
+def _split_file(file_path: str) -> List[Tuple[str, int]]:
+    """Process pool entry point for parsing and chunking a file"""
+    return DocumentLoader().split_file(file_path)
+
+def _split_file_pages(file_path: str, start_page: int, max_pages: int) -> Tuple[List[Tuple[str, int]], bool]:
+    """Process pool entry point for parsing and chunking a window of pages"""
+    return DocumentLoader().split_file_pages(file_path, start_page, max_pages)
 
 class DocumentLoader:
     """Handles document loading and text extraction"""
     
     def __init__(self):
-        self.text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=Config.CHUNK_SIZE,
-            chunk_overlap=Config.CHUNK_OVERLAP,
-            length_function=len,
-        )
+        if Config.CHUNK_LENGTH_UNIT == "tokens":
+            self.text_splitter = RecursiveTextSplitter.from_tiktoken_encoder(
+                Config.CHUNK_SIZE,
+                Config.CHUNK_OVERLAP,
+                encoding_name=Config.CHUNK_TOKEN_ENCODING
+            )
+        else:
+            self.text_splitter = RecursiveTextSplitter(Config.CHUNK_SIZE, Config.CHUNK_OVERLAP)
     
-    def load_document(self, file_path: str) -> List[Dict[str, Any]]:
-        """Load and process a document file"""
+    def split_file(self, file_path: str) -> List[Tuple[str, int]]:
+        """Parse and chunk a document file into (content, page) pairs"""
         
         # Validate file format
         file_extension = os.path.splitext(file_path)[1].lower()
         if file_extension not in Config.SUPPORTED_FORMATS:
             raise ValueError(f"Unsupported file format: {file_extension}")
         
-        # Load document based on format
+        # Load document based on format, importing the loader on first use
         if file_extension == ".pdf":
+            from langchain_community.document_loaders.pdf import PyPDFLoader
             loader = PyPDFLoader(file_path)
         elif file_extension == ".txt":
+            from langchain_community.document_loaders.text import TextLoader
             loader = TextLoader(file_path)
         elif file_extension == ".docx":
+            from langchain_community.document_loaders.word_document import Docx2txtLoader
             loader = Docx2txtLoader(file_path)
         else:
             raise ValueError(f"Unsupported file format: {file_extension}")
         
-        # Extract text
-        documents = loader.load()
+        # Extract text and split into chunks
+        pages = [(doc.page_content, doc.metadata.get("page", 0)) for doc in loader.load()]
+        return self._split_pages(pages)
+    
+    def split_file_pages(self, file_path: str, start_page: int, max_pages: int) -> Tuple[List[Tuple[str, int]], bool]:
+        """Parse and chunk up to max_pages pages of a document starting at start_page
+        
+        Returns the (content, page) pairs and whether more pages remain. PDFs are
+        read page by page with pypdf (matching PyPDFLoader); other formats are
+        a single page.
+        """
+        file_extension = os.path.splitext(file_path)[1].lower()
+        if file_extension != ".pdf":
+            return (self.split_file(file_path), False) if start_page == 0 else ([], False)
         
-        # Split into chunks
-        chunks = self.text_splitter.split_documents(documents)
+        import pypdf
         
-        # Convert to dictionary format
+        reader = pypdf.PdfReader(file_path)
+        end_page = min(start_page + max_pages, len(reader.pages))
+        pages = [
+            (reader.pages[page_number].extract_text(), page_number)
+            for page_number in range(start_page, end_page)
+        ]
+        return self._split_pages(pages), end_page < len(reader.pages)
+    
+    def _split_pages(self, pages: List[Tuple[str, int]]) -> List[Tuple[str, int]]:
+        """Split (text, page) pairs into (content, page) chunk pairs"""
+        return [
+            (chunk, page)
+            for text, page in pages
+            for chunk in self.text_splitter.split_text(text)
+        ]
+    
+    async def iter_document_chunks(self, file_path: str, pages_per_batch: int = None) -> AsyncIterator[List[Tuple[str, int]]]:
+        """Yield (content, page) pairs of a document a few pages at a time
+        
+        Each window of pages is parsed and chunked in the document process pool,
+        so only one window is held in memory at once.
+        """
+        if pages_per_batch is None:
+            pages_per_batch = Config.INGESTION_PAGES_PER_BATCH
+        
+        loop = asyncio.get_running_loop()
+        start_page = 0
+        while True:
+            chunks, has_more = await loop.run_in_executor(
+                get_process_pool(), _split_file_pages, file_path, start_page, pages_per_batch
+            )
+            yield chunks
+            if not has_more:
+                return
+            start_page += pages_per_batch
+    
+    def load_document(self, file_path: str, source_name: str = None) -> List[Dict[str, Any]]:
+        """Load and process a document file"""
+        return self.build_document_chunks(self.split_file(file_path), source_name or file_path)
+    
+    async def load_document_async(self, file_path: str, source_name: str = None) -> List[Dict[str, Any]]:
+        """Load and process a document file off the event loop
+        
+        Parsing and chunking run in the document process pool (or a thread when
+        the pool is disabled); only (content, page) pairs are sent back.
+        """
+        loop = asyncio.get_running_loop()
+        chunks = await loop.run_in_executor(get_process_pool(), _split_file, file_path)
+        return self.build_document_chunks(chunks, source_name or file_path)
+    
+    def build_document_chunks(self, chunks: List[Tuple[str, int]], source_name: str, start_index: int = 0) -> List[Dict[str, Any]]:
+        """Convert (content, page) pairs to dictionary format"""
         processed_chunks = []
-        for i, chunk in enumerate(chunks):
+        for i, (content, page) in enumerate(chunks, start=start_index):
             processed_chunks.append({
-                "id": f"{os.path.basename(file_path)}{Config.CHUNK_ID_SEPARATOR}{i}",
-                "content": chunk.page_content,
+                "id": f"{os.path.basename(source_name)}{Config.CHUNK_ID_SEPARATOR}{i}",
+                "content": content,
                 "metadata": {
-                    "source": file_path,
-                    "page": chunk.metadata.get("page", 0),
+                    "source": source_name,
+                    "page": page,
                     "chunk_index": i
                 }
             })
         
         return processed_chunks
     
-    def load_text(self, text: str, source_name: str = None) -> List[Dict[str, Any]]:
-        """Load and process raw text"""
+    def load_text(self, text: str, source_name: str = None, tags: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Load and process raw text, storing tags in each chunk's metadata if given"""
         
         # Use default source name from config if not provided
         if source_name is None:
@@ -66,13 +187,16 @@ class DocumentLoader:
         # Convert to dictionary format
         processed_chunks = []
         for i, chunk in enumerate(chunks):
+            metadata = {
+                "source": source_name,
+                "chunk_index": i
+            }
+            if tags:
+                metadata["tags"] = tags
             processed_chunks.append({
                 "id": f"{source_name}{Config.CHUNK_ID_SEPARATOR}{i}",
                 "content": chunk,
-                "metadata": {
-                    "source": source_name,
-                    "chunk_index": i
-                }
+                "metadata": metadata
             })
         
         return processed_chunks 
\ No newline at end of file
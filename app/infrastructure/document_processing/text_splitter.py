@@ -0,0 +1,130 @@
+from collections import deque
+from typing import List, Tuple, Callable, Optional
+
+DEFAULT_SEPARATORS = ["\n\n", "\n", " ", ""]
+
+
+class RecursiveTextSplitter:
+    """Recursive character text splitter working on offsets into the source text
+
+    Produces the same chunks as langchain's RecursiveCharacterTextSplitter with
+    its defaults (separators kept at the start of the following piece, chunks
+    stripped of surrounding whitespace), but represents pieces as (start, end)
+    offsets and only slices the text once per emitted chunk. When
+    length_function is None, lengths are character counts computed from
+    offsets; otherwise it is called on each piece (e.g. a token counter).
+    """
+
+    def __init__(
+        self,
+        chunk_size: int,
+        chunk_overlap: int,
+        length_function: Optional[Callable[[str], int]] = None,
+        separators: Optional[List[str]] = None
+    ):
+        if chunk_overlap > chunk_size:
+            raise ValueError(
+                f"Got a larger chunk overlap ({chunk_overlap}) than chunk size "
+                f"({chunk_size}), should be smaller."
+            )
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.length_function = length_function
+        self.separators = separators or DEFAULT_SEPARATORS
+
+    @classmethod
+    def from_tiktoken_encoder(cls, chunk_size: int, chunk_overlap: int, encoding_name: str = "cl100k_base", **kwargs) -> "RecursiveTextSplitter":
+        """Create a splitter measuring chunk_size and chunk_overlap in tokens"""
+        import tiktoken
+
+        encoding = tiktoken.get_encoding(encoding_name)
+        return cls(
+            chunk_size,
+            chunk_overlap,
+            length_function=lambda text: len(encoding.encode(text, disallowed_special=())),
+            **kwargs
+        )
+
+    def split_text(self, text: str) -> List[str]:
+        """Split text into chunks"""
+        chunks: List[str] = []
+        self._split(text, 0, len(text), self.separators, chunks)
+        return chunks
+
+    def _length(self, text: str, start: int, end: int) -> int:
+        if self.length_function is None:
+            return end - start
+        return self.length_function(text[start:end])
+
+    def _split(self, text: str, start: int, end: int, separators: List[str], chunks: List[str]):
+        """Split text[start:end] with the first separator found in it, recursing into oversized pieces"""
+        # Get appropriate separator to use
+        separator = separators[-1]
+        remaining_separators: List[str] = []
+        for i, candidate in enumerate(separators):
+            if candidate == "":
+                separator = candidate
+                break
+            if text.find(candidate, start, end) != -1:
+                separator = candidate
+                remaining_separators = separators[i + 1:]
+                break
+
+        # Merge consecutive pieces that fit, recursing into pieces that don't
+        good_pieces: List[Tuple[int, int, int]] = []
+        for piece_start, piece_end in self._pieces(text, start, end, separator):
+            length = self._length(text, piece_start, piece_end)
+            if length < self.chunk_size:
+                good_pieces.append((piece_start, piece_end, length))
+                continue
+
+            if good_pieces:
+                self._merge(text, good_pieces, chunks)
+                good_pieces = []
+            if not remaining_separators:
+                chunks.append(text[piece_start:piece_end])
+            else:
+                self._split(text, piece_start, piece_end, remaining_separators, chunks)
+
+        if good_pieces:
+            self._merge(text, good_pieces, chunks)
+
+    @staticmethod
+    def _pieces(text: str, start: int, end: int, separator: str):
+        """Yield (start, end) offsets of the pieces of text[start:end], each but the first starting with separator"""
+        if separator == "":
+            for position in range(start, end):
+                yield position, position + 1
+            return
+
+        piece_start = start
+        position = text.find(separator, start, end)
+        while position != -1:
+            if position > piece_start:
+                yield piece_start, position
+            piece_start = position
+            position = text.find(separator, position + len(separator), end)
+        if end > piece_start:
+            yield piece_start, end
+
+    def _merge(self, text: str, pieces: List[Tuple[int, int, int]], chunks: List[str]):
+        """Combine consecutive pieces into chunks of at most chunk_size with chunk_overlap carried over"""
+        window: deque = deque()
+        total = 0
+        for piece in pieces:
+            length = piece[2]
+            if total + length > self.chunk_size and window:
+                self._emit(text, window[0][0], window[-1][1], chunks)
+                # Drop pieces from the front until the remainder fits the overlap and the next piece
+                while window and (total > self.chunk_overlap or total + length > self.chunk_size):
+                    total -= window.popleft()[2]
+            window.append(piece)
+            total += length
+        if window:
+            self._emit(text, window[0][0], window[-1][1], chunks)
+
+    @staticmethod
+    def _emit(text: str, start: int, end: int, chunks: List[str]):
+        chunk = text[start:end].strip()
+        if chunk:
+            chunks.append(chunk)
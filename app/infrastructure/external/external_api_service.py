@@ -1,8 +1,83 @@
+import asyncio
 import httpx
 import json
 import os
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Set
+import numpy as np
 from app.core.config import Config
+from app.utils.vector_utils import decode_embedding
+from app.utils.json_utils import dumps
+from app.utils.metrics import record_upstream
+from app.utils.tracing import start_client_span, end_client_span, current_span
+
+# Config URL settings of upstream endpoints and the names they are reported under in metrics
+_UPSTREAM_URLS = (
+    ("EMBEDDING_API_URL", "embeddings"),
+    ("LLM_API_URL", "llm"),
+    ("VECTOR_SEARCH_API_URL", "vector_search"),
+    ("VECTOR_SEARCH_BATCH_API_URL", "vector_search_batch"),
+    ("VECTOR_INSERT_API_URL", "vector_points"),
+    ("VECTOR_RETRIEVE_API_URL", "vector_points"),
+    ("VECTOR_SCROLL_API_URL", "vector_scroll"),
+    ("VECTOR_SET_PAYLOAD_API_URL", "vector_payload"),
+    ("VECTOR_DELETE_API_URL", "vector_delete"),
+    ("VECTOR_INDEX_API_URL", "vector_index"),
+    ("VECTOR_COLLECTION_URL", "vector_collection"),
+)
+
+def _upstream_name(url: httpx.URL) -> str:
+    """Name of the configured upstream endpoint a request URL belongs to"""
+    url = str(url).split("?", 1)[0]
+    for setting, name in _UPSTREAM_URLS:
+        if url == getattr(Config, setting):
+            return name
+    return "other"
+
+async def _start_upstream_span(request: httpx.Request):
+    """httpx request hook starting a client span and propagating the trace to the upstream"""
+    upstream_span = start_client_span(f"{request.method} {_upstream_name(request.url)}", **{"http.method": request.method})
+    if upstream_span is not None:
+        request.headers["traceparent"] = upstream_span.traceparent
+        request.extensions["span"] = upstream_span
+
+async def _record_upstream_response(response: httpx.Response):
+    """httpx response hook counting upstream calls by status code and the bytes exchanged"""
+    # Bodies are read anyway, so reading here adds no work
+    await response.aread()
+    request = response.request
+    upstream = _upstream_name(request.url)
+    record_upstream(
+        upstream,
+        request.method,
+        str(response.status_code),
+        sent=len(request.content),
+        received=len(response.content)
+    )
+    end_client_span(
+        request.extensions.get("span"),
+        **{"http.status_code": response.status_code, "http.request_bytes": len(request.content), "http.response_bytes": len(response.content)}
+    )
+
+def _record_token_usage(data: Dict[str, Any]):
+    """Annotate the active span with the token usage of an LLM response"""
+    usage = data.get("usage") or {}
+    active_span = current_span()
+    for key in ("prompt_tokens", "completion_tokens", "total_tokens"):
+        if key in usage:
+            active_span.set_attribute(f"llm.{key}", usage[key])
+
+# Pooled clients shared by every ExternalAPIService, per event loop and client configuration
+_async_clients: Dict[asyncio.AbstractEventLoop, Dict[tuple, httpx.AsyncClient]] = {}
+
+def _client_key(kwargs: Dict[str, Any]) -> tuple:
+    """Identify a client configuration; a rotated SSL context or another transport gets a client of its own"""
+    return tuple(sorted((name, id(value)) for name, value in kwargs.items()))
+
+async def close_async_clients():
+    """Close the pooled clients of the running event loop"""
+    clients = _async_clients.pop(asyncio.get_running_loop(), {})
+    for client in clients.values():
+        await client.aclose()
 
 class ExternalAPIService:
     """Service for making external API calls with complete URLs and certificate support"""
@@ -10,7 +85,6 @@ class ExternalAPIService:
     def __init__(self):
         self.timeout = Config.REQUEST_TIMEOUT
         self.max_retries = Config.MAX_RETRIES
-        self.ssl_config = Config.get_ssl_config()
         
         # Common headers
         self.openai_headers = {
@@ -23,6 +97,11 @@ class ExternalAPIService:
             "Content-Type": "application/json"
         }
     
+    @property
+    def ssl_config(self) -> Dict[str, Any]:
+        """SSL configuration looked up per call so that a rotated certificate gets a new client"""
+        return Config.get_ssl_config()
+    
     def _get_client_kwargs(self):
         """Get common client configuration"""
         return {
@@ -30,62 +109,107 @@ class ExternalAPIService:
             **self.ssl_config
         }
     
+    def _get_async_client_kwargs(self):
+        """Get async client configuration, with upstream calls traced and recorded in metrics"""
+        return {
+            **self._get_client_kwargs(),
+            "event_hooks": {"request": [_start_upstream_span], "response": [_record_upstream_response]}
+        }
+    
+    def _get_async_client(self) -> httpx.AsyncClient:
+        """Pooled client for the running event loop, reusing connections across calls"""
+        loop = asyncio.get_running_loop()
+        for closed in [other for other in _async_clients if other.is_closed()]:
+            # Connections opened on a finished loop can neither be reused nor closed
+            del _async_clients[closed]
+        clients = _async_clients.setdefault(loop, {})
+        key = _client_key(self._get_client_kwargs())
+        client = clients.get(key)
+        if client is None or client.is_closed:
+            client = clients[key] = httpx.AsyncClient(**self._get_async_client_kwargs())
+        return client
+    
     async def create_collection_if_not_exists(self):
         """Create the collection if it doesn't exist"""
         try:
             # Use the dedicated collection URL
             collection_url = Config.VECTOR_COLLECTION_URL
             
-            async with httpx.AsyncClient(**self._get_client_kwargs()) as client:
-                try:
-                    response = await client.get(
-                        collection_url,
-                        headers=self.qdrant_headers
-                    )
-                    if response.status_code == 200:
-                        return True  # Collection exists
-                except:
-                    pass
-                
-                # Collection doesn't exist, create it
-                create_payload = {
-                    "vectors": {
-                        "size": Config.VECTOR_SIZE,
-                        "distance": Config.VECTOR_DISTANCE_METRIC
-                    }
+            client = self._get_async_client()
+            try:
+                response = await client.get(
+                    collection_url,
+                    headers=self.qdrant_headers
+                )
+                if response.status_code == 200:
+                    return True  # Collection exists
+            except:
+                pass
+                
+            # Collection doesn't exist, create it
+            create_payload = {
+                "vectors": {
+                    "size": Config.VECTOR_SIZE,
+                    "distance": Config.VECTOR_DISTANCE_METRIC
                 }
+            }
                 
+            response = await client.put(
+                collection_url,
+                headers=self.qdrant_headers,
+                content=dumps(create_payload)
+            )
+            response.raise_for_status()
+            print(f"Created Qdrant collection: {Config.QDRANT_COLLECTION_NAME}")
+            return True
+                
+        except Exception as e:
+            print(f"Error creating collection: {e}")
+            return False
+    
+    async def create_payload_indexes(self) -> bool:
+        """Create the payload indexes listed in PAYLOAD_INDEXES (idempotent)"""
+        try:
+            client = self._get_async_client()
+            for field_name, field_schema in Config.get_payload_indexes():
                 response = await client.put(
-                    collection_url,
+                    Config.VECTOR_INDEX_API_URL,
                     headers=self.qdrant_headers,
-                    json=create_payload
+                    params={"wait": "true"},
+                    content=dumps({"field_name": field_name, "field_schema": field_schema})
                 )
                 response.raise_for_status()
-                print(f"Created Qdrant collection: {Config.QDRANT_COLLECTION_NAME}")
-                return True
-                
+            return True
+            
         except Exception as e:
-            print(f"Error creating collection: {e}")
+            print(f"Error creating payload indexes: {e}")
             return False
     
-    async def get_embeddings(self, texts: List[str]) -> List[List[float]]:
-        """Get embeddings for text chunks using external embedding API"""
+    async def get_embeddings(self, texts: List[str]) -> List[np.ndarray]:
+        """Get embeddings for text chunks using external embedding API
+        
+        Embeddings are returned as float32 arrays. With EMBEDDING_ENCODING_FORMAT=base64
+        they are requested as base64 float32 bytes and decoded without building
+        per-element Python floats; plain JSON float lists are accepted as well.
+        """
         try:
             payload = {
                 "input": texts,
                 "model": Config.EMBEDDING_MODEL
             }
+            if Config.EMBEDDING_ENCODING_FORMAT == "base64":
+                payload["encoding_format"] = "base64"
             
-            async with httpx.AsyncClient(**self._get_client_kwargs()) as client:
-                response = await client.post(
-                    Config.EMBEDDING_API_URL,
-                    headers=self.openai_headers,
-                    json=payload
-                )
-                response.raise_for_status()
+            client = self._get_async_client()
+            response = await client.post(
+                Config.EMBEDDING_API_URL,
+                headers=self.openai_headers,
+                content=dumps(payload)
+            )
+            response.raise_for_status()
                 
-                data = response.json()
-                return [item["embedding"] for item in data["data"]]
+            data = response.json()
+            return [decode_embedding(item["embedding"]) for item in data["data"]]
                 
         except Exception as e:
             raise Exception(f"Embedding API error: {str(e)}")
@@ -96,24 +220,130 @@ class ExternalAPIService:
             # Ensure collection exists
             await self.create_collection_if_not_exists()
             
+            await self.upsert_points(points)
+            return True
+                
+        except Exception as e:
+            raise Exception(f"Vector insert API error: {str(e)}")
+    
+    async def upsert_points(self, points: List[Dict[str, Any]], wait: bool = True) -> Dict[str, Any]:
+        """Upsert points into an existing collection and return Qdrant's update result
+        
+        With wait=False Qdrant acknowledges the write before applying it and the
+        result carries status "acknowledged" and the operation ID.
+        """
+        try:
+            client = self._get_async_client()
+            response = await client.put(
+                Config.VECTOR_INSERT_API_URL,
+                headers=self.qdrant_headers,
+                params={"wait": "true" if wait else "false"},
+                content=dumps({"points": points})
+            )
+            response.raise_for_status()
+            return response.json().get("result", {})
+                
+        except Exception as e:
+            raise Exception(f"Vector insert API error: {str(e)}")
+    
+    async def get_existing_point_ids(self, point_ids: List[str]) -> Set[str]:
+        """Return the subset of point IDs that already exist in the vector database"""
+        if not point_ids:
+            return set()
+
+        try:
             payload = {
-                "points": points
+                "ids": point_ids,
+                "with_payload": False,
+                "with_vector": False
             }
-            
-            async with httpx.AsyncClient(**self._get_client_kwargs()) as client:
-                response = await client.put(
-                    Config.VECTOR_INSERT_API_URL,
+
+            client = self._get_async_client()
+            response = await client.post(
+                Config.VECTOR_RETRIEVE_API_URL,
+                headers=self.qdrant_headers,
+                content=dumps(payload)
+            )
+            # Collection doesn't exist yet, so nothing is stored
+            if response.status_code == 404:
+                return set()
+            response.raise_for_status()
+
+            data = response.json()
+            return {str(point["id"]) for point in data.get("result", [])}
+
+        except Exception as e:
+            raise Exception(f"Vector retrieve API error: {str(e)}")
+
+    async def scroll_points(self, filter: Dict[str, Any], with_payload: Any = True, page_size: int = 256) -> List[Dict[str, Any]]:
+        """Fetch all points matching a filter using the scroll API"""
+        try:
+            points = []
+            offset = None
+
+            client = self._get_async_client()
+            while True:
+                payload = {
+                    "filter": filter,
+                    "limit": page_size,
+                    "with_payload": with_payload,
+                    "with_vector": False
+                }
+                if offset is not None:
+                    payload["offset"] = offset
+
+                response = await client.post(
+                    Config.VECTOR_SCROLL_API_URL,
                     headers=self.qdrant_headers,
-                    json=payload
+                    content=dumps(payload)
                 )
+                # Collection doesn't exist yet, so nothing is stored
+                if response.status_code == 404:
+                    return []
                 response.raise_for_status()
-                return True
-                
+
+                result = response.json().get("result", {})
+                points.extend(result.get("points", []))
+                offset = result.get("next_page_offset")
+                if offset is None:
+                    return points
+
         except Exception as e:
-            raise Exception(f"Vector insert API error: {str(e)}")
-    
-    async def search_vectors(self, query_vector: List[float], top_k: int) -> List[Dict[str, Any]]:
-        """Search vectors in database using external API"""
+            raise Exception(f"Vector scroll API error: {str(e)}")
+
+    async def set_payload(self, payload: Dict[str, Any], point_ids: List[str]) -> bool:
+        """Set payload fields on existing points using external API"""
+        try:
+            client = self._get_async_client()
+            response = await client.post(
+                Config.VECTOR_SET_PAYLOAD_API_URL,
+                headers=self.qdrant_headers,
+                content=dumps({"payload": payload, "points": point_ids})
+            )
+            response.raise_for_status()
+            return True
+
+        except Exception as e:
+            raise Exception(f"Vector set payload API error: {str(e)}")
+
+    async def delete_points(self, filter: Dict[str, Any], wait: bool = False) -> bool:
+        """Delete points matching a filter using external API"""
+        try:
+            client = self._get_async_client()
+            response = await client.post(
+                Config.VECTOR_DELETE_API_URL,
+                headers=self.qdrant_headers,
+                params={"wait": "true" if wait else "false"},
+                content=dumps({"filter": filter})
+            )
+            response.raise_for_status()
+            return True
+
+        except Exception as e:
+            raise Exception(f"Vector delete API error: {str(e)}")
+
+    async def search_vectors(self, query_vector: np.ndarray, top_k: int, filter: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Search vectors in database using external API, optionally restricted by a payload filter"""
         try:
             payload = {
                 "vector": query_vector,
@@ -121,21 +351,55 @@ class ExternalAPIService:
                 "with_payload": True,
                 "with_vector": False
             }
+            if filter:
+                payload["filter"] = filter
             
-            async with httpx.AsyncClient(**self._get_client_kwargs()) as client:
-                response = await client.post(
-                    Config.VECTOR_SEARCH_API_URL,
-                    headers=self.qdrant_headers,
-                    json=payload
-                )
-                response.raise_for_status()
+            client = self._get_async_client()
+            response = await client.post(
+                Config.VECTOR_SEARCH_API_URL,
+                headers=self.qdrant_headers,
+                content=dumps(payload)
+            )
+            response.raise_for_status()
                 
-                data = response.json()
-                return data.get("result", [])
+            data = response.json()
+            return data.get("result", [])
                 
         except Exception as e:
             raise Exception(f"Vector search API error: {str(e)}")
     
+    async def search_vectors_batch(self, searches: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """Run several searches in one request using the batch search API
+        
+        Each search is a dict with "vector", "top_k" and optional "filter".
+        """
+        try:
+            requests = []
+            for search in searches:
+                request = {
+                    "vector": search["vector"],
+                    "limit": search["top_k"],
+                    "with_payload": True,
+                    "with_vector": False
+                }
+                if search.get("filter"):
+                    request["filter"] = search["filter"]
+                requests.append(request)
+            
+            client = self._get_async_client()
+            response = await client.post(
+                Config.VECTOR_SEARCH_BATCH_API_URL,
+                headers=self.qdrant_headers,
+                content=dumps({"searches": requests})
+            )
+            response.raise_for_status()
+                
+            data = response.json()
+            return data.get("result", [])
+                
+        except Exception as e:
+            raise Exception(f"Vector batch search API error: {str(e)}")
+    
     async def call_llm(self, messages: List[Dict[str, str]]) -> str:
         """Make LLM call using external API"""
         try:
@@ -146,16 +410,17 @@ class ExternalAPIService:
                 "max_tokens": Config.LLM_MAX_TOKENS
             }
             
-            async with httpx.AsyncClient(**self._get_client_kwargs()) as client:
-                response = await client.post(
-                    Config.LLM_API_URL,
-                    headers=self.openai_headers,
-                    json=payload
-                )
-                response.raise_for_status()
+            client = self._get_async_client()
+            response = await client.post(
+                Config.LLM_API_URL,
+                headers=self.openai_headers,
+                content=dumps(payload)
+            )
+            response.raise_for_status()
                 
-                data = response.json()
-                return data["choices"][0]["message"]["content"]
+            data = response.json()
+            _record_token_usage(data)
+            return data["choices"][0]["message"]["content"]
                 
         except Exception as e:
             raise Exception(f"LLM API error: {str(e)}")
@@ -163,14 +428,16 @@ class ExternalAPIService:
     async def call_openai_completions(self, request: Dict[str, Any]) -> Dict[str, Any]:
         """Make OpenAI chat completions call with full request"""
         try:
-            async with httpx.AsyncClient(**self._get_client_kwargs()) as client:
-                response = await client.post(
-                    Config.LLM_API_URL,
-                    headers=self.openai_headers,
-                    json=request
-                )
-                response.raise_for_status()
-                return response.json()
+            client = self._get_async_client()
+            response = await client.post(
+                Config.LLM_API_URL,
+                headers=self.openai_headers,
+                content=dumps(request)
+            )
+            response.raise_for_status()
+            data = response.json()
+            _record_token_usage(data)
+            return data
                 
         except Exception as e:
             raise Exception(f"OpenAI API error: {str(e)}")
@@ -0,0 +1,288 @@
+import asyncio
+import contextlib
+import threading
+from typing import List, Dict, Any, Optional, Set
+import grpc
+from qdrant_client import QdrantClient, models
+from qdrant_client.http.exceptions import UnexpectedResponse
+from app.core.config import Config
+from app.utils.vector_utils import to_float_list
+from app.utils.metrics import record_upstream
+
+def _is_not_found(error: Exception) -> bool:
+    """Check whether an error means the collection does not exist"""
+    if isinstance(error, grpc.RpcError):
+        return error.code() == grpc.StatusCode.NOT_FOUND
+    if isinstance(error, UnexpectedResponse):
+        return error.status_code == 404
+    # Local mode reports missing collections as ValueError
+    return isinstance(error, ValueError) and "not found" in str(error)
+
+class QdrantGrpcService:
+    """Vector database operations over Qdrant's gRPC API using qdrant-client
+
+    Exposes the same vector methods and result shapes as ExternalAPIService,
+    so VectorStore can switch transports via Config.VECTOR_TRANSPORT. Points
+    travel as protobuf with packed float vectors instead of JSON text. Pass
+    location=":memory:" (or set QDRANT_URL=":memory:") to run against
+    qdrant-client's local in-memory mode.
+    """
+
+    def __init__(self, url: Optional[str] = None, location: Optional[str] = None):
+        url = url or Config.QDRANT_URL
+        if location is None and url == ":memory:":
+            location, url = url, None
+
+        self.collection_name = Config.QDRANT_COLLECTION_NAME
+        self._collection_ready = False
+        # Local mode is not thread-safe, so its calls run one at a time
+        self._local_lock = threading.Lock() if location else None
+        if location:
+            self.client = QdrantClient(location=location)
+        else:
+            self.client = QdrantClient(
+                url=url,
+                grpc_port=Config.QDRANT_GRPC_PORT,
+                prefer_grpc=True,
+                api_key=Config.QDRANT_API_KEY,
+                timeout=Config.REQUEST_TIMEOUT
+            )
+
+    def _locked(self):
+        """Hold the local-mode lock around a client call (a no-op for a server)"""
+        return self._local_lock or contextlib.nullcontext()
+
+    async def _call(self, method, *args, **kwargs):
+        """Run a blocking client call without blocking the event loop"""
+        status = "error"
+        try:
+            def locked_call():
+                with self._locked():
+                    return method(*args, **kwargs)
+            result = await asyncio.to_thread(locked_call)
+            status = "ok"
+            return result
+        finally:
+            record_upstream(f"grpc_{method.__name__}", "GRPC", status)
+
+    async def create_collection_if_not_exists(self):
+        """Create the collection if it doesn't exist"""
+        if self._collection_ready:
+            return True
+        try:
+            if not await self._call(self.client.collection_exists, self.collection_name):
+                await self._call(
+                    self.client.create_collection,
+                    self.collection_name,
+                    vectors_config=models.VectorParams(
+                        size=Config.VECTOR_SIZE,
+                        distance=models.Distance(Config.VECTOR_DISTANCE_METRIC)
+                    )
+                )
+                print(f"Created Qdrant collection: {self.collection_name}")
+            self._collection_ready = True
+            return True
+
+        except Exception as e:
+            print(f"Error creating collection: {e}")
+            return False
+
+    async def create_payload_indexes(self) -> bool:
+        """Create the payload indexes listed in PAYLOAD_INDEXES (idempotent)"""
+        try:
+            for field_name, field_schema in Config.get_payload_indexes():
+                await self._call(
+                    self.client.create_payload_index,
+                    self.collection_name,
+                    field_name=field_name,
+                    field_schema=models.PayloadSchemaType(field_schema),
+                    wait=True
+                )
+            return True
+
+        except Exception as e:
+            print(f"Error creating payload indexes: {e}")
+            return False
+
+    async def insert_vectors(self, points: List[Dict[str, Any]]) -> bool:
+        """Insert vectors into vector database over gRPC"""
+        try:
+            # Ensure collection exists
+            await self.create_collection_if_not_exists()
+
+            await self.upsert_points(points)
+            return True
+
+        except Exception as e:
+            raise Exception(f"Vector insert API error: {str(e)}")
+
+    async def upsert_points(self, points: List[Dict[str, Any]], wait: bool = True) -> Dict[str, Any]:
+        """Upsert points into an existing collection and return Qdrant's update result"""
+        try:
+            result = await self._call(
+                self.client.upsert,
+                self.collection_name,
+                points=[models.PointStruct(**{**point, "vector": to_float_list(point["vector"])}) for point in points],
+                wait=wait
+            )
+            return {"operation_id": result.operation_id, "status": result.status.value}
+
+        except Exception as e:
+            raise Exception(f"Vector insert API error: {str(e)}")
+
+    async def get_existing_point_ids(self, point_ids: List[str]) -> Set[str]:
+        """Return the subset of point IDs that already exist in the vector database"""
+        if not point_ids:
+            return set()
+
+        try:
+            records = await self._call(
+                self.client.retrieve,
+                self.collection_name,
+                ids=point_ids,
+                with_payload=False,
+                with_vectors=False
+            )
+            return {str(record.id) for record in records}
+
+        except Exception as e:
+            # Collection doesn't exist yet, so nothing is stored
+            if _is_not_found(e):
+                return set()
+            raise Exception(f"Vector retrieve API error: {str(e)}")
+
+    async def scroll_points(self, filter: Dict[str, Any], with_payload: Any = True, page_size: int = 256) -> List[Dict[str, Any]]:
+        """Fetch all points matching a filter using the scroll API"""
+        try:
+            points = []
+            offset = None
+            scroll_filter = models.Filter(**filter)
+
+            while True:
+                records, offset = await self._call(
+                    self.client.scroll,
+                    self.collection_name,
+                    scroll_filter=scroll_filter,
+                    limit=page_size,
+                    offset=offset,
+                    with_payload=with_payload,
+                    with_vectors=False
+                )
+                points.extend({"id": str(record.id), "payload": record.payload} for record in records)
+                if offset is None:
+                    return points
+
+        except Exception as e:
+            # Collection doesn't exist yet, so nothing is stored
+            if _is_not_found(e):
+                return []
+            raise Exception(f"Vector scroll API error: {str(e)}")
+
+    async def set_payload(self, payload: Dict[str, Any], point_ids: List[str]) -> bool:
+        """Set payload fields on existing points over gRPC"""
+        try:
+            await self._call(
+                self.client.set_payload,
+                self.collection_name,
+                payload=payload,
+                points=point_ids,
+                wait=True
+            )
+            return True
+
+        except Exception as e:
+            raise Exception(f"Vector set payload API error: {str(e)}")
+
+    async def delete_points(self, filter: Dict[str, Any], wait: bool = False) -> bool:
+        """Delete points matching a filter over gRPC"""
+        try:
+            await self._call(
+                self.client.delete,
+                self.collection_name,
+                points_selector=models.FilterSelector(filter=models.Filter(**filter)),
+                wait=wait
+            )
+            return True
+
+        except Exception as e:
+            raise Exception(f"Vector delete API error: {str(e)}")
+
+    async def search_vectors(self, query_vector: Any, top_k: int, filter: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Search vectors in database over gRPC, optionally restricted by a payload filter"""
+        try:
+            response = await self._call(
+                self.client.query_points,
+                self.collection_name,
+                query=to_float_list(query_vector),
+                query_filter=models.Filter(**filter) if filter else None,
+                limit=top_k,
+                with_payload=True,
+                with_vectors=False
+            )
+            return [
+                {"id": str(point.id), "score": point.score, "payload": point.payload}
+                for point in response.points
+            ]
+
+        except Exception as e:
+            raise Exception(f"Vector search API error: {str(e)}")
+
+    async def search_vectors_batch(self, searches: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """Run several searches in one gRPC call"""
+        try:
+            responses = await self._call(
+                self.client.query_batch_points,
+                self.collection_name,
+                requests=[
+                    models.QueryRequest(
+                        query=to_float_list(search["vector"]),
+                        limit=search["top_k"],
+                        filter=models.Filter(**search["filter"]) if search.get("filter") else None,
+                        with_payload=True,
+                        with_vector=False
+                    )
+                    for search in searches
+                ]
+            )
+            return [
+                [
+                    {"id": str(point.id), "score": point.score, "payload": point.payload}
+                    for point in response.points
+                ]
+                for response in responses
+            ]
+
+        except Exception as e:
+            raise Exception(f"Vector batch search API error: {str(e)}")
+
+    def get_collection_stats(self) -> Dict[str, Any]:
+        """Get collection statistics over gRPC"""
+        try:
+            with self._locked():
+                info = self.client.get_collection(self.collection_name)
+            return {
+                "total_documents": info.points_count or 0,
+                "collection_name": self.collection_name,
+                "vector_size": Config.VECTOR_SIZE
+            }
+
+        except Exception as e:
+            # Return default stats if collection doesn't exist
+            return {
+                "total_documents": 0,
+                "collection_name": self.collection_name,
+                "vector_size": 1536
+            }
+
+    def delete_collection(self) -> bool:
+        """Delete collection over gRPC"""
+        try:
+            with self._locked():
+                self.client.delete_collection(self.collection_name)
+            return True
+
+        except Exception as e:
+            # Return True if collection doesn't exist (already deleted)
+            return True
+        finally:
+            self._collection_ready = False
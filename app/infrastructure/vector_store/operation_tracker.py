@@ -0,0 +1,55 @@
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+
+class OperationTracker:
+    """Tracks vector writes that Qdrant acknowledged but may not have applied yet
+
+    Upserts sent with wait=false return an operation ID with status
+    "acknowledged". Qdrant applies updates in order, so they stay pending
+    until a later write completes (e.g. a flush) and confirms every earlier
+    operation. At most max_pending operations are kept; older ones are
+    dropped and counted.
+    """
+
+    def __init__(self, max_pending: int = 10000):
+        self.max_pending = max_pending
+        self.pending: "OrderedDict[int, float]" = OrderedDict()
+        self.last_operation_id: Optional[int] = None
+        self.acknowledged = 0
+        self.completed = 0
+        self.dropped = 0
+
+    def record(self, result: Dict[str, Any]):
+        """Record the update result of a write"""
+        operation_id = result.get("operation_id")
+        if operation_id is not None:
+            self.last_operation_id = operation_id
+        if result.get("status") == "acknowledged" and operation_id is not None:
+            self.pending[operation_id] = time.monotonic()
+            self.acknowledged += 1
+            while len(self.pending) > self.max_pending:
+                self.pending.popitem(last=False)
+                self.dropped += 1
+        else:
+            self.completed += 1
+            if operation_id is not None:
+                self.mark_applied_through(operation_id)
+
+    def mark_applied_through(self, operation_id: Optional[int]):
+        """Forget operations up to operation_id, which are applied once it is"""
+        if operation_id is None:
+            return
+        for pending_id in [pending_id for pending_id in self.pending if pending_id <= operation_id]:
+            del self.pending[pending_id]
+
+    def to_dict(self) -> Dict[str, Any]:
+        oldest = next(iter(self.pending.values()), None)
+        return {
+            "pending_operations": len(self.pending),
+            "oldest_pending_seconds": round(time.monotonic() - oldest, 3) if oldest else None,
+            "last_operation_id": self.last_operation_id,
+            "acknowledged": self.acknowledged,
+            "completed": self.completed,
+            "dropped": self.dropped
+        }
@@ -1,89 +1,231 @@
+import asyncio
 import uuid
 import json
 from typing import List, Dict, Any, Optional
+import numpy as np
 from app.core.config import Config
 from app.infrastructure.external.external_api_service import ExternalAPIService
+from app.infrastructure.vector_store.operation_tracker import OperationTracker
+from app.utils.metrics import time_stage, record_cache
+
+# Namespace for content-addressed point IDs (Qdrant accepts UUIDs as point IDs)
+POINT_ID_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, "rag-llm/vector-store/points")
+
+def generate_point_id(source: str, content: str) -> str:
+    """Generate a deterministic point ID from a chunk's source and content"""
+    return str(uuid.uuid5(POINT_ID_NAMESPACE, f"{source}\x00{content}"))
+
+def _document_point_id(doc: Dict[str, Any]) -> str:
+    """Generate the point ID of a processed chunk"""
+    return generate_point_id(doc.get("metadata", {}).get("source", ""), doc["content"])
+
+def _source_filter(source: str) -> Dict[str, Any]:
+    """Build a Qdrant filter matching all points of a source"""
+    return {"must": [{"key": "metadata.source", "match": {"value": source}}]}
+
+def build_search_filter(filters: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Build a Qdrant filter from search filters (sources, page_from, page_to, tags)"""
+    if not filters:
+        return None
+    
+    must = []
+    if filters.get("sources"):
+        must.append({"key": "metadata.source", "match": {"any": filters["sources"]}})
+    page_range = {}
+    if filters.get("page_from") is not None:
+        page_range["gte"] = filters["page_from"]
+    if filters.get("page_to") is not None:
+        page_range["lte"] = filters["page_to"]
+    if page_range:
+        must.append({"key": "metadata.page", "range": page_range})
+    if filters.get("tags"):
+        must.append({"key": "metadata.tags", "match": {"any": filters["tags"]}})
+    
+    return {"must": must} if must else None
+
+# Matches no stored point; a wait=true delete with it is an ordered no-op write on every shard
+_FLUSH_FILTER = {"must": [{"has_id": [str(uuid.UUID(int=0))]}]}
 
 class VectorStore:
     """Handles vector storage and retrieval using external APIs"""
     
     def __init__(self):
         self.api_service = ExternalAPIService()
+        self.vector_db = self.api_service
+        if Config.VECTOR_TRANSPORT == "grpc":
+            from app.infrastructure.external.qdrant_grpc_service import QdrantGrpcService
+            self.vector_db = QdrantGrpcService()
         self.collection_name = Config.QDRANT_COLLECTION_NAME
+        self.operation_tracker = OperationTracker()
+        self._payload_indexes_ready = False
     
     async def add_documents(self, documents: List[Dict[str, Any]]) -> bool:
-        """Add documents to the vector store using external APIs"""
+        """Add documents to the vector store using external APIs
+        
+        Point IDs are derived from (source, content), so re-ingesting unchanged
+        chunks is detected with a single existence check and skips embedding.
+        """
         try:
-            # Extract text content for embedding
-            texts = [doc["content"] for doc in documents]
+            # Assign deterministic IDs, collapsing duplicate chunks within the batch
+            documents_by_id = {}
+            for doc in documents:
+                documents_by_id.setdefault(_document_point_id(doc), doc)
             
-            # Get embeddings using external API
-            embeddings = await self.api_service.get_embeddings(texts)
+            # Skip chunks that are already stored
+            try:
+                existing_ids = await self.vector_db.get_existing_point_ids(list(documents_by_id))
+            except Exception as e:
+                print(f"Error checking existing points, re-ingesting all chunks: {e}")
+                existing_ids = set()
             
-            # Prepare points for vector database
-            points = []
-            for i, (doc, embedding) in enumerate(zip(documents, embeddings)):
-                point = {
-                    "id": str(uuid.uuid4()),
-                    "vector": embedding,
-                    "payload": {
-                        "content": doc["content"],
-                        "metadata": doc["metadata"]
-                    }
-                }
-                points.append(point)
+            new_documents = [
+                doc for point_id, doc in documents_by_id.items()
+                if point_id not in existing_ids
+            ]
+            record_cache("chunks", hits=len(documents_by_id) - len(new_documents), misses=len(new_documents))
+            if not new_documents:
+                print(f"All {len(documents_by_id)} chunks already stored, skipping ingestion")
+                return True
+            
+            # Get embeddings using external API
+            embeddings = await self.embed_documents(new_documents)
             
             # Insert vectors using external API
-            success = await self.api_service.insert_vectors(points)
-            return success
+            return await self.insert_documents(new_documents, embeddings)
             
         except Exception as e:
             print(f"Error adding documents: {e}")
             return False
     
-    async def search(self, query: str, top_k: int = None) -> List[Dict[str, Any]]:
-        """Search for similar documents using external APIs"""
+    async def embed_documents(self, documents: List[Dict[str, Any]]) -> List[np.ndarray]:
+        """Get embeddings for the content of documents using external API"""
+        with time_stage("embed", texts=len(documents)):
+            return await self.api_service.get_embeddings([doc["content"] for doc in documents])
+    
+    async def insert_documents(
+        self,
+        documents: List[Dict[str, Any]],
+        embeddings: List[np.ndarray],
+        file_hash: Optional[str] = None,
+        wait: Optional[bool] = None
+    ) -> bool:
+        """Insert already embedded documents as points
+        
+        Embeddings stay float32 arrays in the points and are converted for the
+        wire by the transport. If given, file_hash is stored on each point to
+        version its source file.
+        """
+        points = []
+        for doc, embedding in zip(documents, embeddings):
+            point = {
+                "id": _document_point_id(doc),
+                "vector": embedding,
+                "payload": {
+                    "content": doc["content"],
+                    "metadata": doc["metadata"]
+                }
+            }
+            if file_hash is not None:
+                point["payload"]["file_hash"] = file_hash
+            points.append(point)
+        
+        return await self.upsert_points(points, wait=wait)
+    
+    async def upsert_points(self, points: List[Dict[str, Any]], wait: Optional[bool] = None) -> bool:
+        """Upsert points in batches, with a bounded number of batches in flight
+        
+        Batches hold VECTOR_UPSERT_BATCH_SIZE points and at most
+        VECTOR_UPSERT_CONCURRENCY of them are sent at once. With wait=False
+        (default VECTOR_UPSERT_WAIT) Qdrant acknowledges writes before applying
+        them; call flush() before reading them back.
+        """
+        if not points:
+            return True
+        if wait is None:
+            wait = Config.VECTOR_UPSERT_WAIT
+        
+        # Ensure collection and its payload indexes exist once rather than per batch
+        await self.ensure_collection()
+        
+        batch_size = Config.VECTOR_UPSERT_BATCH_SIZE
+        semaphore = asyncio.Semaphore(Config.VECTOR_UPSERT_CONCURRENCY)
+        
+        async def upsert_batch(batch):
+            async with semaphore:
+                result = await self.vector_db.upsert_points(batch, wait=wait)
+                self.operation_tracker.record(result)
+        
+        with time_stage("upsert", points=len(points), wait=wait):
+            await asyncio.gather(*(
+                upsert_batch(points[i:i + batch_size])
+                for i in range(0, len(points), batch_size)
+            ))
+        return True
+    
+    async def ensure_collection(self) -> bool:
+        """Bootstrap the collection, creating payload indexes once per process"""
+        if not await self.vector_db.create_collection_if_not_exists():
+            return False
+        if not self._payload_indexes_ready:
+            self._payload_indexes_ready = await self.vector_db.create_payload_indexes()
+        return True
+    
+    async def flush(self) -> bool:
+        """Wait until all writes acknowledged so far are applied (read-your-writes)
+        
+        Qdrant applies updates in order, so a wait=true no-op write completes
+        only after every earlier write has been applied.
+        """
+        last_operation_id = self.operation_tracker.last_operation_id
+        await self.vector_db.delete_points(_FLUSH_FILTER, wait=True)
+        self.operation_tracker.mark_applied_through(last_operation_id)
+        return True
+    
+    async def get_source_points(self, source: str) -> Dict[str, Optional[str]]:
+        """Get the stored point IDs of a source mapped to their file hash"""
+        points = await self.vector_db.scroll_points(
+            _source_filter(source),
+            with_payload=["file_hash"]
+        )
+        return {
+            str(point["id"]): (point.get("payload") or {}).get("file_hash")
+            for point in points
+        }
+    
+    async def set_file_hash(self, point_ids: List[str], file_hash: str) -> bool:
+        """Stamp existing points with the hash of the file version they belong to"""
+        if not point_ids:
+            return True
+        return await self.vector_db.set_payload({"file_hash": file_hash}, point_ids)
+    
+    async def delete_source_points(self, source: str, keep_ids: List[str]) -> bool:
+        """Delete all points of a source except the ones listed in keep_ids"""
+        filter = _source_filter(source)
+        if keep_ids:
+            filter["must_not"] = [{"has_id": keep_ids}]
+        return await self.vector_db.delete_points(filter)
+    
+    async def search(self, query: str, top_k: int = None, filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Search for similar documents using external APIs
+        
+        filters may restrict the search by sources, page_from/page_to and tags;
+        they are applied by Qdrant using the collection's payload indexes.
+        """
         if top_k is None:
             top_k = Config.TOP_K_RESULTS
         
         try:
             # Get query embedding
-            query_embeddings = await self.api_service.get_embeddings([query])
+            with time_stage("embed", texts=1):
+                query_embeddings = await self.api_service.get_embeddings([query])
             query_vector = query_embeddings[0]
             
             # Search vectors using external API
-            results = await self.api_service.search_vectors(query_vector, top_k)
+            with time_stage("search", top_k=top_k, filtered=bool(filters)) as search_span:
+                results = await self.vector_db.search_vectors(query_vector, top_k, filter=build_search_filter(filters))
+                search_span.set_attribute("results", len(results))
             
-            # Format results with better error handling
-            formatted_results = []
-            for i, result in enumerate(results):
-                try:
-                    # Check if payload exists
-                    if "payload" not in result:
-                        continue
-                    
-                    payload = result["payload"]
-                    
-                    # Check if content exists in payload (handle both "content" and "page_content" fields)
-                    content = None
-                    if "content" in payload:
-                        content = payload["content"]
-                    elif "page_content" in payload:
-                        content = payload["page_content"]
-                    else:
-                        continue
-                    
-                    formatted_result = {
-                        "content": content,
-                        "metadata": payload.get("metadata", {}),
-                        "score": result.get("score", 0.0)
-                    }
-                    formatted_results.append(formatted_result)
-                    
-                except Exception as e:
-                    print(f"Error processing search result {i}: {e}")
-                    continue
-            return formatted_results
+            return self._format_results(results)
             
         except Exception as e:
             print(f"Error searching documents: {e}")
@@ -91,18 +233,75 @@ class VectorStore:
             traceback.print_exc()
             return []
     
+    async def search_batch(self, queries: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """Search for several queries with one embedding request and one batch search
+        
+        Each query is a dict with "question" and optional "top_k" and "filters".
+        Returns the formatted results of each query in order.
+        """
+        if not queries:
+            return []
+        
+        with time_stage("embed", texts=len(queries)):
+            query_vectors = await self.api_service.get_embeddings([query["question"] for query in queries])
+        searches = [
+            {
+                "vector": vector,
+                "top_k": query.get("top_k") or Config.TOP_K_RESULTS,
+                "filter": build_search_filter(query.get("filters"))
+            }
+            for query, vector in zip(queries, query_vectors)
+        ]
+        with time_stage("search", searches=len(searches)):
+            batch_results = await self.vector_db.search_vectors_batch(searches)
+        return [self._format_results(results) for results in batch_results]
+    
+    def _format_results(self, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Format raw search results, skipping points without content"""
+        formatted_results = []
+        for i, result in enumerate(results):
+            try:
+                # Check if payload exists
+                if "payload" not in result:
+                    continue
+                
+                payload = result["payload"]
+                
+                # Check if content exists in payload (handle both "content" and "page_content" fields)
+                content = None
+                if "content" in payload:
+                    content = payload["content"]
+                elif "page_content" in payload:
+                    content = payload["page_content"]
+                else:
+                    continue
+                
+                formatted_result = {
+                    "content": content,
+                    "metadata": payload.get("metadata", {}),
+                    "score": result.get("score", 0.0)
+                }
+                formatted_results.append(formatted_result)
+                
+            except Exception as e:
+                print(f"Error processing search result {i}: {e}")
+                continue
+        return formatted_results
+    
     def get_collection_stats(self) -> Dict[str, Any]:
-        """Get statistics about the vector store"""
+        """Get statistics about the vector store, including writes not yet applied"""
         try:
-            return self.api_service.get_collection_stats()
+            stats = self.vector_db.get_collection_stats()
         except Exception as e:
             print(f"Error getting collection stats: {e}")
-            return {"total_documents": 0, "collection_name": self.collection_name}
+            stats = {"total_documents": 0, "collection_name": self.collection_name}
+        return {**stats, "writes": self.operation_tracker.to_dict()}
     
     def delete_collection(self) -> bool:
         """Delete the entire collection"""
         try:
-            return self.api_service.delete_collection()
+            self._payload_indexes_ready = False
+            return self.vector_db.delete_collection()
         except Exception as e:
             print(f"Error deleting collection: {e}")
             return False 
\ No newline at end of file
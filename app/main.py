@@ -1,14 +1,27 @@
+import time
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
 
-from app.api.routes import health, documents, questions, chat
+from app.api.routes import health, documents, questions, chat, metrics, admin
+from app.api.middleware import (
+    MetricsMiddleware, TracingMiddleware, ServerTimingMiddleware, ProfilingMiddleware, LoopMonitorMiddleware,
+    TrafficCaptureMiddleware
+)
 from app.core.config import Config
+from app.infrastructure.document_processing.loader import shutdown_process_pool, warm_document_parsers
+from app.infrastructure.external.external_api_service import close_async_clients
+from app.utils.json_utils import HAS_ORJSON
+from app.utils.tracing import get_tracer
+from app.utils.traffic_capture import TrafficRecorder
 
 # Initialize FastAPI app with configurable settings
 app = FastAPI(
     title=Config.API_TITLE,
     description=Config.API_DESCRIPTION,
-    version=Config.API_VERSION
+    version=Config.API_VERSION,
+    # Render responses with orjson when it is installed
+    default_response_class=ORJSONResponse if HAS_ORJSON else JSONResponse
 )
 
 # Add CORS middleware with configurable settings
@@ -20,8 +33,57 @@ app.add_middleware(
     allow_headers=Config.CORS_ALLOW_HEADERS,
 )
 
+# Profile requests on demand (signed X-Profile header or admin toggle)
+app.add_middleware(
+    ProfilingMiddleware,
+    controller=admin.profiling_controller,
+    sample_interval=Config.PROFILING_SAMPLE_INTERVAL_MS / 1000
+)
+
+# Record per-route request counts and latency
+if Config.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+# Trace requests, continuing incoming W3C trace context
+if Config.TRACING_ENABLED:
+    app.add_middleware(TracingMiddleware)
+
+# Report per-stage durations to clients in a Server-Timing header
+if Config.SERVER_TIMING_ENABLED:
+    app.add_middleware(ServerTimingMiddleware)
+
+# Measure event loop lag and log calls that block the loop
+if Config.LOOP_MONITOR_ENABLED:
+    app.add_middleware(LoopMonitorMiddleware)
+
+# Capture sampled traffic for replay with scripts/replay_traffic.py
+traffic_recorder = TrafficRecorder(Config.TRAFFIC_CAPTURE_PATH, Config.TRAFFIC_CAPTURE_SAMPLE_RATE)
+if Config.TRAFFIC_CAPTURE_ENABLED:
+    app.add_middleware(TrafficCaptureMiddleware, recorder=traffic_recorder, routes=Config.TRAFFIC_CAPTURE_ROUTES)
+
 # Include routers
 app.include_router(health.router, tags=["health"])
 app.include_router(documents.router, prefix="/documents", tags=["documents"])
 app.include_router(questions.router, prefix="/questions", tags=["questions"])
-app.include_router(chat.router, tags=["chat"]) 
\ No newline at end of file
+app.include_router(chat.router, tags=["chat"])
+if Config.METRICS_ENABLED:
+    app.include_router(metrics.router, tags=["metrics"])
+app.include_router(admin.router, prefix="/admin", tags=["admin"])
+
+@app.on_event("startup")
+async def warm_up():
+    """Start document processing workers and build the shared SSL context before accepting traffic"""
+    if not Config.WARMUP_ENABLED:
+        return
+    started = time.perf_counter()
+    Config.get_ssl_config()
+    await warm_document_parsers()
+    print(f"🔥 Warmed up in {(time.perf_counter() - started) * 1000:.0f} ms")
+
+@app.on_event("shutdown")
+async def shutdown():
+    """Release document processing workers and upstream connections, export pending spans and write captured traffic"""
+    shutdown_process_pool()
+    await close_async_clients()
+    get_tracer().shutdown()
+    traffic_recorder.shutdown()
\ No newline at end of file
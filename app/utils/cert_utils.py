@@ -1,7 +1,14 @@
 import os
 import ssl
-from typing import Optional, Dict, Any
+import threading
+from typing import Optional, Dict, Any, Tuple
 from pathlib import Path
+import certifi
+from app.utils.metrics import record_cache
+
+# Shared SSL contexts keyed by (cert_path, verify_ssl), stored with the mtime of the certificate they were built from
+_ssl_context_cache: Dict[Tuple[Optional[str], bool], Tuple[Optional[int], ssl.SSLContext]] = {}
+_ssl_context_lock = threading.Lock()
 
 class CertificateManager:
     """Manages certificate configuration for secure API calls"""
@@ -33,6 +40,54 @@ class CertificateManager:
             # Use default SSL context
             return ssl.create_default_context()
     
+    @staticmethod
+    def _build_ssl_context(cert_path: Optional[str] = None, verify_ssl: bool = True) -> ssl.SSLContext:
+        """Create an SSL context matching what httpx builds for the equivalent verify setting"""
+        if cert_path:
+            # Trust only the configured certificate bundle
+            return ssl.create_default_context(cafile=cert_path)
+        elif not verify_ssl:
+            ssl_context = ssl.create_default_context()
+            ssl_context.check_hostname = False
+            ssl_context.verify_mode = ssl.CERT_NONE
+            return ssl_context
+        else:
+            # Honour SSL_CERT_FILE like httpx does, falling back to the certifi bundle
+            return ssl.create_default_context(cafile=os.environ.get("SSL_CERT_FILE") or certifi.where())
+    
+    @staticmethod
+    def get_cached_ssl_context(cert_path: Optional[str] = None, verify_ssl: bool = True) -> ssl.SSLContext:
+        """Get the shared SSL context for this configuration, rebuilt only when the certificate file changes"""
+        if not (cert_path and CertificateManager.validate_certificate_path(cert_path)):
+            cert_path = None
+        key = (cert_path, verify_ssl)
+        mtime = os.stat(cert_path).st_mtime_ns if cert_path else None
+        
+        cached = _ssl_context_cache.get(key)
+        if cached and cached[0] == mtime:
+            record_cache("ssl_context", hits=1)
+            return cached[1]
+        
+        with _ssl_context_lock:
+            cached = _ssl_context_cache.get(key)
+            if cached and cached[0] == mtime:
+                record_cache("ssl_context", hits=1)
+                return cached[1]
+            record_cache("ssl_context", misses=1)
+            ssl_context = CertificateManager._build_ssl_context(cert_path, verify_ssl)
+            if cached:
+                print(f"🔄 Certificate file changed, reloaded SSL context from: {cert_path}")
+            else:
+                CertificateManager.log_ssl_config(cert_path, verify_ssl)
+            _ssl_context_cache[key] = (mtime, ssl_context)
+            return ssl_context
+    
+    @staticmethod
+    def clear_ssl_context_cache():
+        """Drop cached SSL contexts so the next request rebuilds them"""
+        with _ssl_context_lock:
+            _ssl_context_cache.clear()
+    
     @staticmethod
     def get_httpx_ssl_config(cert_path: Optional[str] = None, verify_ssl: bool = True) -> Dict[str, Any]:
         """Get httpx-compatible SSL configuration"""
@@ -0,0 +1,9 @@
+import hashlib
+
+def compute_file_hash(file_path: str, block_size: int = 1024 * 1024) -> str:
+    """Compute the SHA-256 hash of a file without reading it into memory at once"""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
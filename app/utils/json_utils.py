@@ -0,0 +1,28 @@
+import json
+from typing import Any
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # optional dependency, fall back to the standard library
+    orjson = None
+
+HAS_ORJSON = orjson is not None
+
+def _default(obj: Any) -> Any:
+    """Serialize NumPy values for the standard library encoder"""
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def dumps(obj: Any) -> bytes:
+    """Serialize obj to compact JSON bytes, using orjson when installed
+
+    NumPy arrays (e.g. embeddings) are serialized directly without first
+    converting them to lists of Python floats.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(obj, default=_default, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
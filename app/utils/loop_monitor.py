@@ -0,0 +1,114 @@
+import asyncio
+import inspect
+import sys
+import threading
+import time
+import traceback
+import weakref
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+from app.utils.metrics import LOOP_LAG
+
+# Most recent blocking events reported by any monitor
+blocking_events: Deque[Dict[str, Any]] = deque(maxlen=100)
+
+def _innermost_coroutine(frame) -> Optional[str]:
+    """Qualified name of the innermost coroutine on a thread's stack"""
+    while frame is not None:
+        if frame.f_code.co_flags & inspect.CO_COROUTINE:
+            # co_qualname is new in Python 3.11
+            return getattr(frame.f_code, "co_qualname", frame.f_code.co_name)
+        frame = frame.f_back
+    return None
+
+class LoopLagMonitor:
+    """Measure event loop scheduling lag and report calls that block the loop
+
+    A heartbeat task sleeps for `interval` seconds at a time; how late it
+    wakes up is the loop's scheduling lag, observed in the
+    rag_event_loop_lag_seconds histogram. A watchdog thread checks the
+    heartbeat: once the loop has not run it for longer than `threshold`
+    seconds, the loop is blocked, and the loop thread's stack and the
+    running task are captured while the blocking call is still on it, logged
+    and kept in blocking_events.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, interval: float = 0.05, threshold: float = 0.1):
+        # Weak, so that the monitor does not keep its loop (and _monitors entry) alive
+        self._loop = weakref.ref(loop)
+        self.interval = interval
+        self.threshold = threshold
+        self._heartbeat = time.monotonic()
+        self._loop_thread_id = threading.get_ident()
+        self._stopped = threading.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def loop(self) -> Optional[asyncio.AbstractEventLoop]:
+        return self._loop()
+
+    def start(self) -> None:
+        """Start monitoring; must be called from the loop's thread"""
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._task = self.loop.create_task(self._beat())
+        threading.Thread(target=self._watch, name="loop-lag-watchdog", daemon=True).start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
+
+    async def _beat(self):
+        try:
+            while True:
+                expected = self.loop.time() + self.interval
+                await asyncio.sleep(self.interval)
+                LOOP_LAG.observe(max(0.0, self.loop.time() - expected))
+                self._heartbeat = time.monotonic()
+        finally:
+            self._stopped.set()
+            # The finished task's traceback refers to the loop
+            self._task = None
+            if _monitors.get(self.loop) is self:
+                del _monitors[self.loop]
+
+    def _watch(self) -> None:
+        reported = None
+        check_interval = min(self.interval, self.threshold) / 2
+        while not self._stopped.wait(check_interval):
+            loop = self.loop
+            if loop is None or loop.is_closed():
+                return
+            heartbeat = self._heartbeat
+            blocked_for = time.monotonic() - heartbeat - self.interval
+            if blocked_for > self.threshold and reported != heartbeat:
+                # Report each stall once, while the blocking call is still on the stack
+                reported = heartbeat
+                self._report(loop, blocked_for)
+
+    def _report(self, loop: asyncio.AbstractEventLoop, blocked_for: float) -> None:
+        frame = sys._current_frames().get(self._loop_thread_id)
+        stack = "".join(traceback.format_stack(frame)) if frame is not None else ""
+        task = asyncio.current_task(loop)
+        event = {
+            "blocked_ms": round(blocked_for * 1000, 1),
+            "task": task.get_name() if task is not None else None,
+            "coroutine": _innermost_coroutine(frame),
+            "stack": stack
+        }
+        blocking_events.append(event)
+        print(f"⚠️ Event loop blocked for over {event['blocked_ms']} ms in {event['coroutine']} ({event['task']}):\n{stack}")
+
+# One monitor per event loop; a monitor removes itself when its heartbeat stops,
+# e.g. when asyncio.run cancels remaining tasks, and the entry goes with the loop otherwise
+_monitors: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, LoopLagMonitor]" = weakref.WeakKeyDictionary()
+
+def ensure_loop_monitor(interval: float, threshold: float) -> LoopLagMonitor:
+    """Start a monitor for the running event loop unless it already has one"""
+    loop = asyncio.get_running_loop()
+    monitor = _monitors.get(loop)
+    if monitor is None:
+        monitor = _monitors[loop] = LoopLagMonitor(loop, interval, threshold)
+        monitor.start()
+    return monitor
@@ -0,0 +1,159 @@
+import contextlib
+import threading
+import tracemalloc
+from typing import Any, Dict, List, Optional
+from app.utils.metrics import STAGE_PEAK_MEMORY
+
+# Allocations of the profiler itself are left out of retained-memory reports
+_IGNORED_FILES = (tracemalloc.__file__, "<frozen importlib._bootstrap>", "<frozen importlib._bootstrap_external>")
+
+class _Window:
+    __slots__ = ("stage", "start", "peak")
+
+    def __init__(self, stage: str, start: int):
+        self.stage = stage
+        self.start = start
+        self.peak = start
+
+# tracemalloc keeps a single process-wide peak; it is folded into every open
+# window before being reset, so overlapping windows each see their own peak
+_windows_lock = threading.Lock()
+_open_windows: List[_Window] = []
+
+# Tracing started by profiles is stopped when the last running profile finishes, so that
+# allocations outside of profiling don't pay for it; tracing started elsewhere is left on
+_running_profiles = 0
+_started_tracing = False
+
+def _fold_peak() -> int:
+    current, peak = tracemalloc.get_traced_memory()
+    for window in _open_windows:
+        window.peak = max(window.peak, peak)
+    tracemalloc.reset_peak()
+    return current
+
+def _open_window(stage: str) -> _Window:
+    with _windows_lock:
+        window = _Window(stage, _fold_peak())
+        _open_windows.append(window)
+        return window
+
+def _close_window(window: _Window) -> Dict[str, int]:
+    with _windows_lock:
+        current = _fold_peak()
+        _open_windows.remove(window)
+    return {
+        "peak_bytes": window.peak,
+        "peak_increase_bytes": window.peak - window.start,
+        "retained_bytes": current - window.start
+    }
+
+class StageMemory:
+    """Peak and retained traced memory of one stage, accumulated over its batches"""
+
+    def __init__(self):
+        self.batches = 0
+        self.peak_bytes = 0
+        self.peak_increase_bytes = 0
+        self.retained_bytes = 0
+
+    def record(self, window: Dict[str, int]) -> None:
+        self.batches += 1
+        self.peak_bytes = max(self.peak_bytes, window["peak_bytes"])
+        self.peak_increase_bytes = max(self.peak_increase_bytes, window["peak_increase_bytes"])
+        self.retained_bytes += window["retained_bytes"]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "batches": self.batches,
+            "peak_mb": round(self.peak_bytes / 1048576, 3),
+            "peak_increase_mb": round(self.peak_increase_bytes / 1048576, 3),
+            "retained_mb": round(self.retained_bytes / 1048576, 3)
+        }
+
+class MemoryProfile:
+    """Per-stage memory of one ingestion, measured with tracemalloc
+
+    Each stage's batches are measured in windows: peak is the highest traced
+    memory while a batch ran, peak increase its rise above the memory at the
+    start of the batch, and retained the memory still allocated at its end.
+    Traced memory is process-wide, so stages running concurrently (or other
+    requests) show up in each other's numbers. A snapshot diff between start()
+    and finish() lists where the ingestion's retained memory was allocated.
+    Tracing runs only while profiles are running, unless it was already on.
+
+    A disabled profile records nothing and costs nothing.
+    """
+
+    def __init__(self, enabled: bool, frames: int = 1, top: int = 5):
+        self.enabled = enabled
+        self.frames = frames
+        self.top = top
+        self.stages: Dict[str, StageMemory] = {}
+        self._total: Optional[_Window] = None
+        self._snapshot: Optional[tracemalloc.Snapshot] = None
+
+    def start(self) -> "MemoryProfile":
+        global _running_profiles, _started_tracing
+        if self.enabled:
+            with _windows_lock:
+                if not tracemalloc.is_tracing():
+                    tracemalloc.start(self.frames)
+                    _started_tracing = True
+                _running_profiles += 1
+            self._snapshot = tracemalloc.take_snapshot()
+            self._total = _open_window("total")
+        return self
+
+    def open(self, stage: str) -> Optional[_Window]:
+        """Start measuring a batch of a stage; pass the result to close()"""
+        return _open_window(stage) if self.enabled else None
+
+    def close(self, window: Optional[_Window]) -> None:
+        if window is None:
+            return
+        measured = _close_window(window)
+        self.stages.setdefault(window.stage, StageMemory()).record(measured)
+        STAGE_PEAK_MEMORY.labels(window.stage).observe(max(0, measured["peak_increase_bytes"]))
+
+    @contextlib.contextmanager
+    def stage(self, stage: str):
+        window = self.open(stage)
+        try:
+            yield
+        finally:
+            self.close(window)
+
+    def finish(self) -> Optional[Dict[str, Any]]:
+        """Stop measuring and report per-stage memory, or None if disabled"""
+        global _running_profiles, _started_tracing
+        if not self.enabled or self._total is None:
+            return None
+        try:
+            total = _close_window(self._total)
+            self._total = None
+            filters = [tracemalloc.Filter(False, filename) for filename in _IGNORED_FILES]
+            snapshot = tracemalloc.take_snapshot().filter_traces(filters)
+            top_retained = [
+                {
+                    "location": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                    "size_mb": round(stat.size_diff / 1048576, 3),
+                    "count": stat.count_diff
+                }
+                for stat in snapshot.compare_to(self._snapshot.filter_traces(filters), "lineno")[:self.top]
+                if stat.size_diff > 0
+            ]
+            self._snapshot = None
+        finally:
+            with _windows_lock:
+                _running_profiles -= 1
+                if _running_profiles == 0 and _started_tracing:
+                    tracemalloc.stop()
+                    _started_tracing = False
+        return {
+            "stages": {name: stage.to_dict() for name, stage in self.stages.items()},
+            "peak_mb": round(total["peak_bytes"] / 1048576, 3),
+            "peak_increase_mb": round(total["peak_increase_bytes"] / 1048576, 3),
+            "retained_mb": round(total["retained_bytes"] / 1048576, 3),
+            "top_retained": top_retained
+        }
@@ -0,0 +1,112 @@
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
+from app.utils.tracing import span
+from app.utils.server_timing import get_request_timings
+
+try:
+    import prometheus_client
+    from prometheus_client import Counter, Histogram
+except ImportError:  # optional dependency, metrics become no-ops
+    prometheus_client = None
+
+HAS_PROMETHEUS = prometheus_client is not None
+
+# Latency buckets in seconds, from in-process work up to slow LLM calls
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+class _NoopMetric:
+    """Stand-in for a metric when prometheus_client is not installed"""
+
+    def labels(self, *args, **kwargs) -> "_NoopMetric":
+        return self
+
+    def inc(self, amount: float = 1) -> None:
+        pass
+
+    def observe(self, amount: float) -> None:
+        pass
+
+def _counter(name: str, documentation: str, labelnames):
+    return Counter(name, documentation, labelnames) if HAS_PROMETHEUS else _NoopMetric()
+
+def _histogram(name: str, documentation: str, labelnames, buckets=LATENCY_BUCKETS):
+    return Histogram(name, documentation, labelnames, buckets=buckets) if HAS_PROMETHEUS else _NoopMetric()
+
+HTTP_REQUESTS = _counter(
+    "rag_http_requests_total", "HTTP requests handled, by route and status code",
+    ["method", "route", "status"]
+)
+HTTP_REQUEST_DURATION = _histogram(
+    "rag_http_request_duration_seconds", "HTTP request latency, by route",
+    ["method", "route"]
+)
+STAGE_DURATION = _histogram(
+    "rag_stage_duration_seconds", "Latency of RAG pipeline stages (embed, search, context, llm, upsert)",
+    ["stage"]
+)
+UPSTREAM_REQUESTS = _counter(
+    "rag_upstream_requests_total", "Calls to upstream APIs, by endpoint and status code",
+    ["upstream", "method", "status"]
+)
+UPSTREAM_BYTES = _counter(
+    "rag_upstream_bytes_total", "Bytes exchanged with upstream APIs",
+    ["upstream", "direction"]
+)
+CACHE_REQUESTS = _counter(
+    "rag_cache_requests_total", "Cache lookups, by cache and result (hit or miss)",
+    ["cache", "result"]
+)
+STAGE_PEAK_MEMORY = _histogram(
+    "rag_ingestion_stage_peak_memory_bytes", "Peak traced memory increase per ingestion stage batch (MEMORY_PROFILING_ENABLED)",
+    ["stage"], buckets=tuple(2 ** power for power in range(20, 31))
+)
+LOOP_LAG = _histogram(
+    "rag_event_loop_lag_seconds", "How late the event loop runs a scheduled callback",
+    [], buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+)
+
+@contextmanager
+def time_stage(stage: str, **attributes) -> Iterator[Any]:
+    """Observe the duration of a pipeline stage, whether or not it raises
+
+    The stage is also traced as a span carrying the given attributes, which
+    is yielded so the stage can add attributes once they are known, and added
+    to the current request's Server-Timing header.
+    """
+    started = time.perf_counter()
+    try:
+        with span(stage, **attributes) as stage_span:
+            yield stage_span
+    finally:
+        seconds = time.perf_counter() - started
+        STAGE_DURATION.labels(stage).observe(seconds)
+        timings = get_request_timings()
+        if timings is not None:
+            timings.add_stage(stage, seconds)
+
+def record_cache(cache: str, hits: int = 0, misses: int = 0) -> None:
+    """Count cache hits and misses (the hit ratio is hits / (hits + misses))"""
+    if hits:
+        CACHE_REQUESTS.labels(cache, "hit").inc(hits)
+    if misses:
+        CACHE_REQUESTS.labels(cache, "miss").inc(misses)
+    timings = get_request_timings()
+    if timings is not None and (hits or misses):
+        timings.add_cache(cache, hits, misses)
+
+def record_upstream(upstream: str, method: str, status: str, sent: int = 0, received: int = 0) -> None:
+    """Count one upstream call and the bytes it sent and received"""
+    UPSTREAM_REQUESTS.labels(upstream, method, status).inc()
+    if sent:
+        UPSTREAM_BYTES.labels(upstream, "sent").inc(sent)
+    if received:
+        UPSTREAM_BYTES.labels(upstream, "received").inc(received)
+
+def render_metrics() -> Optional[bytes]:
+    """Render all metrics in the Prometheus text format, or None without prometheus_client"""
+    if not HAS_PROMETHEUS:
+        return None
+    return prometheus_client.generate_latest()
+
+CONTENT_TYPE = prometheus_client.CONTENT_TYPE_LATEST if HAS_PROMETHEUS else "text/plain"
@@ -0,0 +1,261 @@
+import asyncio
+import cProfile
+import hashlib
+import hmac
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple
+
+# Profiler modes: "sample" follows one request's task (wall time including async waits),
+# "cprofile" records every call on the event loop thread (CPU, deterministic)
+PROFILE_MODES = {"sample": ".speedscope.json", "cprofile": ".pstats"}
+
+# Longest a signed profiling header stays valid
+MAX_SIGNATURE_TTL = 3600
+
+def sign_profile_header(secret: str, mode: str = "sample", ttl: int = 300) -> str:
+    """Build an X-Profile header value, valid for ttl seconds"""
+    expires = int(time.time()) + ttl
+    signature = hmac.new(secret.encode(), f"{mode}:{expires}".encode(), hashlib.sha256).hexdigest()
+    return f"{mode}:{expires}:{signature}"
+
+def verify_profile_header(value: str, secret: Optional[str]) -> Optional[str]:
+    """Return the requested mode if an X-Profile header value is validly signed and unexpired"""
+    if not secret:
+        return None
+    try:
+        mode, expires, signature = value.split(":")
+        expires_at = int(expires)
+    except ValueError:
+        return None
+    now = time.time()
+    if mode not in PROFILE_MODES or not now < expires_at <= now + MAX_SIGNATURE_TTL:
+        return None
+    expected = hmac.new(secret.encode(), f"{mode}:{expires}".encode(), hashlib.sha256).hexdigest()
+    return mode if hmac.compare_digest(expected, signature) else None
+
+class RateLimiter:
+    """Allow at most `limit` events per sliding window of `period` seconds"""
+
+    def __init__(self, limit: int, period: float = 60.0):
+        self.limit = limit
+        self.period = period
+        self._events: deque = deque()
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            while self._events and self._events[0] <= now - self.period:
+                self._events.popleft()
+            if len(self._events) >= self.limit:
+                return False
+            self._events.append(now)
+            return True
+
+class TaskSampler:
+    """Sampling profiler for a single asyncio task, producing speedscope JSON
+
+    A background thread samples the task's logical async stack: the chain of
+    awaiting coroutines, extended with the event loop thread's stack while
+    the task is running, or ending in an "(await ...)" frame while it is
+    suspended. Samples are weighted by wall time, so time spent waiting on
+    upstream calls shows up next to CPU time.
+    """
+
+    def __init__(self, task: asyncio.Task, interval: float = 0.005):
+        self.task = task
+        self.interval = interval
+        self.thread_id = threading.get_ident()
+        self.frames: List[Dict[str, Any]] = []
+        self._frame_index: Dict[Tuple[str, str, int], int] = {}
+        self.samples: List[List[int]] = []
+        self.weights: List[float] = []
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._started = 0.0
+        self._elapsed = 0.0
+
+    def start(self) -> None:
+        self._started = self._last = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="task-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+        self._elapsed = time.perf_counter() - self._started
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            now = time.perf_counter()
+            stack = self._task_stack()
+            if stack:
+                self.samples.append(stack)
+                self.weights.append((now - self._last) * 1000)
+            self._last = now
+
+    def _frame_id(self, name: str, file: str, line: int) -> int:
+        key = (name, file, line)
+        index = self._frame_index.get(key)
+        if index is None:
+            index = self._frame_index[key] = len(self.frames)
+            self.frames.append({"name": name, "file": file, "line": line})
+        return index
+
+    def _code_frame_id(self, frame) -> int:
+        code = frame.f_code
+        return self._frame_id(code.co_name, code.co_filename, code.co_firstlineno)
+
+    def _task_stack(self) -> List[int]:
+        """Sample the task's stack, outermost frame first"""
+        if self.task.done():
+            return []
+        coroutine_frames = []
+        awaitable = self.task.get_coro()
+        running = False
+        while awaitable is not None:
+            frame = getattr(awaitable, "cr_frame", None) or getattr(awaitable, "gi_frame", None)
+            if frame is None:
+                break
+            coroutine_frames.append(frame)
+            running = running or getattr(awaitable, "cr_running", False) or getattr(awaitable, "gi_running", False)
+            awaitable = getattr(awaitable, "cr_await", None) or getattr(awaitable, "gi_yieldfrom", None)
+
+        stack = [self._code_frame_id(frame) for frame in coroutine_frames]
+        if running:
+            # Frames called synchronously below the innermost coroutine
+            thread_frame = sys._current_frames().get(self.thread_id)
+            inner = []
+            while thread_frame is not None and coroutine_frames and thread_frame is not coroutine_frames[-1]:
+                inner.append(thread_frame)
+                thread_frame = thread_frame.f_back
+            if thread_frame is not None:
+                stack.extend(self._code_frame_id(frame) for frame in reversed(inner))
+        elif awaitable is not None:
+            stack.append(self._frame_id(f"(await {type(awaitable).__name__})", "", 0))
+        return stack
+
+    def to_speedscope(self, name: str) -> Dict[str, Any]:
+        """Profile in the speedscope file format"""
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "rag-llm-api",
+            "shared": {"frames": self.frames},
+            "profiles": [{
+                "type": "sampled",
+                "name": name,
+                "unit": "milliseconds",
+                "startValue": 0,
+                "endValue": round(self._elapsed * 1000, 3),
+                "samples": self.samples,
+                "weights": [round(weight, 3) for weight in self.weights]
+            }]
+        }
+
+class ProfilingController:
+    """Decides which requests are profiled and stores their profiles
+
+    A request is profiled when it carries a valid signed X-Profile header or
+    while an admin has profiling switched on, and only if the rate limit
+    allows. Profiles are written to the output directory, keeping the most
+    recent max_stored.
+    """
+
+    def __init__(self, output_dir: str, rate_limit: int, max_stored: int, secret: Optional[str] = None):
+        self.output_dir = output_dir
+        self.max_stored = max_stored
+        self.secret = secret
+        self.rate_limiter = RateLimiter(rate_limit)
+        self.enabled_mode: Optional[str] = None
+        self.remaining = 0
+        self._cprofile_active = False
+        self._lock = threading.Lock()
+
+    def enable(self, mode: str, requests: int) -> None:
+        """Profile the next `requests` requests (admin toggle)"""
+        with self._lock:
+            self.enabled_mode, self.remaining = mode, requests
+
+    def disable(self) -> None:
+        with self._lock:
+            self.enabled_mode, self.remaining = None, 0
+
+    def status(self) -> Dict[str, Any]:
+        return {"enabled": self.enabled_mode is not None, "mode": self.enabled_mode, "remaining": self.remaining}
+
+    def select(self, header: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+        """Choose the profiler mode for a request, returning (mode, status)
+
+        status explains a refusal: "invalid-signature", "rate-limited" or "busy".
+        """
+        mode = None
+        if header:
+            mode = verify_profile_header(header, self.secret)
+            if mode is None:
+                return None, "invalid-signature"
+        else:
+            if self.enabled_mode is None:
+                return None, None
+            with self._lock:
+                if self.enabled_mode is None:
+                    return None, None
+                mode = self.enabled_mode
+                self.remaining -= 1
+                if self.remaining <= 0:
+                    self.enabled_mode = None
+
+        if not self.rate_limiter.allow():
+            return None, "rate-limited"
+        if mode == "cprofile":
+            # Only one deterministic profiler can be active per thread
+            with self._lock:
+                if self._cprofile_active:
+                    return None, "busy"
+                self._cprofile_active = True
+        return mode, None
+
+    def new_profile_id(self, mode: str) -> str:
+        return f"{uuid.uuid4().hex}{PROFILE_MODES[mode]}"
+
+    def path(self, profile_id: str) -> Optional[str]:
+        """Path of a stored profile, or None if there is no such profile"""
+        if os.path.basename(profile_id) != profile_id or not profile_id.endswith(tuple(PROFILE_MODES.values())):
+            return None
+        path = os.path.join(self.output_dir, profile_id)
+        return path if os.path.exists(path) else None
+
+    def list_profiles(self) -> List[str]:
+        """Stored profile IDs, newest first"""
+        if not os.path.isdir(self.output_dir):
+            return []
+        entries = [entry for entry in os.scandir(self.output_dir) if entry.name.endswith(tuple(PROFILE_MODES.values()))]
+        return [entry.name for entry in sorted(entries, key=lambda entry: entry.stat().st_mtime, reverse=True)]
+
+    def save_sampled(self, profile_id: str, sampler: TaskSampler, name: str) -> None:
+        os.makedirs(self.output_dir, exist_ok=True)
+        with open(os.path.join(self.output_dir, profile_id), "w", encoding="utf-8") as f:
+            json.dump(sampler.to_speedscope(name), f)
+        self._prune()
+
+    def save_cprofile(self, profile_id: str, profiler: cProfile.Profile) -> None:
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            profiler.dump_stats(os.path.join(self.output_dir, profile_id))
+            self._prune()
+        finally:
+            with self._lock:
+                self._cprofile_active = False
+
+    def _prune(self) -> None:
+        for profile_id in self.list_profiles()[self.max_stored:]:
+            try:
+                os.unlink(os.path.join(self.output_dir, profile_id))
+            except OSError:
+                pass
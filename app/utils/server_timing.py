@@ -0,0 +1,45 @@
+import contextvars
+from typing import Dict, List, Optional
+
+class RequestTimings:
+    """Stage durations and cache results collected while handling one request"""
+
+    __slots__ = ("stages", "caches")
+
+    def __init__(self):
+        self.stages: Dict[str, float] = {}
+        self.caches: Dict[str, List[int]] = {}
+
+    def add_stage(self, stage: str, seconds: float) -> None:
+        """Add time spent in a stage; repeated stages (e.g. several embed calls) accumulate"""
+        self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+    def add_cache(self, cache: str, hits: int, misses: int) -> None:
+        counts = self.caches.setdefault(cache, [0, 0])
+        counts[0] += hits
+        counts[1] += misses
+
+    def header_value(self, total_seconds: float) -> str:
+        """Format the timings as a Server-Timing header value (durations in milliseconds)"""
+        entries = [f"{stage};dur={seconds * 1000:.1f}" for stage, seconds in self.stages.items()]
+        for cache, (hits, misses) in self.caches.items():
+            result = "hit" if not misses else "miss" if not hits else f"{hits} hit {misses} miss"
+            entries.append(f'cache-{cache};desc="{result}"')
+        entries.append(f"total;dur={total_seconds * 1000:.1f}")
+        return ", ".join(entries)
+
+_request_timings: contextvars.ContextVar[Optional[RequestTimings]] = contextvars.ContextVar("request_timings", default=None)
+
+def start_request_timings() -> RequestTimings:
+    """Start collecting timings for the current request"""
+    timings = RequestTimings()
+    _request_timings.set(timings)
+    return timings
+
+def get_request_timings() -> Optional[RequestTimings]:
+    """Timings of the current request, or None outside of a timed request"""
+    return _request_timings.get()
+
+def detach_request_timings() -> None:
+    """Stop the current task from writing into the timings of the request that created it"""
+    _request_timings.set(None)
@@ -0,0 +1,298 @@
+import contextvars
+import functools
+import json
+import os
+import queue
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+_TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+
+# OTLP span kinds and status codes
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+SPAN_KIND_CLIENT = 3
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+def _new_id(num_bytes: int) -> str:
+    return os.urandom(num_bytes).hex()
+
+def parse_traceparent(header: Optional[str]) -> Optional[Tuple[str, str]]:
+    """Parse a W3C traceparent header into (trace_id, parent_span_id)"""
+    match = _TRACEPARENT.match((header or "").strip().lower())
+    if not match or match.group(1) == "0" * 32 or match.group(2) == "0" * 16:
+        return None
+    return match.group(1), match.group(2)
+
+def format_traceparent(trace_id: str, span_id: str) -> str:
+    """Format a sampled W3C traceparent header"""
+    return f"00-{trace_id}-{span_id}-01"
+
+class Span:
+    """A timed operation within a trace"""
+
+    __slots__ = ("trace_id", "span_id", "parent_span_id", "name", "kind", "start_ns", "end_ns", "attributes", "status")
+
+    def __init__(self, name: str, trace_id: str, parent_span_id: Optional[str] = None, kind: int = SPAN_KIND_INTERNAL):
+        self.trace_id = trace_id
+        self.span_id = _new_id(8)
+        self.parent_span_id = parent_span_id
+        self.name = name
+        self.kind = kind
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes: Dict[str, Any] = {}
+        self.status = STATUS_OK
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def set_error(self, error: BaseException) -> None:
+        self.status = STATUS_ERROR
+        self.attributes["error.message"] = str(error)
+
+    def update_name(self, name: str) -> None:
+        self.name = name
+
+    @property
+    def traceparent(self) -> str:
+        return format_traceparent(self.trace_id, self.span_id)
+
+    def to_otlp(self) -> Dict[str, Any]:
+        """Span in the OTLP/JSON encoding"""
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns or self.start_ns),
+            "attributes": [{"key": key, "value": _otlp_value(value)} for key, value in self.attributes.items()],
+            "status": {"code": self.status}
+        }
+        if self.parent_span_id:
+            span["parentSpanId"] = self.parent_span_id
+        return span
+
+class _NoopSpan:
+    """Span used while tracing is disabled"""
+
+    traceparent = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def set_error(self, error: BaseException) -> None:
+        pass
+
+    def update_name(self, name: str) -> None:
+        pass
+
+_NOOP_SPAN = _NoopSpan()
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+def to_otlp_request(spans: List[Span], service_name: str) -> Dict[str, Any]:
+    """Wrap spans in an OTLP/JSON ExportTraceServiceRequest"""
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": service_name}}]},
+            "scopeSpans": [{"scope": {"name": "app.utils.tracing"}, "spans": [span.to_otlp() for span in spans]}]
+        }]
+    }
+
+class FileSpanExporter:
+    """Append span batches to a file as OTLP/JSON lines"""
+
+    def __init__(self, path: str, service_name: str):
+        self.path = path
+        self.service_name = service_name
+
+    def export(self, spans: List[Span]) -> None:
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(to_otlp_request(spans, self.service_name)) + "\n")
+
+class OTLPHttpSpanExporter:
+    """Post span batches to an OTLP/HTTP collector endpoint as JSON"""
+
+    def __init__(self, endpoint: str, service_name: str, timeout: float = 5.0):
+        self.endpoint = endpoint
+        self.service_name = service_name
+        self.timeout = timeout
+
+    def export(self, spans: List[Span]) -> None:
+        import httpx
+
+        response = httpx.post(self.endpoint, json=to_otlp_request(spans, self.service_name), timeout=self.timeout)
+        response.raise_for_status()
+
+class Tracer:
+    """Exports finished spans in batches from a background thread
+
+    Spans are exported either as OTLP/JSON lines appended to a local file
+    (the format of the OpenTelemetry Collector's file exporter) or posted to
+    an OTLP/HTTP collector such as scripts/trace_collector.py. Without an
+    exporter tracing is disabled and span() records nothing. Once max_queue
+    spans are waiting (e.g. while the collector is slow or down), further
+    spans are dropped and counted.
+    """
+
+    def __init__(self, exporter=None, max_batch_size: int = 256, max_queue: int = 10000):
+        self.exporter = exporter
+        self.max_batch_size = max_batch_size
+        self.dropped = 0
+        self._queue: "queue.Queue[Optional[Span]]" = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.exporter is not None
+
+    def _on_end(self, span: Span) -> None:
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._export_loop, name="span-exporter", daemon=True)
+                    self._thread.start()
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            self.dropped += 1
+
+    def _export_loop(self) -> None:
+        while True:
+            span = self._queue.get()
+            if span is None:
+                return
+            batch = [span]
+            while len(batch) < self.max_batch_size:
+                try:
+                    span = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if span is None:
+                    self._export(batch)
+                    return
+                batch.append(span)
+            self._export(batch)
+
+    def _export(self, batch: List[Span]) -> None:
+        try:
+            self.exporter.export(batch)
+        except Exception as e:
+            print(f"Error exporting {len(batch)} spans: {e}")
+
+    def shutdown(self) -> None:
+        """Export queued spans and stop the export thread"""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(timeout=5)
+            self._thread = None
+
+_current_span: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar("current_span", default=None)
+_tracer: Optional[Tracer] = None
+
+def get_tracer() -> Tracer:
+    """Get the process tracer, configured from Config on first use"""
+    global _tracer
+    if _tracer is None:
+        # Imported here since Config imports this module indirectly
+        from app.core.config import Config
+
+        exporter = None
+        if Config.TRACING_ENABLED:
+            if Config.TRACING_EXPORTER == "otlp":
+                exporter = OTLPHttpSpanExporter(Config.TRACING_OTLP_ENDPOINT, Config.TRACING_SERVICE_NAME)
+            else:
+                exporter = FileSpanExporter(Config.TRACING_FILE_PATH, Config.TRACING_SERVICE_NAME)
+        _tracer = Tracer(exporter)
+    return _tracer
+
+def set_tracer(tracer: Optional[Tracer]) -> Optional[Tracer]:
+    """Replace the process tracer (None reconfigures from Config), returning the previous one"""
+    global _tracer
+    previous, _tracer = _tracer, tracer
+    return previous
+
+def current_span():
+    """The active span, or a no-op span outside of a trace"""
+    return _current_span.get() or _NOOP_SPAN
+
+@contextmanager
+def span(name: str, kind: int = SPAN_KIND_INTERNAL, traceparent: Optional[str] = None, **attributes) -> Iterator[Any]:
+    """Record a span around a block, as a child of the active span
+
+    traceparent (an incoming W3C header) parents a span started outside of
+    any active span, so the trace continues the caller's.
+    """
+    tracer = get_tracer()
+    if not tracer.enabled:
+        yield _NOOP_SPAN
+        return
+
+    parent = _current_span.get()
+    if parent is not None:
+        trace_id, parent_span_id = parent.trace_id, parent.span_id
+    else:
+        trace_id, parent_span_id = parse_traceparent(traceparent) or (_new_id(16), None)
+
+    new_span = Span(name, trace_id, parent_span_id, kind)
+    for key, value in attributes.items():
+        new_span.set_attribute(key, value)
+    token = _current_span.set(new_span)
+    try:
+        yield new_span
+    except BaseException as e:
+        new_span.set_error(e)
+        raise
+    finally:
+        _current_span.reset(token)
+        new_span.end_ns = time.time_ns()
+        tracer._on_end(new_span)
+
+def traced(name: str):
+    """Decorator running an async function inside a span"""
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            with span(name):
+                return await func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def detach_span() -> None:
+    """Detach the current task from the active trace, e.g. in a long-lived worker task"""
+    _current_span.set(None)
+
+def start_client_span(name: str, **attributes) -> Optional[Span]:
+    """Start a client span for an outgoing call; end it with end_client_span
+
+    Unlike span(), the client span does not become the active span, so it
+    can be started and ended from separate callbacks such as httpx hooks.
+    """
+    parent = _current_span.get()
+    if parent is None or not get_tracer().enabled:
+        return None
+    client_span = Span(name, parent.trace_id, parent.span_id, SPAN_KIND_CLIENT)
+    client_span.attributes.update(attributes)
+    return client_span
+
+def end_client_span(client_span: Optional[Span], **attributes) -> None:
+    """End a span started with start_client_span"""
+    if client_span is None:
+        return
+    client_span.attributes.update(attributes)
+    client_span.end_ns = time.time_ns()
+    get_tracer()._on_end(client_span)
@@ -0,0 +1,109 @@
+import json
+import os
+import queue
+import random
+import re
+import threading
+from typing import Any, Dict, Optional
+
+# Body fields whose values are never captured
+SENSITIVE_KEYS = ("api_key", "apikey", "authorization", "password", "secret", "token", "cookie", "user")
+REDACTED = "[REDACTED]"
+
+_SENSITIVE_PATTERNS = (
+    re.compile(r"\bsk-[A-Za-z0-9_-]{16,}"),
+    re.compile(r"\bBearer\s+[A-Za-z0-9._~+/=-]+", re.IGNORECASE),
+    re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}"),
+)
+
+def _sensitive_key(key: str) -> bool:
+    key = key.lower()
+    # Token limits such as max_tokens are parameters, not credentials
+    if key.endswith("tokens"):
+        return False
+    return any(part in key for part in SENSITIVE_KEYS)
+
+def sanitize(value: Any) -> Any:
+    """Copy of a JSON request body with credentials, e-mail addresses and sensitive fields redacted"""
+    if isinstance(value, dict):
+        return {key: REDACTED if _sensitive_key(key) else sanitize(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [sanitize(item) for item in value]
+    if isinstance(value, str):
+        for pattern in _SENSITIVE_PATTERNS:
+            value = pattern.sub(REDACTED, value)
+    return value
+
+class TrafficRecorder:
+    """Appends captured requests to a JSONL file from a background thread
+
+    A sampled fraction of requests is recorded. Writes never block request
+    handling: entries are queued with their raw body, which the writer thread
+    parses as JSON and sanitizes (entries without a JSON body are skipped).
+    Once max_queue entries are waiting, further entries are dropped and
+    counted.
+    """
+
+    def __init__(self, path: str, sample_rate: float = 1.0, max_queue: int = 10000):
+        self.path = path
+        self.sample_rate = sample_rate
+        self.dropped = 0
+        self._queue: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def sampled(self) -> bool:
+        """Decide whether to capture the next request"""
+        return self.sample_rate >= 1.0 or random.random() < self.sample_rate
+
+    def record(self, entry: Dict[str, Any]) -> None:
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._write_loop, name="traffic-writer", daemon=True)
+                    self._thread.start()
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            self.dropped += 1
+
+    def _write_loop(self) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        while True:
+            entry = self._queue.get()
+            if entry is None:
+                return
+            lines = [entry]
+            while True:
+                try:
+                    entry = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if entry is None:
+                    self._write(lines)
+                    return
+                lines.append(entry)
+            self._write(lines)
+
+    def _write(self, entries) -> None:
+        lines = []
+        for entry in entries:
+            try:
+                body = json.loads(entry["body"])
+            except ValueError:
+                continue
+            lines.append(json.dumps({**entry, "body": sanitize(body)}) + "\n")
+        try:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.writelines(lines)
+        except Exception as e:
+            print(f"Error writing {len(entries)} captured requests: {e}")
+
+    def shutdown(self) -> None:
+        """Write queued entries and stop the writer thread"""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(timeout=5)
+            self._thread = None
@@ -0,0 +1,16 @@
+import base64
+from typing import Any, List, Union
+import numpy as np
+
+def decode_embedding(embedding: Union[str, List[float]]) -> np.ndarray:
+    """Decode an embedding returned as base64 float32 bytes or as a JSON float list"""
+    if isinstance(embedding, str):
+        # Read-only view over the decoded bytes, no per-element float objects
+        return np.frombuffer(base64.b64decode(embedding), dtype="<f4")
+    return np.asarray(embedding, dtype=np.float32)
+
+def to_float_list(vector: Any) -> List[float]:
+    """Convert a vector to a plain float list at a serialization boundary"""
+    if isinstance(vector, np.ndarray):
+        return vector.tolist()
+    return vector
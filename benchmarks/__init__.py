@@ -0,0 +1,3 @@
+"""
+Benchmarks - Performance measurements for the RAG LLM API
+"""
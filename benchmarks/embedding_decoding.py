@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark decoding embedding API responses as JSON float lists versus base64 float32
+
+Builds OpenAI-style embedding responses for the same vectors in both
+encodings and measures, per batch, the time to parse the response body and
+turn it into embeddings plus the memory those embeddings retain.
+
+Usage:
+    python -m benchmarks.embedding_decoding --batch-size 64 --repeat 5 [--json]
+"""
+
+import argparse
+import base64
+import gc
+import json
+import random
+import time
+import tracemalloc
+import numpy as np
+from app.core.config import Config
+from app.utils.vector_utils import decode_embedding
+
+def build_responses(batch_size: int, dim: int, seed: int = 0):
+    """Encode the same embeddings as a float list response and a base64 response"""
+    rng = random.Random(seed)
+    vectors = [np.array([rng.uniform(-1, 1) for _ in range(dim)], dtype=np.float32) for _ in range(batch_size)]
+    float_body = json.dumps({"data": [{"embedding": vector.tolist()} for vector in vectors]})
+    base64_body = json.dumps({"data": [{"embedding": base64.b64encode(vector.tobytes()).decode()} for vector in vectors]})
+    return float_body, base64_body
+
+def decode_floats(body: str):
+    """Previous path: JSON float lists kept as nested Python lists"""
+    return [item["embedding"] for item in json.loads(body)["data"]]
+
+def decode_base64(body: str):
+    """Current path: base64 float32 decoded into NumPy arrays"""
+    return [decode_embedding(item["embedding"]) for item in json.loads(body)["data"]]
+
+def measure(decode, body: str, repeat: int):
+    """Return the best parse time and the memory retained by the decoded embeddings"""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        decode(body)
+        best = min(best, time.perf_counter() - started)
+
+    gc.collect()
+    tracemalloc.start()
+    embeddings = decode(body)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del embeddings
+    return best, retained, peak
+
+def run_benchmark(batch_size: int, dim: int, repeat: int):
+    """Compare both decoding paths for one batch"""
+    float_body, base64_body = build_responses(batch_size, dim)
+    results = {"batch_size": batch_size, "vector_size": dim}
+    for name, decode, body in (("float", decode_floats, float_body), ("base64", decode_base64, base64_body)):
+        seconds, retained, peak = measure(decode, body, repeat)
+        results[name] = {
+            "response_bytes": len(body),
+            "parse_ms": round(seconds * 1000, 3),
+            "retained_bytes_per_embedding": retained // batch_size,
+            "peak_bytes": peak
+        }
+    results["parse_speedup"] = round(results["float"]["parse_ms"] / results["base64"]["parse_ms"], 2)
+    results["memory_ratio"] = round(
+        results["float"]["retained_bytes_per_embedding"] / results["base64"]["retained_bytes_per_embedding"], 2
+    )
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=Config.INGESTION_BATCH_SIZE)
+    parser.add_argument("--dim", type=int, default=Config.VECTOR_SIZE)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    result = run_benchmark(args.batch_size, args.dim, args.repeat)
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+
+    print(f"Batch of {result['batch_size']} embeddings x {result['vector_size']} dims")
+    print(f"{'encoding':<10}{'response bytes':>16}{'parse ms':>11}{'bytes/embedding':>17}{'peak bytes':>13}")
+    for name in ("float", "base64"):
+        row = result[name]
+        print(f"{name:<10}{row['response_bytes']:>16}{row['parse_ms']:>11}{row['retained_bytes_per_embedding']:>17}{row['peak_bytes']:>13}")
+    print(f"base64 parses {result['parse_speedup']}x faster and retains {result['memory_ratio']}x less memory per embedding")
+
+if __name__ == "__main__":
+    main()
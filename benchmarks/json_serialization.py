@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark serialization of a vector upsert request body
+
+Compares the previous path (vectors converted to float lists, encoded by the
+standard library as httpx's json= does) with app.utils.json_utils.dumps,
+which serializes float32 NumPy vectors directly with orjson when installed.
+
+Usage:
+    python -m benchmarks.json_serialization --points 500 --repeat 5 [--json]
+"""
+
+import argparse
+import json
+import time
+import numpy as np
+from app.core.config import Config
+from app.utils import json_utils
+from app.infrastructure.vector_store.vector_store import generate_point_id
+
+def build_body(num_points: int, dim: int, seed: int = 0):
+    """Build an upsert body with float32 embeddings as VectorStore does"""
+    rng = np.random.default_rng(seed)
+    return {
+        "points": [
+            {
+                "id": generate_point_id("benchmark.txt", f"chunk {i}"),
+                "vector": rng.uniform(-1, 1, dim).astype(np.float32),
+                "payload": {
+                    "content": f"chunk {i} " * 100,
+                    "metadata": {"source": "benchmark.txt", "page": i // 10, "chunk_index": i}
+                }
+            }
+            for i in range(num_points)
+        ]
+    }
+
+def stdlib_dumps(body) -> bytes:
+    """Previous path: list vectors encoded by the standard library"""
+    points = [{**point, "vector": point["vector"].tolist()} for point in body["points"]]
+    return json.dumps({"points": points}).encode("utf-8")
+
+def time_dumps(dumps, body, repeat: int):
+    """Return the best wall time over repeat runs and the encoded size"""
+    best = float("inf")
+    encoded = b""
+    for _ in range(repeat):
+        started = time.perf_counter()
+        encoded = dumps(body)
+        best = min(best, time.perf_counter() - started)
+    return best, len(encoded)
+
+def run_benchmark(num_points: int, dim: int, repeat: int):
+    """Serialize the same body with each backend"""
+    body = build_body(num_points, dim)
+    results = {"points": num_points, "vector_size": dim, "orjson_installed": json_utils.HAS_ORJSON}
+    for name, dumps in (("stdlib", stdlib_dumps), ("json_utils", json_utils.dumps)):
+        seconds, size = time_dumps(dumps, body, repeat)
+        results[name] = {"ms": round(seconds * 1000, 2), "bytes": size}
+    results["speedup"] = round(results["stdlib"]["ms"] / results["json_utils"]["ms"], 2)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--points", type=int, default=500)
+    parser.add_argument("--dim", type=int, default=Config.VECTOR_SIZE)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    result = run_benchmark(args.points, args.dim, args.repeat)
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+
+    backend = "orjson" if result["orjson_installed"] else "stdlib fallback"
+    print(f"Upsert body: {result['points']} points x {result['vector_size']} dims (json_utils backend: {backend})")
+    for name in ("stdlib", "json_utils"):
+        print(f"{name:<12}{result[name]['ms']:>10} ms{result[name]['bytes']:>14} bytes")
+    print(f"json_utils is {result['speedup']}x faster")
+
+if __name__ == "__main__":
+    main()
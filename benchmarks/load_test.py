@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Load test the API end to end against local mock upstreams
+
+Starts the mock embeddings, chat completions and Qdrant REST APIs
+(benchmarks.mock_upstreams) on a background thread, runs the API under
+uvicorn in a subprocess pointed at them, and drives each scenario at the
+target concurrency. Reports throughput, latency percentiles, status codes
+and the API process's CPU time per request.
+
+Scenarios: ask (POST /questions/ask), chat (POST /chat/completions) and
+upload (POST /documents/upload, a distinct text document per request).
+
+Usage:
+    python -m benchmarks.load_test --scenarios ask chat upload --concurrency 32 --duration 20 \\
+        --llm-latency lognormal:400:0.4 --embedding-latency fixed:40 --qdrant-latency uniform:5:15 \\
+        --error-rate 0.01 [--json] [--output results.json]
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import subprocess
+import sys
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import httpx
+import numpy as np
+from app.core.config import Config
+from benchmarks.mock_upstreams import BackgroundServer, MockUpstreams, UpstreamBehaviour, free_port, upstream_env
+from tests.fixtures.sample_data import generate_sample_text
+
+QUESTIONS = [
+    "What is retrieval augmented generation?",
+    "How are documents split into chunks?",
+    "Which vector database stores the embeddings?",
+    "How does the API handle upstream failures?",
+]
+
+def ask_request(i: int) -> Dict[str, Any]:
+    return {"method": "POST", "url": "/questions/ask", "json": {"question": QUESTIONS[i % len(QUESTIONS)], "top_k": Config.DEFAULT_TOP_K}}
+
+def chat_request(i: int) -> Dict[str, Any]:
+    return {"method": "POST", "url": "/chat/completions", "json": {
+        "model": Config.LLM_MODEL,
+        "messages": [
+            {"role": "system", "content": "You are a research assistant agent."},
+            {"role": "user", "content": QUESTIONS[i % len(QUESTIONS)]}
+        ]
+    }}
+
+def upload_request(i: int) -> Dict[str, Any]:
+    # Distinct content per request, so no upload is skipped as unchanged
+    content = f"Load test document {i}.\n\n{generate_sample_text(100, seed=i)}".encode("utf-8")
+    return {"method": "POST", "url": "/documents/upload", "files": {"file": (f"load-test-{i}.txt", content, "text/plain")}}
+
+SCENARIOS: Dict[str, Callable[[int], Dict[str, Any]]] = {"ask": ask_request, "chat": chat_request, "upload": upload_request}
+
+def _process_table() -> Dict[int, Tuple[int, float]]:
+    """Parent PID and CPU seconds of every process in /proc"""
+    table = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                fields = f.read().rsplit(")", 1)[1].split()
+            table[int(entry)] = (int(fields[1]), (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK"))
+        except (OSError, IndexError, ValueError):
+            continue
+    return table
+
+def process_cpu_seconds(pid: int) -> Optional[float]:
+    """User plus system CPU time of a process and its children (server workers, document process pool),
+    or None where /proc is unavailable"""
+    try:
+        table = _process_table()
+    except OSError:
+        return None
+    if pid not in table:
+        return None
+    total, pending = 0.0, [pid]
+    while pending:
+        current = pending.pop()
+        total += table[current][1]
+        pending.extend(child for child, (parent, _) in table.items() if parent == current)
+    return total
+
+def start_api(upstream_url: str, port: int, command: Optional[List[str]] = None, timeout: float = 30.0) -> subprocess.Popen:
+    """Run the API (under plain uvicorn unless a command is given) with its upstreams pointed at the mocks"""
+    env = {**os.environ, **upstream_env(upstream_url, Config.QDRANT_COLLECTION_NAME)}
+    process = subprocess.Popen(
+        command or [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port),
+                    "--log-level", "warning", "--no-access-log"],
+        env=env,
+        stdout=subprocess.DEVNULL
+    )
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"API exited with code {process.returncode}")
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/health", timeout=1).status_code == 200:
+                return process
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError("API did not become healthy")
+
+async def drive(base_url: str, build_request, concurrency: int, duration: float, max_requests: Optional[int], pid: int):
+    """Send requests from `concurrency` workers until the duration or request count is reached"""
+    latencies = []
+    statuses: Counter = Counter()
+    counter = itertools.count()
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120) as client:
+        # Warm up connections and lazy initialisation outside the measurement
+        for i in range(min(concurrency, 4)):
+            await client.request(**build_request(-1 - i))
+
+        deadline = time.perf_counter() + duration
+
+        async def worker():
+            while True:
+                i = next(counter)
+                if (max_requests is not None and i >= max_requests) or time.perf_counter() >= deadline:
+                    return
+                started = time.perf_counter()
+                try:
+                    response = await client.request(**build_request(i))
+                    status = response.status_code
+                    # Failures the API reports in a 200 body ({"success": false}) count as errors
+                    if status == 200 and isinstance(response.json(), dict) and response.json().get("success") is False:
+                        status = "200-unsuccessful"
+                except httpx.HTTPError as e:
+                    status = type(e).__name__
+                latencies.append(time.perf_counter() - started)
+                statuses[str(status)] += 1
+
+        cpu_before = process_cpu_seconds(pid)
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+        cpu_after = process_cpu_seconds(pid)
+
+    requests = len(latencies)
+    latencies_ms = np.array(latencies) * 1000 if latencies else np.zeros(1)
+    return {
+        "requests": requests,
+        "errors": requests - statuses.get("200", 0),
+        "statuses": dict(statuses),
+        "elapsed_seconds": round(elapsed, 3),
+        "rps": round(requests / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {
+            "mean": round(float(latencies_ms.mean()), 2),
+            "p50": round(float(np.percentile(latencies_ms, 50)), 2),
+            "p95": round(float(np.percentile(latencies_ms, 95)), 2),
+            "p99": round(float(np.percentile(latencies_ms, 99)), 2),
+            "max": round(float(latencies_ms.max()), 2)
+        },
+        "cpu_ms_per_request": (
+            round((cpu_after - cpu_before) * 1000 / requests, 3)
+            if requests and cpu_before is not None and cpu_after is not None else None
+        )
+    }
+
+def run_benchmark(scenarios, concurrency: int, duration: float, max_requests: Optional[int],
+                  embedding_latency: str, llm_latency: str, qdrant_latency: str, error_rate: float):
+    """Run each scenario against a fresh API process and shared mock upstreams"""
+    mocks = MockUpstreams(
+        Config.VECTOR_SIZE,
+        embeddings=UpstreamBehaviour(embedding_latency, error_rate, seed=1),
+        llm=UpstreamBehaviour(llm_latency, error_rate, seed=2),
+        qdrant=UpstreamBehaviour(qdrant_latency, error_rate, seed=3)
+    )
+    upstream = BackgroundServer(mocks.app).start()
+    results = {}
+    try:
+        for name in scenarios:
+            port = free_port()
+            api = start_api(upstream.url, port)
+            try:
+                results[name] = asyncio.run(
+                    drive(f"http://127.0.0.1:{port}", SCENARIOS[name], concurrency, duration, max_requests, api.pid)
+                )
+            finally:
+                api.terminate()
+                api.wait(timeout=10)
+    finally:
+        upstream.stop()
+
+    return {
+        "concurrency": concurrency,
+        "duration_seconds": duration,
+        "max_requests": max_requests,
+        "upstreams": mocks.summary(),
+        "scenarios": results
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", nargs="+", choices=sorted(SCENARIOS), default=["ask", "chat", "upload"])
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per scenario")
+    parser.add_argument("--requests", type=int, default=None, help="stop each scenario after this many requests")
+    parser.add_argument("--embedding-latency", default="fixed:30", help="e.g. fixed:30, uniform:20:60, lognormal:30:0.5 (ms)")
+    parser.add_argument("--llm-latency", default="lognormal:300:0.4")
+    parser.add_argument("--qdrant-latency", default="fixed:5")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of upstream calls failing with 503")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    parser.add_argument("--output", help="also write the JSON results to this file")
+    args = parser.parse_args()
+
+    result = run_benchmark(
+        args.scenarios, args.concurrency, args.duration, args.requests,
+        args.embedding_latency, args.llm_latency, args.qdrant_latency, args.error_rate
+    )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+
+    print(f"concurrency {result['concurrency']}, {result['duration_seconds']} s per scenario")
+    print(f"{'scenario':<10}{'requests':>10}{'errors':>8}{'rps':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'cpu ms/req':>12}")
+    for name, row in result["scenarios"].items():
+        latency = row["latency_ms"]
+        cpu = row["cpu_ms_per_request"] if row["cpu_ms_per_request"] is not None else "n/a"
+        print(f"{name:<10}{row['requests']:>10}{row['errors']:>8}{row['rps']:>10}{latency['p50']:>10}{latency['p95']:>10}{latency['p99']:>10}{cpu:>12}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+"""
+Local stand-ins for the OpenAI embeddings and chat completions APIs and the Qdrant REST API
+
+One ASGI app serves all three, so the API under test can be pointed at it
+through its *_API_URL settings (see upstream_env). Each upstream answers
+after a delay drawn from its latency distribution and fails with a 503 at
+its error rate.
+"""
+
+import asyncio
+import base64
+import hashlib
+import json
+import random
+import socket
+import threading
+import time
+from typing import Any, Dict, List, Optional
+import numpy as np
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+from app.utils.json_utils import dumps
+
+class Latency:
+    """Latency distribution parsed from a spec, sampled in seconds
+
+    Specs are in milliseconds: "fixed:50", "uniform:20:80", or
+    "lognormal:50:0.5" (median and sigma, giving a long tail).
+    """
+
+    def __init__(self, spec: str, seed: int = 0):
+        kind, *params = spec.split(":")
+        values = [float(param) for param in params]
+        expected = {"fixed": 1, "uniform": 2, "lognormal": 2}
+        if kind not in expected or len(values) != expected[kind]:
+            raise ValueError(f"Invalid latency spec: {spec}")
+        self.spec = spec
+        self.kind = kind
+        self.values = values
+        self._random = random.Random(seed)
+
+    def sample(self) -> float:
+        if self.kind == "fixed":
+            milliseconds = self.values[0]
+        elif self.kind == "uniform":
+            milliseconds = self._random.uniform(*self.values)
+        else:
+            median, sigma = self.values
+            milliseconds = self._random.lognormvariate(np.log(median), sigma) if median > 0 else 0.0
+        return milliseconds / 1000
+
+class UpstreamBehaviour:
+    """Latency and error rate of one mocked upstream"""
+
+    def __init__(self, latency: str = "fixed:0", error_rate: float = 0.0, seed: int = 0):
+        self.latency = Latency(latency, seed)
+        self.error_rate = error_rate
+        self._random = random.Random(seed + 1)
+        self.requests = 0
+        self.errors = 0
+
+    async def delay(self) -> Optional[Response]:
+        """Wait for the sampled latency; return an error response if this call should fail"""
+        self.requests += 1
+        delay = self.latency.sample()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if self._random.random() < self.error_rate:
+            self.errors += 1
+            return JSONResponse({"error": {"message": "Injected upstream failure"}}, status_code=503)
+        return None
+
+    def summary(self) -> Dict[str, Any]:
+        return {"latency": self.latency.spec, "error_rate": self.error_rate, "requests": self.requests, "errors": self.errors}
+
+def _embedding(text: str, dim: int) -> np.ndarray:
+    """Deterministic unit vector for a text"""
+    seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "little")
+    vector = np.random.default_rng(seed).standard_normal(dim).astype(np.float32)
+    return vector / np.linalg.norm(vector)
+
+class MockUpstreams:
+    """ASGI app mocking the embeddings, chat completions and Qdrant REST APIs
+
+    Points upserted into the mock Qdrant are kept in memory; searches score
+    them by dot product against the query and, while the collection is
+    empty, return synthetic passages so questions always get context.
+    """
+
+    def __init__(self, vector_size: int, embeddings: UpstreamBehaviour, llm: UpstreamBehaviour,
+                 qdrant: UpstreamBehaviour, completion_tokens: int = 150):
+        self.vector_size = vector_size
+        self.upstreams = {"embeddings": embeddings, "llm": llm, "qdrant": qdrant}
+        self.completion = " ".join(["token"] * completion_tokens)
+        self.completion_tokens = completion_tokens
+        self.points: Dict[str, Dict[str, Any]] = {}
+        self._ids: List[str] = []
+        self._matrix = np.zeros((0, vector_size), dtype=np.float32)
+        self._stale = False
+        self.app = Starlette(routes=[
+            Route("/v1/embeddings", self.embeddings, methods=["POST"]),
+            Route("/v1/chat/completions", self.chat_completions, methods=["POST"]),
+            Route("/collections/{name}", self.collection, methods=["GET", "PUT", "DELETE"]),
+            Route("/collections/{name}/index", self.ok, methods=["PUT"]),
+            Route("/collections/{name}/points", self.points_endpoint, methods=["PUT", "POST"]),
+            Route("/collections/{name}/points/search", self.search, methods=["POST"]),
+            Route("/collections/{name}/points/search/batch", self.search_batch, methods=["POST"]),
+            Route("/collections/{name}/points/scroll", self.scroll, methods=["POST"]),
+            Route("/collections/{name}/points/payload", self.ok, methods=["POST"]),
+            Route("/collections/{name}/points/delete", self.ok, methods=["POST"]),
+        ])
+
+    def summary(self) -> Dict[str, Any]:
+        return {name: upstream.summary() for name, upstream in self.upstreams.items()}
+
+    @staticmethod
+    def _json(data: Any, status_code: int = 200) -> Response:
+        return Response(dumps(data), status_code=status_code, media_type="application/json")
+
+    async def embeddings(self, request: Request) -> Response:
+        failure = await self.upstreams["embeddings"].delay()
+        if failure is not None:
+            return failure
+        body = json.loads(await request.body())
+        texts = body["input"] if isinstance(body["input"], list) else [body["input"]]
+        as_base64 = body.get("encoding_format") == "base64"
+        data = []
+        for index, text in enumerate(texts):
+            vector = _embedding(text, self.vector_size)
+            embedding = base64.b64encode(vector.tobytes()).decode() if as_base64 else vector.tolist()
+            data.append({"object": "embedding", "index": index, "embedding": embedding})
+        tokens = sum(len(text.split()) for text in texts)
+        return self._json({"object": "list", "data": data, "model": body.get("model"), "usage": {"prompt_tokens": tokens, "total_tokens": tokens}})
+
+    async def chat_completions(self, request: Request) -> Response:
+        failure = await self.upstreams["llm"].delay()
+        if failure is not None:
+            return failure
+        body = json.loads(await request.body())
+        prompt_tokens = sum(len(str(message.get("content", "")).split()) for message in body.get("messages", []))
+        return self._json({
+            "id": f"chatcmpl-{time.time_ns()}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": self.completion}, "finish_reason": "stop"}],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": self.completion_tokens,
+                "total_tokens": prompt_tokens + self.completion_tokens
+            }
+        })
+
+    async def ok(self, request: Request) -> Response:
+        failure = await self.upstreams["qdrant"].delay()
+        return failure or self._json({"result": True, "status": "ok"})
+
+    async def collection(self, request: Request) -> Response:
+        failure = await self.upstreams["qdrant"].delay()
+        if failure is not None:
+            return failure
+        if request.method == "DELETE":
+            self.points.clear()
+            self._stale = True
+            return self._json({"result": True, "status": "ok"})
+        if request.method == "PUT":
+            return self._json({"result": True, "status": "ok"})
+        return self._json({"result": {"status": "green", "points_count": len(self.points), "vectors_count": len(self.points)}, "status": "ok"})
+
+    async def points_endpoint(self, request: Request) -> Response:
+        failure = await self.upstreams["qdrant"].delay()
+        if failure is not None:
+            return failure
+        body = json.loads(await request.body())
+        if request.method == "PUT":
+            for point in body["points"]:
+                self.points[str(point["id"])] = point
+            self._stale = True
+            return self._json({"result": {"operation_id": len(self.points), "status": "completed"}, "status": "ok"})
+        found = [{"id": point_id} for point_id in map(str, body.get("ids", [])) if point_id in self.points]
+        return self._json({"result": found, "status": "ok"})
+
+    def _search(self, vector, limit: int) -> List[Dict[str, Any]]:
+        if not self.points:
+            return [
+                {
+                    "id": f"synthetic-{i}",
+                    "score": round(0.9 - i * 0.05, 3),
+                    "payload": {
+                        "content": f"Synthetic passage {i} about the benchmark topic. " * 8,
+                        "metadata": {"source": "synthetic.txt", "chunk_index": i}
+                    }
+                }
+                for i in range(limit)
+            ]
+        if self._stale:
+            self._ids = list(self.points)
+            self._matrix = np.array([self.points[point_id]["vector"] for point_id in self._ids], dtype=np.float32)
+            self._stale = False
+        scores = self._matrix @ np.asarray(vector, dtype=np.float32)
+        top = np.argsort(-scores)[:limit]
+        return [
+            {"id": self._ids[i], "score": float(scores[i]), "payload": self.points[self._ids[i]].get("payload", {})}
+            for i in top
+        ]
+
+    async def search(self, request: Request) -> Response:
+        failure = await self.upstreams["qdrant"].delay()
+        if failure is not None:
+            return failure
+        body = json.loads(await request.body())
+        return self._json({"result": self._search(body["vector"], body["limit"]), "status": "ok"})
+
+    async def search_batch(self, request: Request) -> Response:
+        failure = await self.upstreams["qdrant"].delay()
+        if failure is not None:
+            return failure
+        body = json.loads(await request.body())
+        return self._json({"result": [self._search(search["vector"], search["limit"]) for search in body["searches"]], "status": "ok"})
+
+    async def scroll(self, request: Request) -> Response:
+        failure = await self.upstreams["qdrant"].delay()
+        return failure or self._json({"result": {"points": [], "next_page_offset": None}, "status": "ok"})
+
+def upstream_env(base_url: str, collection: str = "documents") -> Dict[str, str]:
+    """Environment settings pointing the API at mock upstreams served at base_url"""
+    collection_url = f"{base_url}/collections/{collection}"
+    return {
+        "EMBEDDING_API_URL": f"{base_url}/v1/embeddings",
+        "LLM_API_URL": f"{base_url}/v1/chat/completions",
+        "VECTOR_COLLECTION_URL": collection_url,
+        "VECTOR_INSERT_API_URL": f"{collection_url}/points",
+        "VECTOR_RETRIEVE_API_URL": f"{collection_url}/points",
+        "VECTOR_SEARCH_API_URL": f"{collection_url}/points/search",
+        "VECTOR_SEARCH_BATCH_API_URL": f"{collection_url}/points/search/batch",
+        "VECTOR_SCROLL_API_URL": f"{collection_url}/points/scroll",
+        "VECTOR_SET_PAYLOAD_API_URL": f"{collection_url}/points/payload",
+        "VECTOR_DELETE_API_URL": f"{collection_url}/points/delete",
+        "VECTOR_INDEX_API_URL": f"{collection_url}/index",
+        "QDRANT_COLLECTION_NAME": collection,
+        "VECTOR_TRANSPORT": "rest",
+        "OPENAI_API_KEY": "benchmark",
+        "QDRANT_API_KEY": "benchmark"
+    }
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+class BackgroundServer:
+    """Serve an ASGI app with uvicorn on a background thread"""
+
+    def __init__(self, app, port: Optional[int] = None):
+        self.port = port or free_port()
+        self.url = f"http://127.0.0.1:{self.port}"
+        self.server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=self.port, log_level="warning", access_log=False))
+        self._thread = threading.Thread(target=self.server.run, name="mock-upstreams", daemon=True)
+
+    def start(self, timeout: float = 10.0) -> "BackgroundServer":
+        self._thread.start()
+        deadline = time.monotonic() + timeout
+        while not self.server.started:
+            if time.monotonic() > deadline or not self._thread.is_alive():
+                raise RuntimeError("Mock upstream server did not start")
+            time.sleep(0.01)
+        return self
+
+    def stop(self) -> None:
+        self.server.should_exit = True
+        self._thread.join(timeout=5)
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark the native RecursiveTextSplitter against langchain's RecursiveCharacterTextSplitter
+
+Usage:
+    python -m benchmarks.text_splitter --sizes-mb 1 4 --repeat 3 [--json]
+"""
+
+import argparse
+import json
+import time
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+from app.core.config import Config
+from app.infrastructure.document_processing.text_splitter import RecursiveTextSplitter
+from tests.fixtures.sample_data import generate_sample_text
+
+def build_text(size_mb: float) -> str:
+    """Generate sample text of roughly size_mb megabytes"""
+    target = int(size_mb * 1024 * 1024)
+    paragraphs = []
+    length = 0
+    seed = 0
+    while length < target:
+        block = generate_sample_text(200, seed=seed)
+        paragraphs.append(block)
+        length += len(block) + 2
+        seed += 1
+    return "\n\n".join(paragraphs)[:target]
+
+def time_split(splitter, text: str, repeat: int):
+    """Return the best wall time over repeat runs and the produced chunks"""
+    best = float("inf")
+    chunks = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        chunks = splitter.split_text(text)
+        best = min(best, time.perf_counter() - started)
+    return best, chunks
+
+def run_benchmark(sizes_mb, repeat: int):
+    """Run both splitters over each input size"""
+    langchain_splitter = RecursiveCharacterTextSplitter(
+        chunk_size=Config.CHUNK_SIZE,
+        chunk_overlap=Config.CHUNK_OVERLAP,
+        length_function=len,
+    )
+    native_splitter = RecursiveTextSplitter(Config.CHUNK_SIZE, Config.CHUNK_OVERLAP)
+
+    results = []
+    for size_mb in sizes_mb:
+        text = build_text(size_mb)
+        langchain_seconds, expected = time_split(langchain_splitter, text, repeat)
+        native_seconds, chunks = time_split(native_splitter, text, repeat)
+        results.append({
+            "size_mb": size_mb,
+            "chunks": len(chunks),
+            "langchain_seconds": round(langchain_seconds, 4),
+            "native_seconds": round(native_seconds, 4),
+            "speedup": round(langchain_seconds / native_seconds, 2),
+            "identical_output": chunks == expected
+        })
+    return results
+
+def main():
+    """Parse arguments and print benchmark results"""
+    parser = argparse.ArgumentParser(description="Benchmark text splitters")
+    parser.add_argument("--sizes-mb", type=float, nargs="+", default=[1, 4])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", action="store_true", help="Print machine-readable JSON")
+    args = parser.parse_args()
+
+    results = run_benchmark(args.sizes_mb, args.repeat)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'size_mb':>8} {'chunks':>8} {'langchain_s':>12} {'native_s':>10} {'speedup':>8} {'identical':>10}")
+    for result in results:
+        print(
+            f"{result['size_mb']:>8} {result['chunks']:>8} {result['langchain_seconds']:>12} "
+            f"{result['native_seconds']:>10} {result['speedup']:>8} {str(result['identical_output']):>10}"
+        )
+
+if __name__ == "__main__":
+    main()
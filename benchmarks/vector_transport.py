@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Benchmark the REST and gRPC vector transports for upsert and search
+
+Both transports run against qdrant-client's local in-memory mode: the REST
+transport is ExternalAPIService with its HTTP calls answered in-process by
+a handler that decodes the JSON bodies like a Qdrant server would, and the
+gRPC transport is QdrantGrpcService in local mode. Payload bytes are the
+actual REST request bodies and the serialized protobuf messages the gRPC
+client would send for the same requests.
+
+Usage:
+    python -m benchmarks.vector_transport --points 2000 --batch-size 64 --searches 200 [--json]
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+import httpx
+from qdrant_client import QdrantClient, grpc, models
+from qdrant_client.conversions.conversion import RestToGrpc
+from app.core.config import Config
+from app.infrastructure.external.external_api_service import ExternalAPIService
+from app.infrastructure.external.qdrant_grpc_service import QdrantGrpcService
+from app.infrastructure.vector_store.vector_store import generate_point_id
+
+def build_points(count: int, dim: int, seed: int = 0):
+    """Generate points shaped like the ones VectorStore inserts"""
+    rng = random.Random(seed)
+    return [
+        {
+            "id": generate_point_id("benchmark.txt", f"chunk {i}"),
+            "vector": [rng.uniform(-1, 1) for _ in range(dim)],
+            "payload": {
+                "content": f"chunk {i} " * 50,
+                "metadata": {"source": "benchmark.txt", "page": i // 10, "chunk_index": i}
+            }
+        }
+        for i in range(count)
+    ]
+
+class LocalRestService(ExternalAPIService):
+    """ExternalAPIService whose Qdrant REST calls are served by an in-memory Qdrant"""
+
+    def __init__(self):
+        super().__init__()
+        self.qdrant_headers["api-key"] = "benchmark"
+        self.backend = QdrantClient(location=":memory:")
+        self.bytes_sent = {"upsert": 0, "search": 0}
+        self.transport = httpx.MockTransport(self._handle)
+
+    def _get_client_kwargs(self):
+        return {**super()._get_client_kwargs(), "transport": self.transport}
+
+    async def _handle(self, request: httpx.Request) -> httpx.Response:
+        url = str(request.url).split("?", 1)[0]
+        name = Config.QDRANT_COLLECTION_NAME
+        if url == Config.VECTOR_COLLECTION_URL:
+            if request.method == "GET":
+                exists = self.backend.collection_exists(name)
+                return httpx.Response(200 if exists else 404, json={"result": {}})
+            body = json.loads(request.content)
+            self.backend.create_collection(name, vectors_config=models.VectorParams(**body["vectors"]))
+            return httpx.Response(200, json={"result": True})
+        if url == Config.VECTOR_INSERT_API_URL:
+            self.bytes_sent["upsert"] += len(request.content)
+            body = json.loads(request.content)
+            self.backend.upsert(name, points=[models.PointStruct(**point) for point in body["points"]])
+            return httpx.Response(200, json={"result": {"status": "completed"}})
+        if url == Config.VECTOR_SEARCH_API_URL:
+            self.bytes_sent["search"] += len(request.content)
+            body = json.loads(request.content)
+            response = self.backend.query_points(name, query=body["vector"], limit=body["limit"], with_payload=True)
+            result = [{"id": point.id, "score": point.score, "payload": point.payload} for point in response.points]
+            return httpx.Response(200, json={"result": result})
+        return httpx.Response(404)
+
+def grpc_upsert_bytes(batch) -> int:
+    """Size of the gRPC UpsertPoints message for a batch"""
+    message = grpc.UpsertPoints(
+        collection_name=Config.QDRANT_COLLECTION_NAME,
+        wait=True,
+        points=[RestToGrpc.convert_point_struct(models.PointStruct(**point)) for point in batch]
+    )
+    return message.ByteSize()
+
+def grpc_search_bytes(vector, top_k: int) -> int:
+    """Size of the gRPC QueryPoints message for a search"""
+    message = grpc.QueryPoints(
+        collection_name=Config.QDRANT_COLLECTION_NAME,
+        query=grpc.Query(nearest=grpc.VectorInput(dense=grpc.DenseVector(data=vector))),
+        limit=top_k,
+        with_payload=grpc.WithPayloadSelector(enable=True)
+    )
+    return message.ByteSize()
+
+async def run_transport(service, points, queries, batch_size: int, top_k: int):
+    """Time upserts and searches through one transport"""
+    batches = [points[i:i + batch_size] for i in range(0, len(points), batch_size)]
+
+    started = time.perf_counter()
+    for batch in batches:
+        await service.insert_vectors(batch)
+    upsert_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for query in queries:
+        await service.search_vectors(query, top_k)
+    search_seconds = time.perf_counter() - started
+
+    return {
+        "upsert_points_per_second": round(len(points) / upsert_seconds, 1),
+        "searches_per_second": round(len(queries) / search_seconds, 1)
+    }
+
+async def run_benchmark(num_points: int, batch_size: int, num_searches: int, top_k: int):
+    """Run both transports over the same points and queries"""
+    points = build_points(num_points, Config.VECTOR_SIZE)
+    queries = [point["vector"] for point in build_points(num_searches, Config.VECTOR_SIZE, seed=1)]
+    batches = [points[i:i + batch_size] for i in range(0, len(points), batch_size)]
+
+    rest_service = LocalRestService()
+    rest = await run_transport(rest_service, points, queries, batch_size, top_k)
+    rest["upsert_bytes"] = rest_service.bytes_sent["upsert"]
+    rest["search_bytes"] = rest_service.bytes_sent["search"]
+
+    grpc_service = QdrantGrpcService(location=":memory:")
+    grpc_results = await run_transport(grpc_service, points, queries, batch_size, top_k)
+    grpc_results["upsert_bytes"] = sum(grpc_upsert_bytes(batch) for batch in batches)
+    grpc_results["search_bytes"] = sum(grpc_search_bytes(query, top_k) for query in queries)
+
+    return {
+        "points": num_points,
+        "batch_size": batch_size,
+        "searches": num_searches,
+        "vector_size": Config.VECTOR_SIZE,
+        "rest": rest,
+        "grpc": grpc_results,
+        "upsert_bytes_ratio": round(rest["upsert_bytes"] / grpc_results["upsert_bytes"], 2),
+        "search_bytes_ratio": round(rest["search_bytes"] / grpc_results["search_bytes"], 2)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--points", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--searches", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=Config.DEFAULT_TOP_K)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    result = asyncio.run(run_benchmark(args.points, args.batch_size, args.searches, args.top_k))
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+
+    print(f"{result['points']} points x {result['vector_size']} dims, batch size {result['batch_size']}, {result['searches']} searches")
+    print(f"{'transport':<10}{'upsert pts/s':>14}{'searches/s':>12}{'upsert bytes':>15}{'search bytes':>14}")
+    for name in ("rest", "grpc"):
+        row = result[name]
+        print(f"{name:<10}{row['upsert_points_per_second']:>14}{row['searches_per_second']:>12}{row['upsert_bytes']:>15}{row['search_bytes']:>14}")
+    print(f"REST/gRPC bytes: upsert {result['upsert_bytes_ratio']}x, search {result['search_bytes_ratio']}x")
+
+if __name__ == "__main__":
+    main()
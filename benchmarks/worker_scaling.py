@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Compare API throughput with one and several server worker processes
+
+Starts the API with the production launcher (scripts/run.py --production)
+at each worker count and drives the load test scenarios against it, with
+the mock upstreams (benchmarks.mock_upstreams) in a process of their own.
+Reports throughput, latency percentiles and CPU time per request at each
+worker count, and the speedup over the first.
+
+Upstream latencies default to near zero, so the API's own CPU time limits
+throughput; with realistic latencies, raise --concurrency until it does.
+The driver and the mock upstreams each run on one core: if either is close
+to 100% busy, the result is capped by the benchmark rather than the API.
+
+Usage:
+    python -m benchmarks.worker_scaling --workers 1 4 --scenarios ask chat --concurrency 64 --duration 15 [--json]
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import socket
+import sys
+import time
+from typing import Any, Dict, List
+import uvicorn
+from app.core.config import Config
+from benchmarks.load_test import SCENARIOS, drive, process_cpu_seconds, start_api
+from benchmarks.mock_upstreams import MockUpstreams, UpstreamBehaviour, free_port
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def serve_upstreams(port: int, embedding_latency: str, llm_latency: str, qdrant_latency: str):
+    """Process entry point serving the mock upstreams"""
+    mocks = MockUpstreams(
+        Config.VECTOR_SIZE,
+        embeddings=UpstreamBehaviour(embedding_latency, seed=1),
+        llm=UpstreamBehaviour(llm_latency, seed=2),
+        qdrant=UpstreamBehaviour(qdrant_latency, seed=3)
+    )
+    uvicorn.run(mocks.app, host="127.0.0.1", port=port, log_level="warning", access_log=False)
+
+def wait_for_port(port: int, timeout: float = 10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"Nothing listening on port {port}")
+
+def measure(port: int, scenario: str, concurrency: int, duration: float, api_pid: int, upstreams_pid: int) -> Dict[str, Any]:
+    """Drive one scenario, adding how busy the driver and the mock upstreams were"""
+    driver_before = time.process_time()
+    upstreams_before = process_cpu_seconds(upstreams_pid)
+    started = time.perf_counter()
+    result = asyncio.run(drive(f"http://127.0.0.1:{port}", SCENARIOS[scenario], concurrency, duration, None, api_pid))
+    elapsed = time.perf_counter() - started
+    upstreams_after = process_cpu_seconds(upstreams_pid)
+    result["driver_cpu_utilization"] = round((time.process_time() - driver_before) / elapsed, 2)
+    result["upstreams_cpu_utilization"] = (
+        round((upstreams_after - upstreams_before) / elapsed, 2)
+        if upstreams_before is not None and upstreams_after is not None else None
+    )
+    return result
+
+def run_benchmark(worker_counts: List[int], scenarios: List[str], concurrency: int, duration: float, settle: float,
+                  embedding_latency: str, llm_latency: str, qdrant_latency: str) -> Dict[str, Any]:
+    upstream_port = free_port()
+    upstreams = multiprocessing.get_context("spawn").Process(
+        target=serve_upstreams, args=(upstream_port, embedding_latency, llm_latency, qdrant_latency), daemon=True
+    )
+    upstreams.start()
+    results = {}
+    try:
+        wait_for_port(upstream_port)
+        for workers in worker_counts:
+            port = free_port()
+            command = [sys.executable, os.path.join(PROJECT_ROOT, "scripts", "run.py"), "--production",
+                       "--workers", str(workers), "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"]
+            api = start_api(f"http://127.0.0.1:{upstream_port}", port, command=command, timeout=60)
+            try:
+                # /health answers once the first worker is up; give the others time to warm up
+                time.sleep(settle)
+                results[workers] = {
+                    name: measure(port, name, concurrency, duration, api.pid, upstreams.pid)
+                    for name in scenarios
+                }
+            finally:
+                api.terminate()
+                api.wait(timeout=Config.SERVER_GRACEFUL_SHUTDOWN_SECONDS + 10)
+    finally:
+        upstreams.terminate()
+        upstreams.join(timeout=10)
+
+    baseline = results[worker_counts[0]]
+    for row in results.values():
+        for name, result in row.items():
+            result["speedup"] = round(result["rps"] / baseline[name]["rps"], 2) if baseline[name]["rps"] else None
+
+    return {
+        "cpus": os.cpu_count(),
+        "concurrency": concurrency,
+        "duration_seconds": duration,
+        "upstream_latency": {"embeddings": embedding_latency, "llm": llm_latency, "qdrant": qdrant_latency},
+        "workers": results
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, os.cpu_count() or 1],
+                        help="worker counts to compare; the first is the baseline")
+    parser.add_argument("--scenarios", nargs="+", choices=sorted(SCENARIOS), default=["ask", "chat"])
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per scenario")
+    parser.add_argument("--settle", type=float, default=5.0, help="seconds to wait for workers to warm up")
+    parser.add_argument("--embedding-latency", default="fixed:1", help="e.g. fixed:30, uniform:20:60, lognormal:30:0.5 (ms)")
+    parser.add_argument("--llm-latency", default="fixed:5")
+    parser.add_argument("--qdrant-latency", default="fixed:1")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    parser.add_argument("--output", help="also write the JSON results to this file")
+    args = parser.parse_args()
+
+    result = run_benchmark(
+        args.workers, args.scenarios, args.concurrency, args.duration, args.settle,
+        args.embedding_latency, args.llm_latency, args.qdrant_latency
+    )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+
+    print(f"{result['cpus']} CPUs, concurrency {result['concurrency']}, {result['duration_seconds']} s per scenario")
+    print(f"{'workers':<9}{'scenario':<10}{'requests':>10}{'errors':>8}{'rps':>10}{'speedup':>9}"
+          f"{'p50 ms':>10}{'p99 ms':>10}{'cpu ms/req':>12}{'driver':>8}{'mocks':>7}")
+    for workers, row in result["workers"].items():
+        for name, scenario in row.items():
+            latency = scenario["latency_ms"]
+            cpu = scenario["cpu_ms_per_request"] if scenario["cpu_ms_per_request"] is not None else "n/a"
+            mocks = f"{scenario['upstreams_cpu_utilization']:.0%}" if scenario["upstreams_cpu_utilization"] is not None else "n/a"
+            print(f"{workers:<9}{name:<10}{scenario['requests']:>10}{scenario['errors']:>8}{scenario['rps']:>10}"
+                  f"{scenario['speedup']:>9}{latency['p50']:>10}{latency['p99']:>10}{cpu:>12}"
+                  f"{scenario['driver_cpu_utilization']:>8.0%}{mocks:>7}")
+
+if __name__ == "__main__":
+    main()
@@ -6,7 +6,7 @@ Useful for testing search functionality and verifying field handling
 
 import asyncio
 import json
-from src.vector_store import VectorStore
+from app.infrastructure.vector_store.vector_store import VectorStore
 
 async def test_search():
     """Test the search functionality"""
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Memory report for document ingestion
+
+Runs PDF and DOCX documents through ingestion against a mock upstream
+transport and reports peak and retained traced memory per stage (tracemalloc):
+
+- batch: DocumentLoader.load_document, then VectorStore.add_documents
+- pipeline: the streaming IngestionPipeline used by upload jobs
+
+Without file arguments, a representative PDF and DOCX are generated. Parsing
+runs in a thread instead of the document process pool, so its allocations are
+traced too.
+
+Usage:
+    python scripts/memory_report.py [files ...] [--pages 200] [--paths batch pipeline] [--json]
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import os
+import sys
+import tempfile
+from typing import Any, Dict, List
+import httpx
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import Config
+from app.domain.services.ingestion_pipeline import IngestionPipeline
+from app.infrastructure.document_processing.loader import DocumentLoader, _import_parsers
+from app.infrastructure.external.external_api_service import ExternalAPIService, _upstream_name
+from app.infrastructure.vector_store.vector_store import VectorStore
+from app.utils.memory_profiling import MemoryProfile
+from tests.fixtures.sample_data import generate_sample_text
+from tests.utils.test_helpers import create_text_pdf
+
+def mock_upstream(request: httpx.Request) -> httpx.Response:
+    """Answer embedding and vector database calls without keeping anything in memory"""
+    upstream = _upstream_name(request.url)
+    if upstream == "embeddings":
+        texts = json.loads(request.content)["input"]
+        vector = base64.b64encode(np.ones(Config.VECTOR_SIZE, dtype=np.float32).tobytes()).decode()
+        return httpx.Response(200, json={"data": [{"embedding": vector} for _ in texts]})
+    if upstream == "vector_points" and request.method == "POST":
+        return httpx.Response(200, json={"result": []})
+    if upstream == "vector_points":
+        return httpx.Response(200, json={"result": {"operation_id": 1, "status": "completed"}})
+    return httpx.Response(200, json={"result": True})
+
+def use_mock_upstreams():
+    Config.OPENAI_API_KEY = Config.OPENAI_API_KEY or "memory-report"
+    Config.QDRANT_API_KEY = Config.QDRANT_API_KEY or "memory-report"
+    transport = httpx.MockTransport(mock_upstream)
+    get_client_kwargs = ExternalAPIService._get_client_kwargs
+    ExternalAPIService._get_client_kwargs = lambda self: {**get_client_kwargs(self), "transport": transport}
+
+def generate_documents(directory: str, pages: int) -> List[str]:
+    """Write a PDF with `pages` pages and a DOCX with as many paragraphs"""
+    texts = [generate_sample_text(8, seed=page) for page in range(pages)]
+
+    pdf_path = os.path.join(directory, f"sample-{pages}-pages.pdf")
+    with open(pdf_path, "wb") as f:
+        f.write(create_text_pdf(texts))
+    paths = [pdf_path]
+
+    try:
+        import docx
+    except ImportError:
+        print("⚠️  python-docx is not installed, skipping the DOCX sample")
+        return paths
+    document = docx.Document()
+    for text in texts:
+        document.add_paragraph(text)
+    docx_path = os.path.join(directory, f"sample-{pages}-paragraphs.docx")
+    document.save(docx_path)
+    return paths + [docx_path]
+
+async def profile_batch(path: str) -> Dict[str, Any]:
+    """Load the whole document, then add all its chunks"""
+    memory = MemoryProfile(True, Config.MEMORY_PROFILING_FRAMES).start()
+    with memory.stage("load"):
+        documents = DocumentLoader().load_document(path, os.path.basename(path))
+    with memory.stage("add_documents"):
+        success = await VectorStore().add_documents(documents)
+    report = memory.finish()
+    report["chunks"] = len(documents)
+    report["success"] = success
+    return report
+
+async def profile_pipeline(path: str) -> Dict[str, Any]:
+    """Stream the document through the ingestion pipeline"""
+    Config.MEMORY_PROFILING_ENABLED = True
+    result = await IngestionPipeline(DocumentLoader(), VectorStore()).run(path, os.path.basename(path))
+    report = result["stage_stats"]["memory"]
+    report["chunks"] = result["chunks_added"]
+    report["success"] = True
+    return report
+
+PATHS = {"batch": profile_batch, "pipeline": profile_pipeline}
+
+def print_report(results: Dict[str, Dict[str, Any]]):
+    for document, paths in results.items():
+        print(f"\n📄 {document}")
+        for name, report in paths.items():
+            print(f"  {name}: {report['chunks']} chunks, peak {report['peak_mb']} MB "
+                  f"(+{report['peak_increase_mb']} MB), retained {report['retained_mb']} MB")
+            print(f"    {'stage':<16}{'batches':>8}{'peak +MB':>10}{'retained MB':>13}")
+            for stage, row in report["stages"].items():
+                print(f"    {stage:<16}{row['batches']:>8}{row['peak_increase_mb']:>10}{row['retained_mb']:>13}")
+            for row in report["top_retained"]:
+                print(f"    retained {row['size_mb']} MB in {row['count']} blocks at {row['location']}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("files", nargs="*", help="PDF or DOCX files (default: generated samples)")
+    parser.add_argument("--pages", type=int, default=200, help="pages of the generated samples")
+    parser.add_argument("--paths", nargs="+", choices=sorted(PATHS), default=["batch", "pipeline"])
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    # Parse in a thread so that parsing allocations are traced, with the parser modules
+    # imported up front so that the first document is not charged for them
+    Config.DOCUMENT_PROCESS_WORKERS = 0
+    _import_parsers()
+    use_mock_upstreams()
+
+    with tempfile.TemporaryDirectory() as directory:
+        files = args.files or generate_documents(directory, args.pages)
+        results = {}
+        for path in files:
+            try:
+                results[os.path.basename(path)] = {name: asyncio.run(PATHS[name](path)) for name in args.paths}
+            except Exception as e:
+                print(f"❌ Could not ingest {path}: {e}")
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_report(results)
+
+if __name__ == "__main__":
+    main()
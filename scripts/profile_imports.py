@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Import-time profiler for the RAG LLM API
+
+Runs `python -X importtime -c "import <module>"` in a fresh interpreter and
+reports the modules with the largest self and cumulative import times.
+
+Usage:
+    python scripts/profile_imports.py [--module app.main] [--top 20] [--json]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import List, Dict, Any
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def parse_importtime(output: str) -> List[Dict[str, Any]]:
+    """Parse `-X importtime` stderr lines into module timing records (microseconds)"""
+    records = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # header line
+        name = fields[2].rstrip()
+        records.append({
+            "module": name.strip(),
+            "depth": (len(name) - len(name.lstrip())) // 2,
+            "self_us": int(fields[0]),
+            "cumulative_us": int(fields[1])
+        })
+    return records
+
+def profile_imports(module: str) -> List[Dict[str, Any]]:
+    """Import module in a fresh interpreter and return its import timing records"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    return parse_importtime(result.stderr)
+
+def summarize(records: List[Dict[str, Any]], module: str, top: int) -> Dict[str, Any]:
+    """Build a report of total time and top offenders"""
+    total_us = next((r["cumulative_us"] for r in records if r["module"] == module), 0)
+    return {
+        "module": module,
+        "total_ms": round(total_us / 1000, 1),
+        "modules_imported": len(records),
+        "top_cumulative": sorted(records, key=lambda r: r["cumulative_us"], reverse=True)[:top],
+        "top_self": sorted(records, key=lambda r: r["self_us"], reverse=True)[:top]
+    }
+
+def main():
+    """Main function to profile imports"""
+    parser = argparse.ArgumentParser(description="Profile module import time")
+    parser.add_argument("--module", default="app.main", help="Module to import")
+    parser.add_argument("--top", type=int, default=20, help="Number of offenders to report")
+    parser.add_argument("--json", action="store_true", help="Print machine-readable JSON")
+    args = parser.parse_args()
+
+    report = summarize(profile_imports(args.module), args.module, args.top)
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"⏱️ Importing {report['module']}: {report['total_ms']} ms ({report['modules_imported']} modules)")
+    for title, key, field in [("Top cumulative", "top_cumulative", "cumulative_us"), ("Top self", "top_self", "self_us")]:
+        print(f"\n{title}:")
+        for record in report[key]:
+            print(f"  {record[field] / 1000:>9.1f} ms  {record['module']}")
+
+if __name__ == "__main__":
+    main()
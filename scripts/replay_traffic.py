@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Replay captured traffic against a deployment and compare latency distributions
+
+`replay` re-issues the requests in a capture file (written with
+TRAFFIC_CAPTURE_ENABLED=True) against a target, at the recorded arrival
+rate scaled by --speed (0 sends as fast as --concurrency allows), and writes
+one JSONL line per request with its status and latency. `compare` prints the
+latency distributions of capture or replay files per route next to a
+baseline, e.g. replays of the same capture against two releases.
+
+Usage:
+    python scripts/replay_traffic.py replay traffic/requests.jsonl --target http://localhost:8000 [--speed 2] [--output replay.jsonl]
+    python scripts/replay_traffic.py compare baseline.jsonl candidate.jsonl [...] [--json]
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+import httpx
+import numpy as np
+
+def load_entries(path: str) -> List[Dict[str, Any]]:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+async def replay(entries: List[Dict[str, Any]], target: str, speed: float, concurrency: int, timeout: float) -> List[Dict[str, Any]]:
+    """Send the captured requests in arrival order, spaced by their recorded gaps divided by speed"""
+    entries = sorted(entries, key=lambda entry: entry["timestamp"])
+    results: List[Optional[Dict[str, Any]]] = [None] * len(entries)
+    semaphore = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=target, limits=limits, timeout=timeout) as client:
+        first = entries[0]["timestamp"] if entries else 0.0
+        started = time.perf_counter()
+
+        async def send(index: int, entry: Dict[str, Any], scheduled: float):
+            async with semaphore:
+                sent = time.perf_counter()
+                try:
+                    response = await client.request(entry["method"], entry["path"], json=entry["body"])
+                    status = response.status_code
+                except httpx.HTTPError as e:
+                    status = type(e).__name__
+                results[index] = {
+                    "timestamp": round(time.time(), 6),
+                    "method": entry["method"],
+                    "path": entry["path"],
+                    "status": status,
+                    "duration_ms": round((time.perf_counter() - sent) * 1000, 3),
+                    "recorded_duration_ms": entry.get("duration_ms"),
+                    # How late the request was sent compared to the scaled schedule
+                    "send_lag_ms": round((sent - started - scheduled) * 1000, 3)
+                }
+
+        tasks = []
+        for index, entry in enumerate(entries):
+            scheduled = (entry["timestamp"] - first) / speed if speed > 0 else 0.0
+            delay = started + scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(send(index, entry, scheduled)))
+        await asyncio.gather(*tasks)
+
+    return results
+
+def summarize(entries: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Latency percentiles and error rate per route"""
+    by_route = defaultdict(list)
+    for entry in entries:
+        by_route[f"{entry['method']} {entry['path']}"].append(entry)
+    summary = {}
+    for route, route_entries in sorted(by_route.items()):
+        latencies = np.array([entry["duration_ms"] for entry in route_entries])
+        errors = sum(1 for entry in route_entries if not isinstance(entry["status"], int) or entry["status"] >= 400)
+        summary[route] = {
+            "requests": len(route_entries),
+            "error_rate": round(errors / len(route_entries), 4),
+            "p50": round(float(np.percentile(latencies, 50)), 2),
+            "p95": round(float(np.percentile(latencies, 95)), 2),
+            "p99": round(float(np.percentile(latencies, 99)), 2),
+            "latencies": np.sort(latencies)
+        }
+    return summary
+
+def ks_distance(a: np.ndarray, b: np.ndarray) -> float:
+    """Two-sample Kolmogorov-Smirnov statistic of sorted samples: 0 for identical distributions, 1 for disjoint ones"""
+    values = np.concatenate([a, b])
+    cdf_a = np.searchsorted(a, values, side="right") / len(a)
+    cdf_b = np.searchsorted(b, values, side="right") / len(b)
+    return float(np.max(np.abs(cdf_a - cdf_b)))
+
+def compare(files: List[Tuple[str, List[Dict[str, Any]]]]) -> Dict[str, Any]:
+    """Compare each file's per-route latency distribution with the first (baseline) file's"""
+    paths = [path for path, _ in files]
+    summaries = [summarize(entries) for _, entries in files]
+    baseline = summaries[0]
+    comparison = {}
+    for route in baseline:
+        rows = []
+        for path, summary in zip(paths, summaries):
+            if route not in summary:
+                continue
+            row = {key: value for key, value in summary[route].items() if key != "latencies"}
+            row["file"] = path
+            if summary is not baseline:
+                for key in ("p50", "p95", "p99"):
+                    base = baseline[route][key]
+                    row[f"{key}_change_pct"] = round((row[key] - base) / base * 100, 1) if base else None
+                row["ks_distance"] = round(ks_distance(baseline[route]["latencies"], summary[route]["latencies"]), 3)
+            rows.append(row)
+        comparison[route] = rows
+    return comparison
+
+def print_comparison(comparison: Dict[str, Any]):
+    for route, rows in comparison.items():
+        print(f"\n{route}")
+        print(f"  {'file':<40}{'requests':>9}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'Δp95':>9}{'KS':>7}")
+        for row in rows:
+            change = f"{row['p95_change_pct']:+.1f}%" if row.get("p95_change_pct") is not None else ""
+            ks = f"{row['ks_distance']:.3f}" if "ks_distance" in row else ""
+            print(f"  {row['file'][-40:]:<40}{row['requests']:>9}{row['error_rate']:>8.1%}{row['p50']:>10}{row['p95']:>10}{row['p99']:>10}{change:>9}{ks:>7}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    replay_parser = commands.add_parser("replay", help="re-issue captured requests against a target")
+    replay_parser.add_argument("capture")
+    replay_parser.add_argument("--target", default="http://localhost:8000")
+    replay_parser.add_argument("--speed", type=float, default=1.0, help="rate multiplier (2 = twice the recorded rate, 0 = as fast as possible)")
+    replay_parser.add_argument("--concurrency", type=int, default=64, help="maximum requests in flight")
+    replay_parser.add_argument("--limit", type=int, default=None, help="replay only the first N requests")
+    replay_parser.add_argument("--timeout", type=float, default=120.0)
+    replay_parser.add_argument("--output", default="replay.jsonl")
+
+    compare_parser = commands.add_parser("compare", help="compare latency distributions with a baseline")
+    compare_parser.add_argument("files", nargs="+", help="capture or replay files; the first is the baseline")
+    compare_parser.add_argument("--json", action="store_true", help="print the comparison as JSON")
+
+    args = parser.parse_args()
+
+    if args.command == "replay":
+        entries = load_entries(args.capture)[:args.limit]
+        print(f"🔁 Replaying {len(entries)} requests against {args.target} at {'max' if args.speed <= 0 else f'{args.speed}x'} speed")
+        results = asyncio.run(replay(entries, args.target, args.speed, args.concurrency, args.timeout))
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.writelines(json.dumps(result) + "\n" for result in results)
+        print(f"✅ Wrote {len(results)} results to {args.output}")
+        print_comparison(compare([(args.capture, entries), (args.output, results)]))
+    else:
+        comparison = compare([(path, load_entries(path)) for path in args.files])
+        if args.json:
+            print(json.dumps(comparison, indent=2))
+        else:
+            print_comparison(comparison)
+
+if __name__ == "__main__":
+    main()
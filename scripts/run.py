@@ -1,25 +1,79 @@
 #!/usr/bin/env python3
 """
 Simple script to run the RAG LLM API
+
+Usage:
+    python scripts/run.py                    # single process, reloads on changes when DEBUG=True
+    python scripts/run.py --production [--workers 4]
 """
 
+import argparse
+import importlib.util
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 import uvicorn
 from app.core.config import Config
 
+def installed(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+def production_options(workers: int = None) -> dict:
+    """uvicorn settings for serving production traffic from one worker process per CPU"""
+    cpus = os.cpu_count() or 1
+    workers = workers or Config.SERVER_WORKERS or cpus
+    # Share the CPUs between the workers' document process pools instead of giving each worker its own set,
+    # and warm workers up before they accept traffic. Spawned workers read these when they import the
+    # configuration; a single worker runs in this process, which has imported it already
+    os.environ.setdefault("DOCUMENT_PROCESS_WORKERS", str(max(1, cpus // workers)))
+    os.environ.setdefault("WARMUP_ENABLED", "True")
+    Config.DOCUMENT_PROCESS_WORKERS = int(os.environ["DOCUMENT_PROCESS_WORKERS"])
+    Config.WARMUP_ENABLED = os.environ["WARMUP_ENABLED"].lower() == "true"
+    return {
+        "workers": workers,
+        "loop": "uvloop" if installed("uvloop") else "asyncio",
+        "http": "httptools" if installed("httptools") else "h11",
+        "backlog": Config.SERVER_BACKLOG,
+        "timeout_keep_alive": Config.SERVER_KEEP_ALIVE_SECONDS,
+        "timeout_graceful_shutdown": Config.SERVER_GRACEFUL_SHUTDOWN_SECONDS,
+        "reload": False,
+        # Requests are counted in /metrics; per-request log lines cost CPU on every worker
+        "access_log": False,
+        "server_header": False
+    }
+
 def main():
     """Main function to start the RAG LLM API server"""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--production", action="store_true", help="multiple workers, no reload, tuned server settings")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: SERVER_WORKERS, or one per CPU)")
+    parser.add_argument("--host", default=Config.HOST)
+    parser.add_argument("--port", type=int, default=Config.PORT)
+    parser.add_argument("--log-level", default="info")
+    args = parser.parse_args()
+
+    if args.production:
+        options = production_options(args.workers)
+    else:
+        options = {"reload": Config.DEBUG}
+
     print("🚀 Starting RAG LLM API...")
-    print(f"📡 Server will be available at: http://{Config.HOST}:{Config.PORT}")
-    print(f"📚 API Documentation: http://{Config.HOST}:{Config.PORT}/docs")
-    print(f"🔧 Debug mode: {Config.DEBUG}")
-    
+    print(f"📡 Server will be available at: http://{args.host}:{args.port}")
+    print(f"📚 API Documentation: http://{args.host}:{args.port}/docs")
+    if args.production:
+        print(f"🏭 Production mode: {options['workers']} workers, {options['loop']} event loop, {options['http']} HTTP parser")
+    else:
+        print(f"🔧 Debug mode: {Config.DEBUG}")
+
     uvicorn.run(
         "app.main:app",
-        host=Config.HOST,
-        port=Config.PORT,
-        reload=Config.DEBUG,
-        log_level="info"
+        host=args.host,
+        port=args.port,
+        log_level=args.log_level,
+        **options
     )
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
@@ -28,6 +28,8 @@ def run_tests(test_type="all", coverage=True, verbose=True):
         cmd.extend(["-m", "api"])
     elif test_type == "rag":
         cmd.extend(["-m", "rag"])
+    elif test_type == "performance":
+        cmd.extend(["-m", "performance"])
     elif test_type == "fast":
         cmd.extend(["-m", "not slow"])
     
@@ -54,7 +56,7 @@ def main():
     parser = argparse.ArgumentParser(description="Run RAG LLM API tests")
     parser.add_argument(
         "--type", 
-        choices=["all", "unit", "api", "rag", "fast"],
+        choices=["all", "unit", "api", "rag", "performance", "fast"],
         default="all",
         help="Type of tests to run"
     )
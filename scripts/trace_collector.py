@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+OTLP/HTTP trace collector stand-in and waterfall viewer for the RAG LLM API
+
+`serve` accepts OTLP/JSON trace exports on POST /v1/traces (set
+TRACING_EXPORTER=otlp) and appends them to a file as OTLP/JSON lines, the
+same format TRACING_EXPORTER=file writes. `show` prints each trace in such a
+file as a waterfall, slowest traces first.
+
+Usage:
+    python scripts/trace_collector.py serve [--port 4318] [--output traces.jsonl]
+    python scripts/trace_collector.py show [traces.jsonl] [--top 10]
+"""
+
+import argparse
+import json
+import threading
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Dict, Any
+
+def serve(port: int, output: str):
+    """Receive OTLP/JSON exports and append them to output"""
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            if self.path != "/v1/traces":
+                self.send_error(404)
+                return
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            try:
+                request = json.loads(body)
+            except ValueError:
+                self.send_error(400, "Expected an OTLP/JSON body")
+                return
+            with lock, open(output, "a", encoding="utf-8") as f:
+                f.write(json.dumps(request) + "\n")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.end_headers()
+            self.wfile.write(b"{}")
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("0.0.0.0", port), Handler)
+    print(f"📡 Collecting OTLP/JSON traces on http://localhost:{port}/v1/traces into {output}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+def load_spans(path: str) -> Dict[str, List[Dict[str, Any]]]:
+    """Read OTLP/JSON lines and group their spans by trace ID"""
+    traces = defaultdict(list)
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            for resource_spans in json.loads(line).get("resourceSpans", []):
+                for scope_spans in resource_spans.get("scopeSpans", []):
+                    for span in scope_spans.get("spans", []):
+                        traces[span["traceId"]].append(span)
+    return traces
+
+def format_waterfall(spans: List[Dict[str, Any]], width: int = 40) -> List[str]:
+    """Render the spans of one trace as indented lines with timing bars"""
+    start = min(int(span["startTimeUnixNano"]) for span in spans)
+    end = max(int(span["endTimeUnixNano"]) for span in spans)
+    total = max(end - start, 1)
+    span_ids = {span["spanId"] for span in spans}
+    children = defaultdict(list)
+    for span in spans:
+        parent = span.get("parentSpanId")
+        children[parent if parent in span_ids else None].append(span)
+
+    lines = []
+
+    def render(span, depth):
+        span_start = int(span["startTimeUnixNano"]) - start
+        duration = int(span["endTimeUnixNano"]) - int(span["startTimeUnixNano"])
+        offset = span_start * width // total
+        bar = " " * offset + "█" * max(1, duration * width // total)
+        attributes = " ".join(
+            f"{attribute['key']}={next(iter(attribute['value'].values()))}"
+            for attribute in span.get("attributes", [])
+        )
+        error = " ❌" if span.get("status", {}).get("code") == 2 else ""
+        lines.append(f"{bar:<{width}} {duration / 1e6:9.2f} ms  {'  ' * depth}{span['name']}{error} {attributes}".rstrip())
+        for child in sorted(children[span["spanId"]], key=lambda s: int(s["startTimeUnixNano"])):
+            render(child, depth + 1)
+
+    for root in sorted(children[None], key=lambda s: int(s["startTimeUnixNano"])):
+        render(root, 0)
+    return lines
+
+def show(path: str, top: int):
+    """Print the slowest traces in a file as waterfalls"""
+    traces = load_spans(path)
+
+    def trace_duration(spans):
+        return max(int(s["endTimeUnixNano"]) for s in spans) - min(int(s["startTimeUnixNano"]) for s in spans)
+
+    slowest = sorted(traces.items(), key=lambda item: trace_duration(item[1]), reverse=True)[:top]
+    for trace_id, spans in slowest:
+        print(f"\n🔍 Trace {trace_id} ({trace_duration(spans) / 1e6:.2f} ms, {len(spans)} spans)")
+        for line in format_waterfall(spans):
+            print(line)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    serve_parser = subparsers.add_parser("serve", help="run the collector")
+    serve_parser.add_argument("--port", type=int, default=4318)
+    serve_parser.add_argument("--output", default="traces.jsonl")
+    show_parser = subparsers.add_parser("show", help="print trace waterfalls")
+    show_parser.add_argument("path", nargs="?", default="traces.jsonl")
+    show_parser.add_argument("--top", type=int, default=10, help="number of slowest traces to show")
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        serve(args.port, args.output)
+    else:
+        show(args.path, args.top)
+
+if __name__ == "__main__":
+    main()
@@ -6,11 +6,42 @@ from httpx import AsyncClient
 from fastapi.testclient import TestClient
 
 from app.main import app
+from app.core.config import Config
+from app.utils import loop_monitor
 from app.domain.services.rag_service import RAGService
 from app.infrastructure.vector_store.vector_store import VectorStore
 from app.infrastructure.document_processing.loader import DocumentLoader
 
 
+def pytest_addoption(parser):
+    parser.addoption(
+        "--max-loop-block-ms", type=float, default=None,
+        help="Fail tests during which a route blocks the event loop for longer than this many milliseconds"
+    )
+
+
+def pytest_configure(config):
+    max_block_ms = config.getoption("--max-loop-block-ms")
+    if max_block_ms is not None:
+        Config.LOOP_BLOCK_THRESHOLD_MS = max_block_ms
+        Config.LOOP_MONITOR_INTERVAL_MS = min(Config.LOOP_MONITOR_INTERVAL_MS, max_block_ms)
+
+
+@pytest.fixture(autouse=True)
+def fail_on_loop_block(request):
+    """Fail the test if a route blocked the event loop (with --max-loop-block-ms)."""
+    if request.config.getoption("--max-loop-block-ms") is None:
+        yield
+        return
+    loop_monitor.blocking_events.clear()
+    yield
+    events = list(loop_monitor.blocking_events)
+    if events:
+        pytest.fail("Event loop blocked:\n" + "\n".join(
+            f"{event['blocked_ms']} ms in {event['coroutine']}\n{event['stack']}" for event in events
+        ))
+
+
 @pytest.fixture(scope="session")
 def event_loop():
     """Create an instance of the default event loop for the test session."""
@@ -75,6 +106,7 @@ def mock_document_loader():
             "metadata": {"source": "test.txt"}
         }
     ])
+    mock_loader.load_document_async = AsyncMock(side_effect=mock_loader.load_document)
     mock_loader.load_text = Mock(return_value=[
         {
             "id": "text1",
@@ -2,6 +2,7 @@
 Sample data and fixtures for testing
 """
 
+import random
 import pytest
 from typing import List, Dict, Any
 
@@ -24,6 +25,27 @@ SAMPLE_DOCUMENTS = [
     }
 ]
 
+# Vocabulary for generated sample text
+SAMPLE_WORDS = [
+    "python", "java", "language", "programming", "the", "a", "of", "vector", "search",
+    "embedding", "document", "retrieval", "augmented", "generation", "model", "data",
+    "machine", "learning", "is", "and", "to", "in", "with", "for", "system", "query"
+]
+
+def generate_sample_text(num_paragraphs: int, seed: int = 0) -> str:
+    """Generate deterministic prose with paragraphs, line breaks and occasional long tokens"""
+    rng = random.Random(seed)
+    paragraphs = []
+    for _ in range(num_paragraphs):
+        lines = []
+        for _ in range(rng.randint(1, 8)):
+            words = [rng.choice(SAMPLE_WORDS) for _ in range(rng.randint(3, 40))]
+            if rng.random() < 0.05:
+                words.append("x" * rng.randint(200, 1500))
+            lines.append(" ".join(words).capitalize() + ".")
+        paragraphs.append("\n".join(lines))
+    return "\n\n".join(paragraphs)
+
 # Sample questions and expected responses
 SAMPLE_QUESTIONS = [
     {
@@ -0,0 +1,122 @@
+import os
+import pytest
+from io import BytesIO
+from unittest.mock import patch, AsyncMock
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.core.config import Config
+
+
+def _multipart_chunks(filename: str, content: bytes, chunk_size: int = 1024):
+    """Yield a multipart/form-data body in chunks, so that it is sent without Content-Length."""
+    yield (
+        b"--boundary\r\n"
+        b'Content-Disposition: form-data; name="file"; filename="' + filename.encode() + b'"\r\n'
+        b"Content-Type: application/octet-stream\r\n\r\n"
+    )
+    for start in range(0, len(content), chunk_size):
+        yield content[start:start + chunk_size]
+    yield b"\r\n--boundary--\r\n"
+
+
+@pytest.mark.api
+class TestDocumentUpload:
+    """Test suite for streaming document uploads."""
+
+    @pytest.fixture
+    def client(self):
+        """Test client for the app."""
+        return TestClient(app)
+
+    def test_upload_streams_file_to_disk(self, client):
+        """Test that the uploaded content reaches the service intact and is cleaned up."""
+        received = {}
+
+        async def upsert_document(file_path, source_name, flush=False):
+            with open(file_path, "rb") as f:
+                received["content"] = f.read()
+            received["path"] = file_path
+            received["source_name"] = source_name
+            return {"success": True, "message": f"Document '{source_name}' updated successfully", "chunks_processed": 1}
+
+        file_content = b"Python is a programming language. " * 1000
+        with patch.object(Config, "UPLOAD_CHUNK_SIZE", 1024), \
+             patch("app.api.routes.documents.rag_service") as mock_rag:
+            mock_rag.upsert_document = AsyncMock(side_effect=upsert_document)
+            response = client.post(
+                "/documents/upload",
+                files={"file": ("test.txt", BytesIO(file_content), "text/plain")}
+            )
+
+        assert response.status_code == 200
+        assert received["content"] == file_content
+        assert received["source_name"] == "test.txt"
+        assert not os.path.exists(received["path"])
+
+    def test_upload_rejects_oversized_content_length_before_reading(self, client):
+        """Test that an upload declaring too large a body is rejected up front."""
+        with patch.object(Config, "MAX_FILE_SIZE", 4096), \
+             patch("app.api.routes.documents.rag_service") as mock_rag, \
+             patch("app.api.routes.documents.MultipartParser") as mock_parser:
+            response = client.post(
+                "/documents/upload",
+                files={"file": ("test.txt", BytesIO(b"x" * 100000), "text/plain")}
+            )
+
+        assert response.status_code == 400
+        assert "File too large" in response.json()["detail"]
+        mock_parser.assert_not_called()
+        mock_rag.upsert_document.assert_not_called()
+
+    def test_upload_enforces_size_limit_while_streaming(self, client, tmp_path):
+        """Test that a chunked upload without Content-Length is cut off once it exceeds the limit."""
+        with patch.object(Config, "MAX_FILE_SIZE", 4096), \
+             patch.object(Config, "UPLOAD_CHUNK_SIZE", 1024), \
+             patch("tempfile.tempdir", str(tmp_path)), \
+             patch("app.api.routes.documents.rag_service") as mock_rag:
+            response = client.post(
+                "/documents/upload",
+                content=_multipart_chunks("test.txt", b"x" * 10000),
+                headers={"Content-Type": "multipart/form-data; boundary=boundary"}
+            )
+
+        assert response.status_code == 400
+        assert "File too large" in response.json()["detail"]
+        assert os.listdir(tmp_path) == []
+        mock_rag.upsert_document.assert_not_called()
+
+    def test_upload_rejects_unsupported_format(self, client, tmp_path):
+        """Test that an unsupported format is rejected without writing a file."""
+        with patch("tempfile.tempdir", str(tmp_path)):
+            response = client.post(
+                "/documents/upload",
+                files={"file": ("test.exe", BytesIO(b"binary"), "application/octet-stream")}
+            )
+
+        assert response.status_code == 400
+        assert "Unsupported file format" in response.json()["detail"]
+        assert os.listdir(tmp_path) == []
+
+    def test_upload_requires_file_field(self, client):
+        """Test that a form without a file, or a body that is not a form, is rejected."""
+        response = client.post("/documents/upload", data={"other": "value"}, files={"ignored": ("", b"")})
+        assert response.status_code == 422
+
+        response = client.post("/documents/upload", json={"file": "test.txt"})
+        assert response.status_code == 422
+
+    def test_upload_async_rejects_when_queue_full_before_reading(self, client):
+        """Test that a full ingestion queue rejects uploads before the body is read."""
+        with patch("app.api.routes.documents.ingestion_queue") as mock_queue, \
+             patch("app.api.routes.documents._receive_upload") as mock_receive:
+            mock_queue.full.return_value = True
+            mock_queue.max_queue_size = 1
+            response = client.post(
+                "/documents/upload-async",
+                files={"file": ("test.txt", BytesIO(b"content"), "text/plain")}
+            )
+
+        assert response.status_code == 429
+        mock_receive.assert_not_called()
+        mock_queue.submit.assert_not_called()
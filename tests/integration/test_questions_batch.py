@@ -0,0 +1,53 @@
+import json
+import pytest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.core.config import Config
+
+
+@pytest.mark.api
+class TestAskBatch:
+    """Test suite for the batch question endpoint."""
+
+    @pytest.fixture
+    def client(self):
+        """Test client for the app."""
+        return TestClient(app)
+
+    def test_ask_batch_streams_ndjson(self, client):
+        """Test that answers are streamed as one JSON object per line."""
+        received = {}
+
+        async def ask_questions(questions):
+            received["questions"] = questions
+            yield {"index": 1, "question": "b", "success": True, "answer": "B", "sources": []}
+            yield {"index": 0, "question": "a", "success": True, "answer": "A", "sources": []}
+
+        with patch("app.api.routes.questions.rag_service") as mock_rag:
+            mock_rag.ask_questions = ask_questions
+            response = client.post("/questions/ask-batch", json={
+                "questions": [
+                    {"question": "a", "filters": {"sources": ["a.txt"]}},
+                    {"question": "b", "top_k": 5}
+                ]
+            })
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert [line["index"] for line in lines] == [1, 0]
+        assert received["questions"] == [
+            {"question": "a", "top_k": 3, "filters": {"sources": ["a.txt"]}},
+            {"question": "b", "top_k": 5, "filters": None}
+        ]
+
+    def test_ask_batch_rejects_oversized_batch(self, client):
+        """Test the batch size limit."""
+        with patch.object(Config, "MAX_BATCH_QUESTIONS", 1):
+            response = client.post("/questions/ask-batch", json={
+                "questions": [{"question": "a"}, {"question": "b"}]
+            })
+
+        assert response.status_code == 400
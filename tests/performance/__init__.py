@@ -0,0 +1,3 @@
+"""
+Performance Tests - Latency, allocation and round-trip budgets with mocked upstreams
+"""
@@ -0,0 +1,147 @@
+import asyncio
+import base64
+import json
+import math
+import os
+import time
+import tracemalloc
+from collections import Counter
+import httpx
+import numpy as np
+import pytest
+from app.core.config import Config
+from app.domain.services.rag_service import RAGService
+from app.infrastructure.document_processing.loader import DocumentLoader
+from app.infrastructure.external.external_api_service import ExternalAPIService, _upstream_name
+from app.infrastructure.vector_store.vector_store import VectorStore
+from tests.fixtures.sample_data import generate_sample_text
+
+# Budgets, overridable for slower CI machines
+ASK_CPU_BUDGET_MS = float(os.getenv("ASK_CPU_BUDGET_MS", "10"))
+LOAD_TEXT_CPU_BUDGET_MS = float(os.getenv("LOAD_TEXT_CPU_BUDGET_MS", "150"))
+ADD_DOCUMENTS_PEAK_BUDGET_MB = float(os.getenv("ADD_DOCUMENTS_PEAK_BUDGET_MB", "40"))
+
+
+class MockUpstreams:
+    """httpx transport answering embedding, vector database and LLM calls, counting calls per upstream."""
+
+    def __init__(self):
+        self.calls = Counter()
+        self.clients = 0
+        self.transport = httpx.MockTransport(self.handle)
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        upstream = _upstream_name(request.url)
+        self.calls[upstream] += 1
+        if upstream == "embeddings":
+            texts = json.loads(request.content)["input"]
+            vector = base64.b64encode(np.ones(Config.VECTOR_SIZE, dtype=np.float32).tobytes()).decode()
+            return httpx.Response(200, json={"data": [{"embedding": vector} for _ in texts]})
+        if upstream == "vector_search":
+            return httpx.Response(200, json={"result": [
+                {"id": str(i), "score": 0.9, "payload": {"content": f"Passage {i}. " * 40, "metadata": {"source": "doc.txt"}}}
+                for i in range(json.loads(request.content)["limit"])
+            ]})
+        if upstream == "llm":
+            return httpx.Response(200, json={"choices": [{"message": {"content": "Answer."}}], "usage": {"total_tokens": 10}})
+        if upstream == "vector_points" and request.method == "POST":
+            return httpx.Response(200, json={"result": []})
+        if upstream == "vector_points":
+            return httpx.Response(200, json={"result": {"operation_id": 1, "status": "completed"}})
+        return httpx.Response(200, json={"result": True})
+
+
+def cpu_time_ms(run, repeat: int = 5) -> float:
+    """Best CPU time of the calling thread over repeat runs, in milliseconds."""
+    best = math.inf
+    for _ in range(repeat):
+        started = time.thread_time()
+        run()
+        best = min(best, time.thread_time() - started)
+    return best * 1000
+
+
+@pytest.mark.performance
+class TestPerformanceBudgets:
+    """Test suite guarding hot-path CPU, allocation and upstream round-trip budgets."""
+
+    @pytest.fixture
+    def upstreams(self, monkeypatch):
+        """Route every upstream call through a counting mock transport."""
+        mock = MockUpstreams()
+        monkeypatch.setattr(Config, "OPENAI_API_KEY", "test-key")
+        monkeypatch.setattr(Config, "QDRANT_API_KEY", "test-key")
+        get_client_kwargs = ExternalAPIService._get_client_kwargs
+        monkeypatch.setattr(
+            ExternalAPIService, "_get_client_kwargs",
+            lambda self: {**get_client_kwargs(self), "transport": mock.transport}
+        )
+        client_init = httpx.AsyncClient.__init__
+
+        def counting_init(client, *args, **kwargs):
+            mock.clients += 1
+            client_init(client, *args, **kwargs)
+
+        monkeypatch.setattr(httpx.AsyncClient, "__init__", counting_init)
+        return mock
+
+    def test_ask_question_upstream_calls(self, upstreams):
+        """Test that a question costs one embedding, one search and one LLM call."""
+        rag_service = RAGService()
+
+        result = asyncio.run(rag_service.ask_question("What is RAG?", top_k=3))
+
+        assert result["success"] is True
+        assert dict(upstreams.calls) == {"embeddings": 1, "vector_search": 1, "llm": 1}
+        # Every upstream call goes through one pooled client
+        assert upstreams.clients <= 1
+
+    def test_ask_question_cpu_budget(self, upstreams):
+        """Test the CPU time spent per question outside the upstreams."""
+        rag_service = RAGService()
+        loop = asyncio.new_event_loop()
+        try:
+            run = lambda: loop.run_until_complete(rag_service.ask_question("What is RAG?", top_k=3))
+            run()
+            cpu_ms = cpu_time_ms(run)
+        finally:
+            loop.close()
+
+        assert cpu_ms < ASK_CPU_BUDGET_MS, f"ask_question used {cpu_ms:.1f} ms CPU"
+
+    def test_load_text_cpu_budget(self):
+        """Test the CPU time to chunk 1 MB of text."""
+        text = "\n\n".join(generate_sample_text(50, seed=seed) for seed in range(200))[:1024 * 1024]
+        loader = DocumentLoader()
+
+        cpu_ms = cpu_time_ms(lambda: loader.load_text(text), repeat=3)
+
+        assert cpu_ms < LOAD_TEXT_CPU_BUDGET_MS, f"load_text of 1 MB used {cpu_ms:.1f} ms CPU"
+
+    def test_add_documents_budgets(self, upstreams):
+        """Test peak allocations and upstream calls when adding 1,000 chunks."""
+        documents = [
+            {"content": f"Chunk {i}. " + "word " * 150, "metadata": {"source": "doc.txt", "chunk_index": i}}
+            for i in range(1000)
+        ]
+        vector_store = VectorStore()
+        loop = asyncio.new_event_loop()
+        try:
+            tracemalloc.start()
+            try:
+                assert loop.run_until_complete(vector_store.add_documents(documents)) is True
+                _, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+        finally:
+            loop.close()
+
+        peak_mb = peak / (1024 * 1024)
+        assert peak_mb < ADD_DOCUMENTS_PEAK_BUDGET_MB, f"add_documents peaked at {peak_mb:.1f} MB"
+        assert dict(upstreams.calls) == {
+            "vector_points": 1 + math.ceil(len(documents) / Config.VECTOR_UPSERT_BATCH_SIZE),
+            "embeddings": 1,
+            "vector_collection": 1,
+            "vector_index": len(Config.get_payload_indexes())
+        }
+        assert upstreams.clients <= 1
@@ -3,6 +3,10 @@
 Test certificate configuration
 """
 
+import os
+import shutil
+import ssl
+import certifi
 import pytest
 from app.core.config import Config
 from app.utils.cert_utils import CertificateManager
@@ -29,5 +33,33 @@ def test_cert_config():
     print(f"API Service SSL Config: {api_service.ssl_config}")
     assert hasattr(api_service, 'ssl_config')
 
+def test_ssl_context_is_shared():
+    """Test that the same SSL context is reused across clients"""
+    CertificateManager.clear_ssl_context_cache()
+    
+    first = Config.get_ssl_config()["verify"]
+    second = Config.get_ssl_config()["verify"]
+    assert isinstance(first, ssl.SSLContext)
+    assert first is second
+    
+    disabled = CertificateManager.get_cached_ssl_context(verify_ssl=False)
+    assert disabled.verify_mode == ssl.CERT_NONE
+    assert disabled is CertificateManager.get_cached_ssl_context(verify_ssl=False)
+
+def test_ssl_context_reloads_when_certificate_changes(tmp_path):
+    """Test that a rotated certificate file rebuilds the SSL context"""
+    CertificateManager.clear_ssl_context_cache()
+    cert_path = str(tmp_path / "ca.pem")
+    shutil.copyfile(certifi.where(), cert_path)
+    
+    first = CertificateManager.get_cached_ssl_context(cert_path=cert_path)
+    assert CertificateManager.get_cached_ssl_context(cert_path=cert_path) is first
+    
+    stat = os.stat(cert_path)
+    os.utime(cert_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    reloaded = CertificateManager.get_cached_ssl_context(cert_path=cert_path)
+    assert reloaded is not first
+    assert CertificateManager.get_cached_ssl_context(cert_path=cert_path) is reloaded
+
 if __name__ == "__main__":
     test_cert_config() 
\ No newline at end of file
@@ -0,0 +1,83 @@
+import pytest
+from unittest.mock import patch
+from app.core.config import Config
+from app.infrastructure.document_processing import loader as loader_module
+from app.infrastructure.document_processing.loader import DocumentLoader
+from tests.utils.test_helpers import create_text_pdf
+
+
+@pytest.mark.unit
+class TestDocumentLoader:
+    """Test suite for DocumentLoader."""
+
+    @pytest.fixture
+    def text_file(self, tmp_path):
+        """Text file large enough to produce several chunks."""
+        file_path = tmp_path / "python.txt"
+        file_path.write_text("Python is a programming language created by Guido van Rossum. " * 100)
+        return str(file_path)
+
+    def test_load_document_uses_source_name(self, text_file):
+        """Test that chunks are recorded under the given source name."""
+        chunks = DocumentLoader().load_document(text_file, "python.txt")
+
+        assert len(chunks) > 1
+        assert chunks[0]["id"] == f"python.txt{Config.CHUNK_ID_SEPARATOR}0"
+        assert all(chunk["metadata"]["source"] == "python.txt" for chunk in chunks)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("workers", [0, 1])
+    async def test_load_document_async_matches_sync(self, text_file, workers):
+        """Test that off-loop loading (thread or process pool) matches synchronous loading."""
+        loader = DocumentLoader()
+        with patch.object(Config, "DOCUMENT_PROCESS_WORKERS", workers):
+            try:
+                chunks = await loader.load_document_async(text_file, "python.txt")
+            finally:
+                loader_module.shutdown_process_pool()
+
+        assert chunks == loader.load_document(text_file, "python.txt")
+
+    @pytest.mark.asyncio
+    async def test_load_document_async_unsupported_format(self, tmp_path):
+        """Test that format errors from the worker are propagated."""
+        file_path = tmp_path / "data.xyz"
+        file_path.write_text("data")
+
+        with patch.object(Config, "DOCUMENT_PROCESS_WORKERS", 0):
+            with pytest.raises(ValueError, match="Unsupported file format"):
+                await DocumentLoader().load_document_async(str(file_path))
+
+    @pytest.mark.asyncio
+    async def test_iter_document_chunks_streams_pdf_pages(self, tmp_path):
+        """Test that PDFs are streamed in page windows matching whole-file loading."""
+        file_path = tmp_path / "doc.pdf"
+        file_path.write_bytes(create_text_pdf([f"Page {i} text" for i in range(5)]))
+        loader = DocumentLoader()
+
+        with patch.object(Config, "DOCUMENT_PROCESS_WORKERS", 0):
+            windows = [chunks async for chunks in loader.iter_document_chunks(str(file_path), pages_per_batch=2)]
+
+        assert [len(window) for window in windows] == [2, 2, 1]
+        assert [chunk for window in windows for chunk in window] == loader.split_file(str(file_path))
+
+    @pytest.mark.asyncio
+    async def test_warm_document_parsers_starts_every_worker(self):
+        """Test that warming up starts one process per pool worker."""
+        with patch.object(Config, "DOCUMENT_PROCESS_WORKERS", 2):
+            try:
+                await loader_module.warm_document_parsers()
+                processes = loader_module.get_process_pool()._processes
+            finally:
+                loader_module.shutdown_process_pool()
+
+        assert len(processes) == 2
+
+    @pytest.mark.asyncio
+    async def test_warm_document_parsers_without_pool_imports_nothing(self):
+        """Test that warming up without a process pool leaves the parsers to the first document."""
+        with patch.object(Config, "DOCUMENT_PROCESS_WORKERS", 0), \
+             patch.object(loader_module, "_import_parsers") as import_parsers:
+            await loader_module.warm_document_parsers()
+
+        import_parsers.assert_not_called()
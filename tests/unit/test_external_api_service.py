@@ -1,6 +1,11 @@
+import asyncio
+import base64
+import json
+import numpy as np
 import pytest
 from unittest.mock import patch, AsyncMock, Mock
-from app.infrastructure.external.external_api_service import ExternalAPIService
+from app.infrastructure.external import external_api_service
+from app.infrastructure.external.external_api_service import ExternalAPIService, close_async_clients
 from app.core.config import Config
 
 @pytest.mark.asyncio
@@ -33,6 +38,25 @@ class TestExternalAPIService:
         assert len(embeddings[0]) == 1536
         mock_post.assert_called_once()
     
+    @patch('httpx.AsyncClient.post')
+    async def test_get_embeddings_base64(self, mock_post):
+        """Test base64 embeddings are requested and decoded into float32 arrays"""
+        vector = np.arange(1536, dtype="<f4") / 1536
+        mock_response = Mock()
+        mock_response.json.return_value = {
+            "data": [
+                {"embedding": base64.b64encode(vector.tobytes()).decode()}
+            ]
+        }
+        mock_post.return_value = mock_response
+        
+        with patch.object(Config, "EMBEDDING_ENCODING_FORMAT", "base64"):
+            embeddings = await self.api_service.get_embeddings(["Hello world"])
+        
+        assert json.loads(mock_post.call_args.kwargs["content"])["encoding_format"] == "base64"
+        assert embeddings[0].dtype == np.float32
+        np.testing.assert_array_equal(embeddings[0], vector)
+    
     @patch('httpx.AsyncClient.put')
     @patch('httpx.AsyncClient.get')
     async def test_insert_vectors_success(self, mock_get, mock_put):
@@ -129,4 +153,26 @@ class TestExternalAPIService:
         assert 'Authorization' in self.api_service.openai_headers
         assert 'Content-Type' in self.api_service.openai_headers
         assert 'api-key' in self.api_service.qdrant_headers
-        assert 'Content-Type' in self.api_service.qdrant_headers 
\ No newline at end of file
+        assert 'Content-Type' in self.api_service.qdrant_headers     
+    async def test_async_client_is_shared_and_closed_on_shutdown(self):
+        """Test that services share one pooled client per event loop until it is closed"""
+        client = self.api_service._get_async_client()
+        
+        assert ExternalAPIService()._get_async_client() is client
+        
+        await close_async_clients()
+        assert client.is_closed
+        assert self.api_service._get_async_client() is not client
+        await close_async_clients()
+    
+    def test_async_client_per_event_loop(self):
+        """Test that each event loop gets a client of its own and finished loops drop theirs"""
+        async def get_client():
+            return self.api_service._get_async_client()
+        
+        first = asyncio.run(get_client())
+        second = asyncio.run(get_client())
+        
+        assert first is not second
+        assert len(external_api_service._async_clients) == 1
+        external_api_service._async_clients.clear()
@@ -0,0 +1,65 @@
+import importlib.util
+import os
+import subprocess
+import sys
+import pytest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Budget for `import app.main` in a fresh interpreter
+IMPORT_BUDGET_MS = float(os.getenv("IMPORT_BUDGET_MS", "1500"))
+
+# Modules that must only be imported when a document of that format is processed
+LAZY_MODULES = ["langchain", "langchain_community", "pypdf", "docx2txt", "tiktoken"]
+
+def load_profile_imports():
+    """Load scripts/profile_imports.py as a module"""
+    spec = importlib.util.spec_from_file_location(
+        "profile_imports", os.path.join(PROJECT_ROOT, "scripts", "profile_imports.py")
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.mark.unit
+@pytest.mark.slow
+class TestImportTime:
+    """Test suite guarding application cold-start import cost."""
+
+    def test_app_main_import_within_budget(self):
+        """Test that importing app.main stays under the import-time budget."""
+        profile_imports = load_profile_imports()
+        report = profile_imports.summarize(profile_imports.profile_imports("app.main"), "app.main", top=10)
+
+        offenders = ", ".join(f"{r['module']} ({r['cumulative_us'] / 1000:.0f} ms)" for r in report["top_cumulative"])
+        assert report["total_ms"] < IMPORT_BUDGET_MS, f"app.main import took {report['total_ms']} ms: {offenders}"
+
+    def test_heavy_document_loaders_imported_lazily(self):
+        """Test that importing app.main does not pull in document parsing libraries."""
+        result = subprocess.run(
+            [sys.executable, "-c", "import sys, app.main; print(' '.join(sys.modules))"],
+            cwd=PROJECT_ROOT,
+            capture_output=True,
+            text=True,
+            check=True
+        )
+        imported = set(result.stdout.split())
+
+        assert [name for name in LAZY_MODULES if name in imported] == []
+
+    def test_parse_importtime(self):
+        """Test parsing of -X importtime output."""
+        profile_imports = load_profile_imports()
+        output = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       100 |        100 |   app.core\n"
+            "import time:       250 |        350 | app\n"
+        )
+
+        records = profile_imports.parse_importtime(output)
+
+        assert records == [
+            {"module": "app.core", "depth": 1, "self_us": 100, "cumulative_us": 100},
+            {"module": "app", "depth": 0, "self_us": 250, "cumulative_us": 350},
+        ]
@@ -0,0 +1,122 @@
+import asyncio
+import tracemalloc
+import pytest
+from unittest.mock import Mock, AsyncMock, patch
+from app.core.config import Config
+from app.domain.services.ingestion_pipeline import IngestionPipeline
+from app.infrastructure.document_processing.loader import DocumentLoader
+from app.infrastructure.vector_store.vector_store import generate_point_id
+
+
+@pytest.mark.unit
+class TestIngestionPipeline:
+    """Test suite for the streaming ingestion pipeline."""
+
+    @pytest.fixture
+    def pages(self):
+        """Three pages of (content, page) chunk pairs."""
+        return [
+            [(f"page {page} chunk {i}", page) for i in range(3)]
+            for page in range(3)
+        ]
+
+    @pytest.fixture
+    def mock_document_loader(self, pages):
+        """Loader that yields one page of chunks at a time."""
+        async def iter_document_chunks(file_path):
+            for page_chunks in pages:
+                yield page_chunks
+
+        mock = Mock(spec=DocumentLoader)
+        mock.iter_document_chunks = iter_document_chunks
+        mock.build_document_chunks = DocumentLoader.build_document_chunks.__get__(mock)
+        return mock
+
+    @pytest.fixture
+    def mock_vector_store(self):
+        """Vector store recording embedded and inserted batches."""
+        mock = Mock()
+        mock.embed_documents = AsyncMock(side_effect=lambda docs: [[0.1, 0.2] for _ in docs])
+        mock.insert_documents = AsyncMock(return_value=True)
+        return mock
+
+    @pytest.mark.asyncio
+    async def test_run_embeds_and_stores_in_batches(self, mock_document_loader, mock_vector_store):
+        """Test that chunks flow through all stages in fixed-size batches."""
+        pipeline = IngestionPipeline(mock_document_loader, mock_vector_store, batch_size=4, queue_size=1)
+        progress = Mock()
+
+        result = await pipeline.run("doc.pdf", "doc.pdf", progress=progress)
+
+        assert len(result["chunk_ids"]) == 9
+        assert result["chunks_added"] == 9
+        assert [len(call.args[0]) for call in mock_vector_store.embed_documents.call_args_list] == [4, 4, 1]
+        inserted = [doc for call in mock_vector_store.insert_documents.call_args_list for doc in call.args[0]]
+        assert [doc["metadata"]["chunk_index"] for doc in inserted] == list(range(9))
+        assert result["stage_stats"]["parse"]["batches"] == 3
+        assert result["stage_stats"]["upsert"]["chunks"] == 9
+        progress.assert_any_call("parsed", 3)
+        progress.assert_any_call("stored", 4)
+
+    @pytest.mark.asyncio
+    async def test_run_reports_stage_memory_when_profiling(self, mock_document_loader, mock_vector_store):
+        """Test that per-stage memory is reported only with memory profiling enabled."""
+        pipeline = IngestionPipeline(mock_document_loader, mock_vector_store, batch_size=4)
+
+        result = await pipeline.run("doc.pdf", "doc.pdf")
+        assert "memory" not in result["stage_stats"]
+
+        with patch.object(Config, "MEMORY_PROFILING_ENABLED", True):
+            result = await pipeline.run("doc.pdf", "doc.pdf")
+
+        memory = result["stage_stats"]["memory"]
+        assert set(memory["stages"]) == {"parse", "embed", "upsert"}
+        assert memory["stages"]["embed"]["batches"] == 3
+        assert memory["peak_mb"] > 0
+        assert not tracemalloc.is_tracing()
+
+    @pytest.mark.asyncio
+    async def test_run_skips_stored_chunks(self, mock_document_loader, mock_vector_store):
+        """Test that chunks in skip_ids are tracked but not embedded."""
+        pipeline = IngestionPipeline(mock_document_loader, mock_vector_store, batch_size=4)
+        skip_ids = {generate_point_id("doc.pdf", f"page 0 chunk {i}") for i in range(3)}
+
+        result = await pipeline.run("doc.pdf", "doc.pdf", skip_ids=skip_ids)
+
+        assert len(result["chunk_ids"]) == 9
+        assert result["chunks_added"] == 6
+        embedded = [doc["content"] for call in mock_vector_store.embed_documents.call_args_list for doc in call.args[0]]
+        assert not any(content.startswith("page 0") for content in embedded)
+
+    @pytest.mark.asyncio
+    async def test_embedding_overlaps_upsert(self, mock_document_loader, mock_vector_store):
+        """Test that the next batch is embedded while the previous one is being stored."""
+        events = []
+
+        async def embed_documents(docs):
+            events.append(("embed", docs[0]["content"]))
+            return [[0.1] for _ in docs]
+
+        async def insert_documents(docs, embeddings, file_hash=None):
+            events.append(("upsert-start", docs[0]["content"]))
+            await asyncio.sleep(0.01)
+            events.append(("upsert-end", docs[0]["content"]))
+            return True
+
+        mock_vector_store.embed_documents = AsyncMock(side_effect=embed_documents)
+        mock_vector_store.insert_documents = AsyncMock(side_effect=insert_documents)
+        pipeline = IngestionPipeline(mock_document_loader, mock_vector_store, batch_size=3)
+
+        await pipeline.run("doc.pdf", "doc.pdf")
+
+        first_upsert_end = events.index(("upsert-end", "page 0 chunk 0"))
+        assert events.index(("embed", "page 1 chunk 0")) < first_upsert_end
+
+    @pytest.mark.asyncio
+    async def test_stage_failure_propagates(self, mock_document_loader, mock_vector_store):
+        """Test that a failing stage stops the pipeline and raises."""
+        mock_vector_store.embed_documents.side_effect = Exception("Embedding API error")
+        pipeline = IngestionPipeline(mock_document_loader, mock_vector_store, batch_size=1, queue_size=1)
+
+        with pytest.raises(Exception, match="Embedding API error"):
+            await pipeline.run("doc.pdf", "doc.pdf")
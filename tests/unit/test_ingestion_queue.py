@@ -0,0 +1,101 @@
+import asyncio
+import os
+import pytest
+from unittest.mock import Mock, AsyncMock
+from app.domain.services.ingestion_queue import IngestionQueue, IngestionQueueFullError
+
+
+@pytest.mark.unit
+class TestIngestionQueue:
+    """Test suite for the background ingestion queue."""
+
+    @pytest.fixture
+    def mock_rag_service(self):
+        """Mock RAG service that reports progress for each stage."""
+        async def upsert_document(file_path, source_name, progress=None):
+            progress("parsed", 3)
+            progress("embedded", 3)
+            progress("stored", 3)
+            return {"success": True, "message": f"Document '{source_name}' updated successfully", "chunks_processed": 3}
+
+        mock = Mock()
+        mock.upsert_document = AsyncMock(side_effect=upsert_document)
+        return mock
+
+    @pytest.fixture
+    def upload_file(self, tmp_path):
+        """Temporary file standing in for a saved upload."""
+        file_path = tmp_path / "upload.txt"
+        file_path.write_text("Python is a programming language")
+        return str(file_path)
+
+    @pytest.mark.asyncio
+    async def test_job_completes_with_progress(self, mock_rag_service, upload_file):
+        """Test that a submitted job is processed and its progress recorded."""
+        queue = IngestionQueue(mock_rag_service, max_workers=1, max_queue_size=10)
+
+        job = queue.submit(upload_file, "test.txt")
+        assert job.status == "queued"
+        await queue._queue.join()
+
+        assert queue.get_job(job.job_id).status == "completed"
+        assert job.chunks_parsed == 3
+        assert job.chunks_embedded == 3
+        assert job.chunks_stored == 3
+        assert not os.path.exists(upload_file)
+        await queue.stop()
+
+    @pytest.mark.asyncio
+    async def test_failed_job_is_reported(self, mock_rag_service, upload_file):
+        """Test that pipeline errors mark the job as failed."""
+        mock_rag_service.upsert_document.side_effect = Exception("Embedding API error")
+        queue = IngestionQueue(mock_rag_service, max_workers=1, max_queue_size=10)
+
+        job = queue.submit(upload_file, "test.txt")
+        await queue._queue.join()
+
+        assert job.status == "failed"
+        assert "Embedding API error" in job.message
+        await queue.stop()
+
+    @pytest.mark.asyncio
+    async def test_submit_raises_when_queue_full(self, mock_rag_service, upload_file):
+        """Test backpressure when the queue is full."""
+        blocker = asyncio.Event()
+
+        async def blocked_upsert(*args, **kwargs):
+            await blocker.wait()
+            return {"success": True, "message": "done"}
+
+        mock_rag_service.upsert_document.side_effect = blocked_upsert
+        queue = IngestionQueue(mock_rag_service, max_workers=1, max_queue_size=1)
+
+        queue.submit(upload_file, "first.txt")
+        await asyncio.sleep(0)  # let the worker pick up the first job
+        assert not queue.full()
+        queue.submit(upload_file, "second.txt")
+        assert queue.full()
+        with pytest.raises(IngestionQueueFullError):
+            queue.submit(upload_file, "third.txt")
+
+        blocker.set()
+        await queue.stop()
+
+    @pytest.mark.asyncio
+    async def test_stop_fails_queued_jobs_and_deletes_their_files(self, mock_rag_service, tmp_path):
+        """Test that stopping the queue does not leave queued uploads on disk."""
+        async def blocked_upsert(*args, **kwargs):
+            await asyncio.Event().wait()
+
+        mock_rag_service.upsert_document.side_effect = blocked_upsert
+        queue = IngestionQueue(mock_rag_service, max_workers=1, max_queue_size=10)
+        files = [tmp_path / f"upload-{i}.txt" for i in range(3)]
+        for file_path in files:
+            file_path.write_text("Python is a programming language")
+
+        jobs = [queue.submit(str(file_path), file_path.name) for file_path in files]
+        await asyncio.sleep(0)  # let the worker pick up the first job
+        await queue.stop()
+
+        assert not any(file_path.exists() for file_path in files)
+        assert [job.status for job in jobs] == ["failed"] * 3
@@ -0,0 +1,38 @@
+import json
+import numpy as np
+import pytest
+from unittest.mock import patch
+from app.utils import json_utils
+
+
+@pytest.mark.unit
+class TestJsonUtils:
+    """Test suite for JSON serialization of upstream request bodies."""
+
+    @pytest.fixture
+    def body(self):
+        return {
+            "points": [
+                {
+                    "id": "test-id",
+                    "vector": np.array([0.5, -0.25, 1.0], dtype=np.float32),
+                    "payload": {"content": "café", "metadata": {"page": np.int64(2)}}
+                }
+            ]
+        }
+
+    @pytest.mark.skipif(not json_utils.HAS_ORJSON, reason="orjson not installed")
+    def test_dumps_with_orjson(self, body):
+        """Test that orjson serializes NumPy vectors directly."""
+        decoded = json.loads(json_utils.dumps(body))
+
+        assert decoded["points"][0]["vector"] == [0.5, -0.25, 1.0]
+        assert decoded["points"][0]["payload"]["content"] == "café"
+
+    def test_dumps_with_standard_library(self, body):
+        """Test the fallback encoder produces the same document."""
+        with patch.object(json_utils, "orjson", None):
+            decoded = json.loads(json_utils.dumps(body))
+
+        assert decoded["points"][0]["vector"] == [0.5, -0.25, 1.0]
+        assert decoded["points"][0]["payload"] == {"content": "café", "metadata": {"page": 2}}
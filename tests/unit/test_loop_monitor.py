@@ -0,0 +1,83 @@
+import asyncio
+import gc
+import time
+import pytest
+from unittest.mock import patch
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.api.middleware import LoopMonitorMiddleware
+from app.core.config import Config
+from app.utils import loop_monitor
+from app.utils.loop_monitor import LoopLagMonitor
+
+
+def parse_pdf_on_loop():
+    """Stand-in for synchronous work done on the event loop."""
+    time.sleep(0.3)
+
+
+@pytest.mark.unit
+class TestLoopMonitor:
+    """Test suite for the event loop lag monitor."""
+
+    @pytest.fixture
+    def client(self):
+        """App with one route that blocks the loop and one that awaits."""
+        app = FastAPI()
+        app.add_middleware(LoopMonitorMiddleware)
+
+        @app.get("/blocking")
+        async def blocking():
+            parse_pdf_on_loop()
+            return {"ok": True}
+
+        @app.get("/waiting")
+        async def waiting():
+            await asyncio.sleep(0.3)
+            return {"ok": True}
+
+        with patch.object(Config, "LOOP_MONITOR_INTERVAL_MS", 10), patch.object(Config, "LOOP_BLOCK_THRESHOLD_MS", 100):
+            loop_monitor.blocking_events.clear()
+            yield TestClient(app)
+        loop_monitor.blocking_events.clear()
+
+    def test_blocking_route_is_reported_with_stack(self, client):
+        """Test that a blocking call is reported once, with the offending task and stack."""
+        assert client.get("/blocking").status_code == 200
+
+        events = list(loop_monitor.blocking_events)
+        assert len(events) == 1
+        assert events[0]["blocked_ms"] > 100
+        assert events[0]["coroutine"].endswith("blocking")
+        assert "parse_pdf_on_loop" in events[0]["stack"]
+
+    def test_awaiting_route_is_not_reported(self, client):
+        """Test that awaiting does not count as blocking the loop."""
+        assert client.get("/waiting").status_code == 200
+
+        assert list(loop_monitor.blocking_events) == []
+
+    @pytest.mark.asyncio
+    async def test_lag_is_observed(self):
+        """Test that the heartbeat observes scheduling lag."""
+        with patch("app.utils.loop_monitor.LOOP_LAG") as lag:
+            monitor = LoopLagMonitor(asyncio.get_running_loop(), interval=0.01, threshold=1.0)
+            monitor.start()
+            await asyncio.sleep(0.05)
+            monitor.stop()
+
+        assert lag.observe.call_count >= 2
+        assert all(call.args[0] >= 0 for call in lag.observe.call_args_list)
+
+    def test_monitors_of_finished_loops_are_dropped(self):
+        """Test that each asyncio.run loop's monitor is dropped once the loop finishes."""
+        async def monitored():
+            monitor = loop_monitor.ensure_loop_monitor(0.01, 1.0)
+            assert loop_monitor._monitors[asyncio.get_running_loop()] is monitor
+            return monitor
+
+        monitors = [asyncio.run(monitored()) for _ in range(3)]
+
+        assert len(loop_monitor._monitors) == 0
+        gc.collect()
+        assert all(monitor.loop is None for monitor in monitors)
@@ -0,0 +1,68 @@
+import tracemalloc
+import pytest
+from app.utils.memory_profiling import MemoryProfile
+
+MB = 1024 * 1024
+
+
+@pytest.mark.unit
+class TestMemoryProfiling:
+    """Test suite for per-stage memory profiling."""
+
+    def test_peak_and_retained_per_stage(self):
+        """Test that freed allocations count towards the peak and kept ones towards retained memory."""
+        profile = MemoryProfile(True).start()
+        with profile.stage("parse"):
+            scratch = bytearray(8 * MB)
+            del scratch
+        with profile.stage("embed"):
+            kept = bytearray(4 * MB)
+        report = profile.finish()
+
+        parse, embed = report["stages"]["parse"], report["stages"]["embed"]
+        assert parse["peak_increase_mb"] >= 8
+        assert parse["retained_mb"] < 1
+        assert 4 <= embed["retained_mb"] < 5
+        assert report["peak_increase_mb"] >= 8
+        assert "test_memory_profiling.py" in report["top_retained"][0]["location"]
+        assert report["top_retained"][0]["size_mb"] >= 4
+        assert not tracemalloc.is_tracing()
+        del kept
+
+    def test_tracing_stops_after_the_last_profile(self):
+        """Test that tracing stays on while any profile runs and is left on if started elsewhere."""
+        first, second = MemoryProfile(True).start(), MemoryProfile(True).start()
+        first.finish()
+        assert tracemalloc.is_tracing()
+        second.finish()
+        assert not tracemalloc.is_tracing()
+
+        tracemalloc.start()
+        try:
+            MemoryProfile(True).start().finish()
+            assert tracemalloc.is_tracing()
+        finally:
+            tracemalloc.stop()
+
+    def test_overlapping_stages_keep_their_peaks(self):
+        """Test that a stage's peak survives another stage finishing while it runs."""
+        profile = MemoryProfile(True).start()
+        outer = profile.open("embed")
+        scratch = bytearray(8 * MB)
+        del scratch
+        with profile.stage("upsert"):
+            pass
+        profile.close(outer)
+        report = profile.finish()
+
+        assert report["stages"]["embed"]["peak_increase_mb"] >= 8
+        assert report["stages"]["upsert"]["peak_increase_mb"] < 1
+
+    def test_disabled_profile_records_nothing(self):
+        """Test that a disabled profile measures nothing."""
+        profile = MemoryProfile(False).start()
+        with profile.stage("parse"):
+            pass
+
+        assert profile.open("embed") is None
+        assert profile.finish() is None
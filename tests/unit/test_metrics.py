@@ -0,0 +1,96 @@
+import httpx
+import pytest
+from unittest.mock import patch
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.api.middleware import MetricsMiddleware
+from app.core.config import Config
+from app.infrastructure.external.external_api_service import ExternalAPIService
+from app.utils import metrics
+
+pytestmark = pytest.mark.skipif(not metrics.HAS_PROMETHEUS, reason="prometheus_client not installed")
+
+
+def sample(name: str, **labels) -> float:
+    """Current value of a metric sample, 0 if it was never recorded."""
+    from prometheus_client import REGISTRY
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+@pytest.mark.unit
+class TestMetrics:
+    """Test suite for Prometheus instrumentation."""
+
+    def test_time_stage_observes_on_error(self):
+        """Test that stage durations are recorded even when the stage fails."""
+        before = sample("rag_stage_duration_seconds_count", stage="test_stage")
+
+        with pytest.raises(ValueError):
+            with metrics.time_stage("test_stage"):
+                raise ValueError("boom")
+
+        assert sample("rag_stage_duration_seconds_count", stage="test_stage") == before + 1
+
+    def test_record_cache(self):
+        """Test that hits and misses are counted separately."""
+        before_hit = sample("rag_cache_requests_total", cache="test_cache", result="hit")
+        before_miss = sample("rag_cache_requests_total", cache="test_cache", result="miss")
+
+        metrics.record_cache("test_cache", hits=3, misses=1)
+
+        assert sample("rag_cache_requests_total", cache="test_cache", result="hit") == before_hit + 3
+        assert sample("rag_cache_requests_total", cache="test_cache", result="miss") == before_miss + 1
+
+    def test_middleware_labels_route_template(self):
+        """Test that requests are labelled with the route template, not the raw path."""
+        app = FastAPI()
+        app.add_middleware(MetricsMiddleware)
+
+        @app.get("/items/{item_id}")
+        async def get_item(item_id: int):
+            return {"item_id": item_id}
+
+        before = sample("rag_http_requests_total", method="GET", route="/items/{item_id}", status="200")
+        before_unmatched = sample("rag_http_requests_total", method="GET", route="unmatched", status="404")
+
+        client = TestClient(app)
+        client.get("/items/1")
+        client.get("/items/2")
+        client.get("/missing")
+
+        assert sample("rag_http_requests_total", method="GET", route="/items/{item_id}", status="200") == before + 2
+        assert sample("rag_http_requests_total", method="GET", route="unmatched", status="404") == before_unmatched + 1
+        assert sample("rag_http_request_duration_seconds_count", method="GET", route="/items/{item_id}") >= 2
+
+    @pytest.mark.asyncio
+    async def test_upstream_status_and_bytes(self):
+        """Test that upstream calls are counted by endpoint and status with their bytes."""
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(503, content=b"unavailable")
+
+        service = ExternalAPIService()
+        service.openai_headers["Authorization"] = "Bearer test"
+        kwargs = {**service._get_async_client_kwargs(), "transport": httpx.MockTransport(handler)}
+        before = sample("rag_upstream_requests_total", upstream="llm", method="POST", status="503")
+        before_sent = sample("rag_upstream_bytes_total", upstream="llm", direction="sent")
+        before_received = sample("rag_upstream_bytes_total", upstream="llm", direction="received")
+
+        with patch.object(service, "_get_async_client_kwargs", return_value=kwargs):
+            with pytest.raises(Exception, match="LLM API error"):
+                await service.call_llm([{"role": "user", "content": "hi"}])
+
+        assert sample("rag_upstream_requests_total", upstream="llm", method="POST", status="503") == before + 1
+        assert sample("rag_upstream_bytes_total", upstream="llm", direction="sent") > before_sent
+        assert sample("rag_upstream_bytes_total", upstream="llm", direction="received") == before_received + len(b"unavailable")
+
+    def test_metrics_endpoint(self):
+        """Test that /metrics serves the Prometheus text format."""
+        from app.main import app
+
+        if not Config.METRICS_ENABLED:
+            pytest.skip("metrics disabled")
+        response = TestClient(app).get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert "rag_stage_duration_seconds" in response.text
@@ -0,0 +1,138 @@
+import asyncio
+import json
+import pstats
+import time
+import pytest
+from unittest.mock import patch
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.api.middleware import ProfilingMiddleware
+from app.core.config import Config
+from app.utils.profiling import ProfilingController, RateLimiter, sign_profile_header, verify_profile_header
+
+SECRET = "test-secret"
+
+
+async def fetch_upstream():
+    """Stand-in for an upstream call the request waits on."""
+    await asyncio.sleep(0.05)
+
+
+def build_context(size: int) -> str:
+    """Stand-in for CPU work on the event loop."""
+    deadline = time.perf_counter() + 0.03
+    parts = []
+    while time.perf_counter() < deadline:
+        parts.append("x" * size)
+    return "".join(parts)
+
+
+@pytest.mark.unit
+class TestProfiling:
+    """Test suite for on-demand request profiling."""
+
+    @pytest.fixture
+    def controller(self, tmp_path):
+        return ProfilingController(str(tmp_path), rate_limit=2, max_stored=10, secret=SECRET)
+
+    @pytest.fixture
+    def client(self, controller):
+        """App whose endpoint waits on an 'upstream' call and then does CPU work."""
+        app = FastAPI()
+        app.add_middleware(ProfilingMiddleware, controller=controller, sample_interval=0.002)
+
+        @app.get("/ask")
+        async def ask():
+            await fetch_upstream()
+            return {"length": len(build_context(100))}
+
+        return TestClient(app)
+
+    def test_signed_header_verification(self):
+        """Test that only unexpired headers signed with the secret are accepted."""
+        header = sign_profile_header(SECRET, "cprofile")
+
+        assert verify_profile_header(header, SECRET) == "cprofile"
+        assert verify_profile_header(header, "other-secret") is None
+        assert verify_profile_header(header, None) is None
+        assert verify_profile_header(header.replace("cprofile", "sample"), SECRET) is None
+        assert verify_profile_header(sign_profile_header(SECRET, ttl=-1), SECRET) is None
+        assert verify_profile_header("garbage", SECRET) is None
+
+    def test_rate_limiter(self):
+        """Test that the limiter allows at most `limit` events per window."""
+        limiter = RateLimiter(2, period=60)
+
+        assert [limiter.allow() for _ in range(3)] == [True, True, False]
+
+    def test_unprofiled_request_has_no_profile_headers(self, client):
+        """Test that requests without a header or toggle pass through untouched."""
+        response = client.get("/ask")
+
+        assert response.status_code == 200
+        assert "x-profile-id" not in response.headers
+        assert "x-profile-status" not in response.headers
+
+    def test_sampled_profile_captures_waits_and_cpu(self, client, controller):
+        """Test that the sampling profiler records async waits and CPU work as speedscope JSON."""
+        response = client.get("/ask", headers={"X-Profile": sign_profile_header(SECRET)})
+
+        profile_id = response.headers["x-profile-id"]
+        assert profile_id.endswith(".speedscope.json")
+        with open(controller.path(profile_id)) as f:
+            profile = json.load(f)
+        frames = [frame["name"] for frame in profile["shared"]["frames"]]
+        samples = profile["profiles"][0]["samples"]
+
+        def time_in(name):
+            index = frames.index(name)
+            return sum(weight for stack, weight in zip(samples, profile["profiles"][0]["weights"]) if index in stack)
+
+        assert time_in("fetch_upstream") > 20
+        assert time_in("build_context") > 10
+        assert any(name.startswith("(await") for name in frames)
+
+    def test_cprofile_profile_is_pstats(self, client, controller):
+        """Test that deterministic profiles are stored as loadable pstats."""
+        response = client.get("/ask", headers={"X-Profile": sign_profile_header(SECRET, "cprofile")})
+
+        stats = pstats.Stats(controller.path(response.headers["x-profile-id"]))
+        assert any(function[2] == "build_context" for function in stats.stats)
+
+    def test_refused_requests_report_status(self, client):
+        """Test that invalid signatures and exceeded rate limits are reported, not profiled."""
+        invalid = client.get("/ask", headers={"X-Profile": "sample:1:bad"})
+        assert invalid.headers["x-profile-status"] == "invalid-signature"
+
+        statuses = [
+            client.get("/ask", headers={"X-Profile": sign_profile_header(SECRET)}).headers.get("x-profile-status")
+            for _ in range(3)
+        ]
+        assert statuses == [None, None, "rate-limited"]
+
+    def test_admin_toggle_and_download(self, tmp_path):
+        """Test that the admin toggle profiles the next request and its profile can be downloaded."""
+        from app.main import app
+        from app.api.routes import admin
+
+        client = TestClient(app)
+        with patch.object(Config, "ADMIN_API_KEY", ""):
+            assert client.get("/admin/profiling").status_code == 404
+
+        with patch.object(Config, "ADMIN_API_KEY", "admin-key"), \
+             patch.object(admin.profiling_controller, "output_dir", str(tmp_path)), \
+             patch.object(admin.profiling_controller, "rate_limiter", RateLimiter(5)):
+            assert client.get("/admin/profiling", headers={"X-Admin-Key": "wrong"}).status_code == 401
+
+            headers = {"X-Admin-Key": "admin-key"}
+            toggled = client.put("/admin/profiling", json={"enabled": True, "requests": 1}, headers=headers)
+            assert toggled.json() == {"enabled": True, "mode": "sample", "remaining": 1}
+
+            profile_id = client.get("/health").headers["x-profile-id"]
+            assert "x-profile-id" not in client.get("/health").headers
+            assert client.get("/admin/profiles", headers=headers).json() == {"profiles": [profile_id]}
+
+            download = client.get(f"/admin/profiles/{profile_id}", headers=headers)
+            assert download.status_code == 200
+            assert json.loads(download.content)["profiles"][0]["type"] == "sampled"
+            assert client.get("/admin/profiles/..%2Fsecret.pstats", headers=headers).status_code == 404
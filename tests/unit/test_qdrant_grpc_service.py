@@ -0,0 +1,148 @@
+import threading
+import numpy as np
+import pytest
+from unittest.mock import patch
+from app.core.config import Config
+from app.infrastructure.external.qdrant_grpc_service import QdrantGrpcService
+from app.infrastructure.vector_store.vector_store import VectorStore, generate_point_id, _source_filter
+
+
+def make_point(source: str, content: str, vector, file_hash: str = "v1"):
+    """Build a point in the shape VectorStore inserts."""
+    return {
+        "id": generate_point_id(source, content),
+        "vector": vector,
+        "payload": {
+            "content": content,
+            "metadata": {"source": source},
+            "file_hash": file_hash
+        }
+    }
+
+
+@pytest.mark.unit
+class TestQdrantGrpcService:
+    """Test suite for the gRPC vector transport against qdrant-client's in-memory mode."""
+
+    @pytest.fixture
+    def service(self):
+        """gRPC service backed by a local in-memory Qdrant."""
+        with patch.object(Config, "VECTOR_SIZE", 4):
+            yield QdrantGrpcService(location=":memory:")
+
+    @pytest.fixture
+    def points(self):
+        return [
+            make_point("a.txt", "Python is a programming language", np.array([1.0, 0.0, 0.0, 0.0], dtype=np.float32)),
+            make_point("a.txt", "FastAPI is a web framework", [0.0, 1.0, 0.0, 0.0]),
+            make_point("b.txt", "Qdrant is a vector database", [0.0, 0.0, 1.0, 0.0])
+        ]
+
+    @pytest.mark.asyncio
+    async def test_insert_and_search(self, service, points):
+        """Test that inserted points are returned by search in REST result shape."""
+        assert await service.insert_vectors(points) is True
+
+        results = await service.search_vectors(np.array([0.9, 0.1, 0.0, 0.0], dtype=np.float32), 2)
+
+        assert len(results) == 2
+        assert results[0]["id"] == points[0]["id"]
+        assert results[0]["payload"]["content"] == "Python is a programming language"
+        assert results[0]["score"] >= results[1]["score"]
+        assert service.get_collection_stats()["total_documents"] == 3
+
+    @pytest.mark.asyncio
+    async def test_filtered_search(self, service, points):
+        """Test that payload filters restrict search results in local mode."""
+        await service.insert_vectors(points)
+        assert await service.create_payload_indexes() is True
+
+        results = await service.search_vectors(
+            [0.9, 0.1, 0.0, 0.0],
+            3,
+            filter={"must": [{"key": "metadata.source", "match": {"any": ["b.txt"]}}]}
+        )
+
+        assert [result["id"] for result in results] == [points[2]["id"]]
+
+    @pytest.mark.asyncio
+    async def test_batch_search(self, service, points):
+        """Test that batch search returns one result list per search."""
+        await service.insert_vectors(points)
+
+        results = await service.search_vectors_batch([
+            {"vector": np.array([1.0, 0.0, 0.0, 0.0], dtype=np.float32), "top_k": 1},
+            {"vector": [0.0, 0.0, 1.0, 0.0], "top_k": 2, "filter": {"must": [{"key": "metadata.source", "match": {"value": "a.txt"}}]}}
+        ])
+
+        assert [result["id"] for result in results[0]] == [points[0]["id"]]
+        assert {result["id"] for result in results[1]} == {points[0]["id"], points[1]["id"]}
+
+    @pytest.mark.asyncio
+    async def test_missing_collection_reads_as_empty(self, service):
+        """Test that lookups before the collection exists report nothing stored."""
+        assert await service.get_existing_point_ids([generate_point_id("a.txt", "x")]) == set()
+        assert await service.scroll_points(_source_filter("a.txt")) == []
+        assert service.get_collection_stats()["total_documents"] == 0
+
+    @pytest.mark.asyncio
+    async def test_source_points_lifecycle(self, service, points):
+        """Test existence checks, payload updates and filtered deletes."""
+        await service.insert_vectors(points)
+
+        existing = await service.get_existing_point_ids([points[0]["id"], generate_point_id("a.txt", "missing")])
+        assert existing == {points[0]["id"]}
+
+        await service.set_payload({"file_hash": "v2"}, [points[0]["id"]])
+        stored = await service.scroll_points(_source_filter("a.txt"), with_payload=["file_hash"], page_size=1)
+        assert {point["id"]: point["payload"]["file_hash"] for point in stored} == {
+            points[0]["id"]: "v2",
+            points[1]["id"]: "v1"
+        }
+
+        delete_filter = _source_filter("a.txt")
+        delete_filter["must_not"] = [{"has_id": [points[0]["id"]]}]
+        await service.delete_points(delete_filter)
+        remaining = await service.scroll_points({"must": []})
+        assert {point["id"] for point in remaining} == {points[0]["id"], points[2]["id"]}
+
+        assert service.delete_collection() is True
+        assert service.get_collection_stats()["total_documents"] == 0
+
+    def test_sync_calls_hold_the_local_lock(self, service):
+        """Test that stats and collection deletion wait for local-mode calls running in other threads."""
+        calls = []
+        with service._local_lock:
+            thread = threading.Thread(target=lambda: calls.append((service.get_collection_stats(), service.delete_collection())))
+            thread.start()
+            thread.join(timeout=0.2)
+            assert calls == []
+
+        thread.join(timeout=5)
+        assert len(calls) == 1
+
+    def test_vector_store_selects_grpc_transport(self):
+        """Test that VECTOR_TRANSPORT=grpc routes vector operations through qdrant-client."""
+        with patch.object(Config, "VECTOR_TRANSPORT", "grpc"), \
+             patch.object(Config, "QDRANT_URL", ":memory:"):
+            store = VectorStore()
+
+        assert isinstance(store.vector_db, QdrantGrpcService)
+        assert store.vector_db is not store.api_service
+
+    @pytest.mark.asyncio
+    async def test_vector_store_parallel_upserts_and_flush(self):
+        """Test batched parallel upserts followed by a flush against local mode."""
+        with patch.object(Config, "VECTOR_TRANSPORT", "grpc"), \
+             patch.object(Config, "QDRANT_URL", ":memory:"), \
+             patch.object(Config, "VECTOR_SIZE", 4), \
+             patch.object(Config, "VECTOR_UPSERT_BATCH_SIZE", 16):
+            store = VectorStore()
+            documents = [{"content": f"chunk {i}", "metadata": {"source": "a.txt"}} for i in range(100)]
+            embeddings = [np.array([1.0, 0.0, 0.0, float(i)], dtype=np.float32) for i in range(100)]
+
+            assert await store.insert_documents(documents, embeddings, wait=False) is True
+            assert await store.flush() is True
+
+            assert store.get_collection_stats()["total_documents"] == 100
+            assert store.operation_tracker.completed == 7
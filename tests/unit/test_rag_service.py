@@ -1,7 +1,9 @@
+import asyncio
 import pytest
 from unittest.mock import Mock, patch, AsyncMock
 from app.domain.services.rag_service import RAGService
-from app.infrastructure.vector_store.vector_store import VectorStore
+from app.infrastructure.vector_store.vector_store import VectorStore, generate_point_id
+from app.utils.file_utils import compute_file_hash
 from app.infrastructure.document_processing.loader import DocumentLoader
 
 
@@ -26,6 +28,7 @@ class TestRAGService:
         """Mock document loader."""
         mock = Mock(spec=DocumentLoader)
         mock.load_document = Mock(return_value=[])
+        mock.load_document_async = AsyncMock(side_effect=mock.load_document)
         mock.load_text = Mock(return_value=[])
         return mock
 
@@ -134,6 +137,109 @@ class TestRAGService:
         assert result["success"] == False
         assert "Failed to add document" in result["message"]
 
+    @pytest.fixture
+    def upsert_vector_store(self, mock_vector_store):
+        """Vector store mock with the per-source upsert primitives."""
+        mock_vector_store.get_source_points = AsyncMock(return_value={})
+        mock_vector_store.set_file_hash = AsyncMock(return_value=True)
+        mock_vector_store.delete_source_points = AsyncMock(return_value=True)
+        return mock_vector_store
+
+    @pytest.mark.asyncio
+    async def test_upsert_document_unchanged_file_skips_parsing(self, rag_service, mock_document_loader, upsert_vector_store, tmp_path):
+        """Test that an identical upload is skipped without parsing."""
+        file_path = tmp_path / "test.txt"
+        file_path.write_text("Python is a programming language")
+        upsert_vector_store.get_source_points.return_value = {
+            "point-1": compute_file_hash(str(file_path))
+        }
+
+        with patch('app.domain.services.rag_service.IngestionPipeline') as mock_pipeline_class:
+            result = await rag_service.upsert_document(str(file_path), "test.txt")
+
+        assert result["success"] == True
+        assert result["chunks_added"] == 0
+        mock_pipeline_class.assert_not_called()
+        upsert_vector_store.add_documents.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_upsert_document_embeds_new_and_deletes_removed_chunks(self, rag_service, upsert_vector_store, tmp_path):
+        """Test that only changed chunks are embedded and removed chunks are deleted."""
+        file_path = tmp_path / "test.txt"
+        file_path.write_text("new version")
+        kept_id = generate_point_id("test.txt", "kept chunk")
+        added_id = generate_point_id("test.txt", "added chunk")
+        upsert_vector_store.get_source_points.return_value = {
+            kept_id: "old-hash",
+            generate_point_id("test.txt", "removed chunk"): "old-hash"
+        }
+
+        with patch('app.domain.services.rag_service.IngestionPipeline') as mock_pipeline_class:
+            mock_pipeline = mock_pipeline_class.return_value
+            mock_pipeline.run = AsyncMock(return_value={
+                "chunk_ids": {kept_id, added_id},
+                "chunks_added": 1,
+                "stage_stats": {}
+            })
+            result = await rag_service.upsert_document(str(file_path), "test.txt")
+
+        assert result["success"] == True
+        assert result["chunks_added"] == 1
+        assert result["chunks_removed"] == 1
+        assert mock_pipeline.run.call_args.kwargs["skip_ids"] == upsert_vector_store.get_source_points.return_value.keys()
+        upsert_vector_store.set_file_hash.assert_called_once_with(sorted([kept_id, added_id]), compute_file_hash(str(file_path)))
+        upsert_vector_store.delete_source_points.assert_called_once()
+        assert upsert_vector_store.delete_source_points.call_args[0][0] == "test.txt"
+
+    @pytest.mark.asyncio
+    async def test_upsert_document_retries_failed_ingestion(self, rag_service, mock_document_loader, upsert_vector_store, tmp_path):
+        """Test that a document whose ingestion failed partway is ingested again rather than skipped as unchanged."""
+        file_path = tmp_path / "doc.txt"
+        file_path.write_text("four chunks")
+        stored = {}
+        embedded = []
+
+        async def iter_document_chunks(file_path):
+            yield [(f"chunk {i}", 0) for i in range(4)]
+
+        async def embed_documents(docs):
+            embedded.append(docs)
+            if len(embedded) == 2 and not retrying:
+                # Fail the second batch once the first is stored
+                while not stored:
+                    await asyncio.sleep(0)
+                raise Exception("Embedding API error")
+            return [[0.1] for _ in docs]
+
+        async def insert_documents(docs, embeddings):
+            stored.update({generate_point_id(doc["metadata"]["source"], doc["content"]): None for doc in docs})
+            return True
+
+        async def set_file_hash(point_ids, file_hash):
+            stored.update({point_id: file_hash for point_id in point_ids})
+            return True
+
+        mock_document_loader.iter_document_chunks = iter_document_chunks
+        mock_document_loader.build_document_chunks = DocumentLoader.build_document_chunks.__get__(mock_document_loader)
+        upsert_vector_store.embed_documents = AsyncMock(side_effect=embed_documents)
+        upsert_vector_store.insert_documents = AsyncMock(side_effect=insert_documents)
+        upsert_vector_store.get_source_points = AsyncMock(side_effect=lambda source: dict(stored))
+        upsert_vector_store.set_file_hash = AsyncMock(side_effect=set_file_hash)
+
+        retrying = False
+        with patch("app.domain.services.ingestion_pipeline.Config.INGESTION_BATCH_SIZE", 2):
+            failed = await rag_service.upsert_document(str(file_path), "doc.txt")
+            assert failed["success"] == False
+            assert len(stored) == 2
+
+            retrying = True
+            retried = await rag_service.upsert_document(str(file_path), "doc.txt")
+
+        assert retried["success"] == True
+        assert retried["chunks_added"] == 2
+        assert len(stored) == 4
+        assert set(stored.values()) == {compute_file_hash(str(file_path))}
+
     @pytest.mark.asyncio
     async def test_add_text_success(self, rag_service, mock_document_loader, mock_vector_store):
         """Test successful text addition."""
@@ -199,6 +305,46 @@ class TestRAGService:
         assert result["success"] == False
         assert "Failed to clear" in result["message"]
 
+    @pytest.mark.asyncio
+    async def test_ask_questions_streams_in_completion_order(self, rag_service, mock_vector_store, mock_api_service):
+        """Test that batch answers are yielded as they complete with bounded concurrency."""
+        doc = {"content": "Python is a programming language", "metadata": {"source": "test.txt"}, "score": 0.9}
+        mock_vector_store.search_batch = AsyncMock(return_value=[[doc], [doc], []])
+        in_flight = 0
+        max_in_flight = 0
+
+        async def call_llm(messages):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            question = messages[-1]["content"]
+            await asyncio.sleep(0.05 if question == "slow" else 0.01)
+            in_flight -= 1
+            return f"Answer to {question}"
+
+        mock_api_service.call_llm = AsyncMock(side_effect=call_llm)
+        questions = [{"question": "slow"}, {"question": "fast", "top_k": 5}, {"question": "unknown"}]
+
+        results = [result async for result in rag_service.ask_questions(questions, concurrency=1)]
+
+        mock_vector_store.search_batch.assert_called_once()
+        assert [query["top_k"] for query in mock_vector_store.search_batch.call_args[0][0]] == [3, 5, 3]
+        assert [result["index"] for result in results] == [2, 0, 1]
+        assert results[0]["success"] is False
+        assert results[1]["answer"] == "Answer to slow"
+        assert max_in_flight == 1
+
+    @pytest.mark.asyncio
+    async def test_ask_questions_search_error(self, rag_service, mock_vector_store):
+        """Test that a failed batch search reports an error for every question."""
+        mock_vector_store.search_batch = AsyncMock(side_effect=Exception("Vector batch search API error"))
+
+        results = [result async for result in rag_service.ask_questions([{"question": "a"}, {"question": "b"}])]
+
+        assert [result["index"] for result in results] == [0, 1]
+        assert all(not result["success"] for result in results)
+        assert "Vector batch search API error" in results[0]["answer"]
+
 
 @pytest.mark.unit
 class TestRAGServiceIntegration:
@@ -227,6 +373,7 @@ class TestRAGServiceIntegration:
             mock_document_loader.load_document = Mock(return_value=[
                 {"id": "doc1", "content": "Python info", "metadata": {}}
             ])
+            mock_document_loader.load_document_async = AsyncMock(side_effect=mock_document_loader.load_document)
             mock_dl_class.return_value = mock_document_loader
             
             mock_api_service = Mock()
@@ -243,4 +390,4 @@ class TestRAGServiceIntegration:
             # Test question asking
             result = await service.ask_question("What is Python?")
             assert result["success"] == True
-            assert "Python" in result["answer"] 
\ No newline at end of file
+            assert "Python" in result["answer"] 
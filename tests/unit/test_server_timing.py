@@ -0,0 +1,71 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.api.middleware import ServerTimingMiddleware
+from app.utils.metrics import time_stage, record_cache
+from app.utils.server_timing import RequestTimings, get_request_timings
+
+
+@pytest.mark.unit
+class TestServerTiming:
+    """Test suite for Server-Timing response headers."""
+
+    @pytest.fixture
+    def client(self):
+        """App whose endpoint runs timed stages and a cache lookup."""
+        app = FastAPI()
+        app.add_middleware(ServerTimingMiddleware)
+
+        @app.get("/ask")
+        async def ask():
+            with time_stage("embed"):
+                pass
+            with time_stage("embed"):
+                pass
+            with time_stage("llm"):
+                pass
+            record_cache("documents", hits=1)
+            record_cache("chunks", hits=3, misses=1)
+            return {"ok": True}
+
+        @app.get("/plain")
+        async def plain():
+            return {"ok": True}
+
+        return TestClient(app)
+
+    def parse(self, header: str):
+        return [entry.strip().split(";") for entry in header.split(",")]
+
+    def test_header_lists_stages_caches_and_total(self, client):
+        """Test that stages accumulate and caches are marked, followed by the total."""
+        response = client.get("/ask")
+
+        entries = self.parse(response.headers["server-timing"])
+        names = [entry[0] for entry in entries]
+        assert names == ["embed", "llm", "cache-documents", "cache-chunks", "total"]
+        assert entries[0][1].startswith("dur=")
+        assert entries[2][1] == 'desc="hit"'
+        assert entries[3][1] == 'desc="3 hit 1 miss"'
+
+    def test_request_without_stages_reports_total(self, client):
+        """Test that timings do not leak between requests."""
+        client.get("/ask")
+        response = client.get("/plain")
+
+        assert [entry[0] for entry in self.parse(response.headers["server-timing"])] == ["total"]
+
+    def test_stages_outside_requests_are_ignored(self):
+        """Test that stages run outside a timed request record nothing."""
+        assert get_request_timings() is None
+        with time_stage("embed"):
+            pass
+        assert get_request_timings() is None
+
+    def test_header_value_format(self):
+        """Test millisecond formatting of durations and cache misses."""
+        timings = RequestTimings()
+        timings.add_stage("search", 0.0123)
+        timings.add_cache("documents", 0, 1)
+
+        assert timings.header_value(0.5) == 'search;dur=12.3, cache-documents;desc="miss", total;dur=500.0'
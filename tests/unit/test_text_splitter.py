@@ -0,0 +1,56 @@
+import pytest
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+from app.infrastructure.document_processing.text_splitter import RecursiveTextSplitter
+from tests.fixtures.sample_data import SAMPLE_DOCUMENTS, generate_sample_text
+
+# Golden corpus: generated prose plus edge cases for every level of the separator hierarchy
+GOLDEN_CORPUS = [
+    "",
+    "   \n\n  ",
+    "short text",
+    "x" * 2500,
+    "word " * 600,
+    "line\n" * 400,
+    "para one\n\npara two\n\n\n\npara three " * 120,
+    " leading and trailing whitespace \n\n" * 80,
+    "\n".join(doc["content"] for doc in SAMPLE_DOCUMENTS) * 20,
+    generate_sample_text(50, seed=1),
+    generate_sample_text(200, seed=2),
+]
+
+
+@pytest.mark.unit
+class TestRecursiveTextSplitter:
+    """Test suite for the native recursive text splitter."""
+
+    @pytest.mark.parametrize("chunk_size,chunk_overlap", [(1000, 200), (100, 20), (50, 0), (10, 10)])
+    @pytest.mark.parametrize("text_index", range(len(GOLDEN_CORPUS)))
+    def test_matches_langchain(self, text_index, chunk_size, chunk_overlap):
+        """Test that chunks are identical to langchain's RecursiveCharacterTextSplitter."""
+        text = GOLDEN_CORPUS[text_index]
+        expected = RecursiveCharacterTextSplitter(
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap,
+            length_function=len,
+        ).split_text(text)
+
+        assert RecursiveTextSplitter(chunk_size, chunk_overlap).split_text(text) == expected
+
+    def test_matches_langchain_with_custom_length_function(self):
+        """Test equivalence when lengths are measured in words instead of characters."""
+        def word_count(text):
+            return len(text.split())
+
+        text = generate_sample_text(100, seed=3)
+        expected = RecursiveCharacterTextSplitter(
+            chunk_size=120,
+            chunk_overlap=30,
+            length_function=word_count,
+        ).split_text(text)
+
+        assert RecursiveTextSplitter(120, 30, length_function=word_count).split_text(text) == expected
+
+    def test_overlap_larger_than_chunk_size_rejected(self):
+        """Test that invalid overlap is rejected like langchain does."""
+        with pytest.raises(ValueError, match="larger chunk overlap"):
+            RecursiveTextSplitter(100, 200)
@@ -0,0 +1,168 @@
+import json
+import threading
+import httpx
+import pytest
+from unittest.mock import patch
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.api.middleware import TracingMiddleware
+from app.infrastructure.external.external_api_service import ExternalAPIService
+from app.utils import tracing
+from app.utils.metrics import time_stage
+
+
+class ListExporter:
+    """Exporter collecting spans in memory."""
+
+    def __init__(self):
+        self.spans = []
+
+    def export(self, spans):
+        self.spans.extend(spans)
+
+
+@pytest.mark.unit
+class TestTracing:
+    """Test suite for request tracing."""
+
+    @pytest.fixture
+    def exporter(self):
+        """Install a tracer exporting to a list for the duration of a test."""
+        exporter = ListExporter()
+        tracer = tracing.Tracer(exporter)
+        previous = tracing.set_tracer(tracer)
+        yield exporter
+        tracer.shutdown()
+        tracing.set_tracer(previous)
+
+    def finished_spans(self, exporter):
+        tracing.get_tracer().shutdown()
+        return {span.name: span for span in exporter.spans}
+
+    def test_spans_nest_and_record_errors(self, exporter):
+        """Test that stage spans are children of the active span and record failures."""
+        with tracing.span("request", traceparent="00-" + "a" * 32 + "-" + "b" * 16 + "-01"):
+            with time_stage("search", top_k=3) as search_span:
+                search_span.set_attribute("results", 2)
+            with pytest.raises(ValueError):
+                with time_stage("llm"):
+                    raise ValueError("upstream down")
+
+        spans = self.finished_spans(exporter)
+        assert spans["request"].trace_id == "a" * 32
+        assert spans["request"].parent_span_id == "b" * 16
+        assert spans["search"].parent_span_id == spans["request"].span_id
+        assert spans["search"].attributes == {"top_k": 3, "results": 2}
+        assert spans["llm"].status == tracing.STATUS_ERROR
+        assert spans["request"].status == tracing.STATUS_OK
+
+    def test_spans_are_dropped_while_export_is_stuck(self):
+        """Test that spans beyond the queue limit are dropped and counted instead of piling up."""
+        exporting, release = threading.Event(), threading.Event()
+
+        class StuckExporter(ListExporter):
+            def export(self, spans):
+                exporting.set()
+                release.wait(5)
+                super().export(spans)
+
+        exporter = StuckExporter()
+        tracer = tracing.Tracer(exporter, max_queue=2)
+        previous = tracing.set_tracer(tracer)
+        try:
+            with tracing.span("first"):
+                pass
+            assert exporting.wait(5)
+            for name in ("second", "third", "fourth"):
+                with tracing.span(name):
+                    pass
+            release.set()
+            tracer.shutdown()
+        finally:
+            tracing.set_tracer(previous)
+
+        assert tracer.dropped == 1
+        assert [span.name for span in exporter.spans] == ["first", "second", "third"]
+
+    def test_disabled_tracing_records_nothing(self):
+        """Test that spans are no-ops without an exporter."""
+        previous = tracing.set_tracer(tracing.Tracer())
+        try:
+            with tracing.span("request") as request_span:
+                request_span.set_attribute("ignored", True)
+                assert tracing.current_span().traceparent is None
+        finally:
+            tracing.set_tracer(previous)
+
+    def test_invalid_traceparent_starts_new_trace(self):
+        """Test that malformed or all-zero traceparent headers are ignored."""
+        assert tracing.parse_traceparent("00-" + "0" * 32 + "-" + "b" * 16 + "-01") is None
+        assert tracing.parse_traceparent("garbage") is None
+        assert tracing.parse_traceparent(None) is None
+
+    @pytest.mark.asyncio
+    async def test_upstream_calls_propagate_trace(self, exporter):
+        """Test that upstream requests carry traceparent and are recorded as client spans."""
+        seen = {}
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen["traceparent"] = request.headers.get("traceparent")
+            return httpx.Response(200, json={
+                "choices": [{"message": {"content": "answer"}}],
+                "usage": {"prompt_tokens": 12, "completion_tokens": 3, "total_tokens": 15}
+            })
+
+        service = ExternalAPIService()
+        service.openai_headers["Authorization"] = "Bearer test"
+        kwargs = {**service._get_async_client_kwargs(), "transport": httpx.MockTransport(handler)}
+
+        with patch.object(service, "_get_async_client_kwargs", return_value=kwargs):
+            with time_stage("llm"):
+                assert await service.call_llm([{"role": "user", "content": "hi"}]) == "answer"
+
+        spans = self.finished_spans(exporter)
+        client_span = spans["POST llm"]
+        assert seen["traceparent"] == client_span.traceparent
+        assert client_span.kind == tracing.SPAN_KIND_CLIENT
+        assert client_span.parent_span_id == spans["llm"].span_id
+        assert client_span.attributes["http.status_code"] == 200
+        assert spans["llm"].attributes["llm.total_tokens"] == 15
+
+    def test_middleware_continues_incoming_trace(self, exporter):
+        """Test that the request span joins the caller's trace and is named by route."""
+        app = FastAPI()
+        app.add_middleware(TracingMiddleware)
+
+        @app.get("/items/{item_id}")
+        async def get_item(item_id: int):
+            with tracing.span("handler"):
+                return {"item_id": item_id}
+
+        response = TestClient(app).get("/items/1", headers={"traceparent": "00-" + "c" * 32 + "-" + "d" * 16 + "-01"})
+
+        assert response.status_code == 200
+        spans = self.finished_spans(exporter)
+        server_span = spans["GET /items/{item_id}"]
+        assert server_span.trace_id == "c" * 32
+        assert server_span.parent_span_id == "d" * 16
+        assert server_span.attributes["http.status_code"] == 200
+        assert spans["handler"].parent_span_id == server_span.span_id
+
+    def test_file_exporter_writes_otlp_json(self, tmp_path):
+        """Test that the file exporter appends OTLP/JSON export requests."""
+        path = tmp_path / "traces.jsonl"
+        tracer = tracing.Tracer(tracing.FileSpanExporter(str(path), "rag-test"))
+        previous = tracing.set_tracer(tracer)
+        try:
+            with tracing.span("request", chunks=4):
+                pass
+        finally:
+            tracer.shutdown()
+            tracing.set_tracer(previous)
+
+        request = json.loads(path.read_text().splitlines()[0])
+        resource_spans = request["resourceSpans"][0]
+        assert resource_spans["resource"]["attributes"][0]["value"] == {"stringValue": "rag-test"}
+        span = resource_spans["scopeSpans"][0]["spans"][0]
+        assert span["name"] == "request"
+        assert span["attributes"] == [{"key": "chunks", "value": {"intValue": "4"}}]
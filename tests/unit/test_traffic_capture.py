@@ -0,0 +1,75 @@
+import json
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from app.api.middleware import TrafficCaptureMiddleware
+from app.utils.traffic_capture import REDACTED, TrafficRecorder, sanitize
+
+
+@pytest.mark.unit
+class TestTrafficCapture:
+    """Test suite for traffic capture."""
+
+    def build_client(self, recorder):
+        app = FastAPI()
+        app.add_middleware(TrafficCaptureMiddleware, recorder=recorder, routes=["/questions/ask"])
+
+        @app.post("/questions/ask")
+        async def ask(request: Request):
+            return {"received": len(await request.body())}
+
+        @app.post("/documents/add-text")
+        async def add_text(request: Request):
+            return {"success": True}
+
+        return TestClient(app)
+
+    def read(self, path):
+        with open(path) as f:
+            return [json.loads(line) for line in f]
+
+    def test_sanitize_redacts_credentials(self):
+        """Test that sensitive fields and credential-like strings are redacted and the rest kept."""
+        body = {
+            "api_key": "secret",
+            "max_tokens": 100,
+            "user": "alice",
+            "messages": [{"role": "user", "content": "Mail bob@example.com with key sk-abcdefghijklmnopqrstuv"}]
+        }
+
+        assert sanitize(body) == {
+            "api_key": REDACTED,
+            "max_tokens": 100,
+            "user": REDACTED,
+            "messages": [{"role": "user", "content": f"Mail {REDACTED} with key {REDACTED}"}]
+        }
+
+    def test_captures_selected_routes(self, tmp_path):
+        """Test that requests to selected routes are written with body, status and timing."""
+        path = tmp_path / "traffic" / "requests.jsonl"
+        recorder = TrafficRecorder(str(path))
+        client = self.build_client(recorder)
+
+        client.post("/questions/ask", json={"question": "What is RAG?", "top_k": 3})
+        client.post("/documents/add-text", json={"text": "not captured"})
+        client.post("/questions/ask", content=b"not json", headers={"Content-Type": "application/json"})
+        recorder.shutdown()
+
+        entries = self.read(path)
+        assert len(entries) == 1
+        assert entries[0]["method"] == "POST"
+        assert entries[0]["path"] == "/questions/ask"
+        assert entries[0]["body"] == {"question": "What is RAG?", "top_k": 3}
+        assert entries[0]["status"] == 200
+        assert entries[0]["duration_ms"] > 0
+
+    def test_sampling(self, tmp_path):
+        """Test that a zero sample rate captures nothing."""
+        path = tmp_path / "requests.jsonl"
+        recorder = TrafficRecorder(str(path), sample_rate=0.0)
+        client = self.build_client(recorder)
+
+        assert client.post("/questions/ask", json={"question": "What is RAG?"}).status_code == 200
+        recorder.shutdown()
+
+        assert not path.exists()
@@ -0,0 +1,192 @@
+import asyncio
+import pytest
+from unittest.mock import Mock, AsyncMock, patch
+from app.core.config import Config
+from app.infrastructure.vector_store.vector_store import VectorStore, generate_point_id, build_search_filter
+from app.infrastructure.vector_store.operation_tracker import OperationTracker
+
+
+@pytest.mark.unit
+class TestVectorStore:
+    """Test suite for VectorStore."""
+
+    @pytest.fixture
+    def mock_api_service(self):
+        """Mock external API service."""
+        mock = Mock()
+        mock.get_existing_point_ids = AsyncMock(return_value=set())
+        mock.get_embeddings = AsyncMock(side_effect=lambda texts: [[0.1, 0.2, 0.3] for _ in texts])
+        mock.create_collection_if_not_exists = AsyncMock(return_value=True)
+        mock.create_payload_indexes = AsyncMock(return_value=True)
+        mock.search_vectors = AsyncMock(return_value=[])
+        mock.upsert_points = AsyncMock(return_value={"operation_id": 1, "status": "completed"})
+        mock.delete_points = AsyncMock(return_value=True)
+        return mock
+
+    @pytest.fixture
+    def vector_store(self, mock_api_service):
+        """Vector store with mocked API service."""
+        with patch('app.infrastructure.vector_store.vector_store.ExternalAPIService', return_value=mock_api_service):
+            return VectorStore()
+
+    def test_generate_point_id_is_deterministic(self):
+        """Test that point IDs depend only on source and content."""
+        assert generate_point_id("a.txt", "hello") == generate_point_id("a.txt", "hello")
+        assert generate_point_id("a.txt", "hello") != generate_point_id("b.txt", "hello")
+        assert generate_point_id("a.txt", "hello") != generate_point_id("a.txt", "world")
+
+    @pytest.mark.asyncio
+    async def test_add_documents_uses_content_addressed_ids(self, vector_store, mock_api_service, sample_documents):
+        """Test that inserted points carry deterministic IDs."""
+        result = await vector_store.add_documents(sample_documents)
+
+        assert result is True
+        points = mock_api_service.upsert_points.call_args[0][0]
+        assert [point["id"] for point in points] == [
+            generate_point_id(doc["metadata"]["source"], doc["content"]) for doc in sample_documents
+        ]
+
+    @pytest.mark.asyncio
+    async def test_add_documents_skips_existing_chunks(self, vector_store, mock_api_service, sample_documents):
+        """Test that already stored chunks are not embedded again."""
+        stored_doc = sample_documents[0]
+        mock_api_service.get_existing_point_ids.return_value = {
+            generate_point_id(stored_doc["metadata"]["source"], stored_doc["content"])
+        }
+
+        result = await vector_store.add_documents(sample_documents)
+
+        assert result is True
+        mock_api_service.get_embeddings.assert_called_once_with([sample_documents[1]["content"]])
+        assert len(mock_api_service.upsert_points.call_args[0][0]) == 1
+
+    @pytest.mark.asyncio
+    async def test_add_documents_unchanged_corpus_only_checks_existence(self, vector_store, mock_api_service, sample_documents):
+        """Test that re-ingesting an unchanged corpus costs only the existence check."""
+        mock_api_service.get_existing_point_ids.return_value = {
+            generate_point_id(doc["metadata"]["source"], doc["content"]) for doc in sample_documents
+        }
+
+        result = await vector_store.add_documents(sample_documents)
+
+        assert result is True
+        mock_api_service.get_existing_point_ids.assert_called_once()
+        mock_api_service.get_embeddings.assert_not_called()
+        mock_api_service.upsert_points.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_add_documents_deduplicates_within_batch(self, vector_store, mock_api_service, sample_documents):
+        """Test that duplicate chunks in one batch are embedded once."""
+        result = await vector_store.add_documents(sample_documents + sample_documents)
+
+        assert result is True
+        assert len(mock_api_service.get_embeddings.call_args[0][0]) == len(sample_documents)
+
+    @pytest.mark.asyncio
+    async def test_upsert_points_in_bounded_parallel_batches(self, vector_store, mock_api_service):
+        """Test that points are split into batches with limited concurrency."""
+        in_flight = 0
+        max_in_flight = 0
+
+        async def upsert_points(batch, wait=True):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return {"operation_id": len(batch), "status": "completed"}
+
+        mock_api_service.upsert_points.side_effect = upsert_points
+        points = [{"id": str(i), "vector": [0.1], "payload": {}} for i in range(10)]
+
+        with patch.object(Config, "VECTOR_UPSERT_BATCH_SIZE", 3), \
+             patch.object(Config, "VECTOR_UPSERT_CONCURRENCY", 2):
+            result = await vector_store.upsert_points(points)
+
+        assert result is True
+        mock_api_service.create_collection_if_not_exists.assert_called_once()
+        assert sorted(len(call.args[0]) for call in mock_api_service.upsert_points.call_args_list) == [1, 3, 3, 3]
+        assert max_in_flight == 2
+
+    @pytest.mark.asyncio
+    async def test_unacknowledged_writes_are_tracked_until_flush(self, vector_store, mock_api_service):
+        """Test that wait=false writes stay pending until a flush barrier completes."""
+        mock_api_service.upsert_points.return_value = {"operation_id": 7, "status": "acknowledged"}
+        points = [{"id": "1", "vector": [0.1], "payload": {}}]
+
+        await vector_store.upsert_points(points, wait=False)
+
+        assert mock_api_service.upsert_points.call_args.kwargs["wait"] is False
+        assert vector_store.operation_tracker.to_dict()["pending_operations"] == 1
+
+        await vector_store.flush()
+
+        assert mock_api_service.delete_points.call_args.kwargs["wait"] is True
+        assert vector_store.operation_tracker.to_dict()["pending_operations"] == 0
+        assert vector_store.operation_tracker.last_operation_id == 7
+
+    def test_operation_tracker_is_bounded_and_cleared_by_later_writes(self):
+        """Test that pending operations are capped and confirmed by any later completed write."""
+        tracker = OperationTracker(max_pending=2)
+        for operation_id in range(1, 4):
+            tracker.record({"operation_id": operation_id, "status": "acknowledged"})
+
+        assert list(tracker.pending) == [2, 3]
+        assert tracker.dropped == 1
+
+        tracker.record({"operation_id": 4, "status": "completed"})
+
+        assert tracker.to_dict()["pending_operations"] == 0
+
+    def test_build_search_filter(self):
+        """Test that search filters map to indexed payload conditions."""
+        assert build_search_filter(None) is None
+        assert build_search_filter({}) is None
+        assert build_search_filter({"sources": ["a.pdf"], "page_from": 2, "page_to": 5, "tags": ["hr"]}) == {
+            "must": [
+                {"key": "metadata.source", "match": {"any": ["a.pdf"]}},
+                {"key": "metadata.page", "range": {"gte": 2, "lte": 5}},
+                {"key": "metadata.tags", "match": {"any": ["hr"]}}
+            ]
+        }
+
+    @pytest.mark.asyncio
+    async def test_search_passes_filter(self, vector_store, mock_api_service):
+        """Test that search filters are sent to the vector database."""
+        await vector_store.search("question", top_k=2, filters={"sources": ["a.pdf"]})
+
+        assert mock_api_service.search_vectors.call_args.kwargs["filter"] == {
+            "must": [{"key": "metadata.source", "match": {"any": ["a.pdf"]}}]
+        }
+
+    @pytest.mark.asyncio
+    async def test_payload_indexes_created_once(self, vector_store, mock_api_service):
+        """Test that collection bootstrap creates payload indexes only once."""
+        points = [{"id": "1", "vector": [0.1], "payload": {}}]
+
+        await vector_store.upsert_points(points)
+        await vector_store.upsert_points(points)
+
+        assert mock_api_service.create_collection_if_not_exists.call_count == 2
+        mock_api_service.create_payload_indexes.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_search_batch_uses_one_embedding_and_one_search(self, vector_store, mock_api_service):
+        """Test that batch search embeds all questions together and searches in one call."""
+        mock_api_service.search_vectors_batch = AsyncMock(return_value=[
+            [{"id": "1", "score": 0.9, "payload": {"content": "a", "metadata": {"source": "a.txt"}}}],
+            []
+        ])
+
+        results = await vector_store.search_batch([
+            {"question": "first", "top_k": 2, "filters": {"sources": ["a.txt"]}},
+            {"question": "second"}
+        ])
+
+        mock_api_service.get_embeddings.assert_called_once_with(["first", "second"])
+        searches = mock_api_service.search_vectors_batch.call_args[0][0]
+        assert [search["top_k"] for search in searches] == [2, 3]
+        assert searches[0]["filter"] == {"must": [{"key": "metadata.source", "match": {"any": ["a.txt"]}}]}
+        assert searches[1]["filter"] is None
+        assert results == [[{"content": "a", "metadata": {"source": "a.txt"}, "score": 0.9}], []]
+